@@ -0,0 +1,512 @@
+import os
+import sys
+import json
+import math
+import time
+import random
+import asyncio
+import argparse
+import platform
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmark_utils import StubModel, call_app, make_multipart, make_wav, prepare_in_process_api, quiet_console, wait_until_ready
+
+def load_samples(args):
+    """
+    Loads the audio files to send, either generated with the requested durations or read from a directory.
+
+    Args:
+        args (argparse.Namespace): The command-line arguments.
+
+    Returns:
+        list: Tuples of (name, contents, duration in seconds or None if unknown).
+    """
+    if args.audio_dir:
+        samples = []
+        for filename in sorted(os.listdir(args.audio_dir))[:args.audio_limit]:
+            with open(os.path.join(args.audio_dir, filename), 'rb') as f:
+                samples.append((filename, f.read(), None))
+        if not samples:
+            sys.exit(f"No audio files found in {args.audio_dir}.")
+        return samples
+    return [(f"{seconds:g}s.wav", make_wav(seconds), seconds) for seconds in parse_list(args.durations, float)]
+
+def parse_list(value, cast):
+    """
+    Parses a comma-separated command-line argument.
+
+    Args:
+        value (str): The comma-separated values.
+        cast (callable): The type to convert each value to.
+
+    Returns:
+        list: The converted values.
+    """
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+class InProcessClient:
+    """
+    Sends requests to an in-process instance of the API, without going through the network.
+
+    Args:
+        app: The ASGI application of the API.
+    """
+    def __init__(self, app):
+        self.app = app
+
+    async def post(self, content_type, body):
+        return await call_app(self.app, "POST", "/asr", [("content-type", content_type)], body)
+
+class HTTPClient:
+    """
+    Sends requests to a running instance of the API over HTTP, with one connection per thread.
+
+    Args:
+        url (str): URL of the /asr endpoint.
+        max_connections (int): The maximum number of concurrent requests.
+        timeout (float): The timeout of each request in seconds.
+    """
+    def __init__(self, url, max_connections, timeout):
+        import requests
+
+        self.url = url
+        self.timeout = timeout
+        self.executor = ThreadPoolExecutor(max_workers=max_connections)
+        self._local = threading.local()
+        self._requests = requests
+
+    def _post(self, content_type, body):
+        if not hasattr(self._local, "session"):
+            self._local.session = self._requests.Session()
+        try:
+            response = self._local.session.post(
+                self.url, data=body, headers={"Content-Type": content_type}, timeout=self.timeout
+            )
+            return response.status_code, response.content
+        except self._requests.RequestException:
+            return 0, b""
+
+    async def post(self, content_type, body):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, self._post, content_type, body)
+
+class ProcessSampler:
+    """
+    Samples the RSS and CPU time of the server process and its child processes (e.g. the workers
+    of the pre-fork supervisor) from /proc.
+
+    Args:
+        pid (int): The process ID of the server.
+        interval (float): The sampling interval of the RSS in seconds.
+    """
+    def __init__(self, pid, interval=0.25):
+        self.pid = pid
+        self.interval = interval
+        self.peak_rss = 0
+        self._task = None
+
+    def _pids(self):
+        pids, stack = [], [self.pid]
+        while stack:
+            pid = stack.pop()
+            pids.append(pid)
+            try:
+                for tid in os.listdir(f"/proc/{pid}/task"):
+                    with open(f"/proc/{pid}/task/{tid}/children") as f:
+                        stack.extend(int(child) for child in f.read().split())
+            except OSError:
+                pass
+        return pids
+
+    def rss(self):
+        total = 0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/statm") as f:
+                    total += int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+            except OSError:
+                pass
+        return total
+
+    def cpu_seconds(self):
+        total = 0.0
+        for pid in self._pids():
+            try:
+                with open(f"/proc/{pid}/stat") as f:
+                    # Skip the command name, which may contain spaces, to get to utime and stime
+                    fields = f.read().rsplit(")", 1)[1].split()
+                total += (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+            except (OSError, IndexError, ValueError):
+                pass
+        return total
+
+    async def _sample(self):
+        while True:
+            self.peak_rss = max(self.peak_rss, self.rss())
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        self.peak_rss = 0
+        self._cpu_start = self.cpu_seconds()
+        self._started = time.perf_counter()
+        self._task = asyncio.create_task(self._sample())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        elapsed = time.perf_counter() - self._started
+        cpu = self.cpu_seconds() - self._cpu_start
+        return {
+            "rss_mb": round(self.rss() / 2**20, 1),
+            "peak_rss_mb": round(self.peak_rss / 2**20, 1),
+            "cpu_seconds": round(cpu, 3),
+            "cpu_utilization": round(cpu / elapsed, 3) if elapsed else 0.0
+        }
+
+def percentile(values, q):
+    """
+    Computes a percentile with linear interpolation.
+
+    Args:
+        values (list): The values.
+        q (float): The percentile between 0 and 100.
+
+    Returns:
+        float or None: The percentile, or None if there are no values.
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+async def run_scenario(client, sample, num_requests, concurrency, rate, sampler):
+    """
+    Sends requests for a single audio sample and summarises the results.
+
+    Without an arrival rate, `concurrency` clients each send their next request as soon as the previous
+    one completes (closed loop). With an arrival rate, requests arrive as a Poisson process regardless
+    of how fast the server responds (open loop), with at most `concurrency` requests in flight; the
+    latency then includes the time a request waited for a free slot, so an overloaded server is not
+    hidden by the client slowing down.
+
+    Args:
+        client: The client to send the requests with.
+        sample (tuple): The (name, contents, duration) of the audio file.
+        num_requests (int): The number of requests to send.
+        concurrency (int): The maximum number of requests in flight.
+        rate (float or None): The arrival rate in requests per second, or None for a closed loop.
+        sampler (ProcessSampler or None): The sampler of the server resources.
+
+    Returns:
+        dict: The throughput, latency, real-time factor, errors and server resources of the scenario.
+    """
+    name, content, audio_seconds = sample
+    content_type, body = make_multipart(name, content)
+    latencies, rtfs, statuses = [], [], {}
+    slots = asyncio.Semaphore(concurrency)
+
+    async def send(arrival):
+        async with slots:
+            status, response = await client.post(content_type, body)
+        latency = time.perf_counter() - arrival
+        statuses[status] = statuses.get(status, 0) + 1
+        if status != 200:
+            return
+        latencies.append(latency)
+        duration = audio_seconds
+        if duration is None:
+            try:
+                duration = float(json.loads(response)["duration"])
+            except (ValueError, KeyError, TypeError):
+                duration = 0
+        if duration:
+            rtfs.append(latency / duration)
+
+    if sampler:
+        sampler.start()
+    started = time.perf_counter()
+    if rate:
+        tasks = []
+        next_arrival = started
+        for _ in range(num_requests):
+            delay = next_arrival - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(next_arrival)))
+            next_arrival += random.expovariate(rate)
+        await asyncio.gather(*tasks)
+    else:
+        remaining = iter(range(num_requests))
+
+        async def worker():
+            for _ in remaining:
+                await send(time.perf_counter())
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "audio": name,
+        "audio_seconds": audio_seconds,
+        "concurrency": concurrency,
+        "rate": rate,
+        "requests": num_requests,
+        "errors": num_requests - len(latencies),
+        "status_codes": {str(status): count for status, count in sorted(statuses.items())},
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(len(latencies) / elapsed, 3),
+        "latency_ms": {
+            f"p{q}": round(percentile(latencies, q) * 1000, 2) if latencies else None for q in (50, 95, 99)
+        },
+        "real_time_factor": {
+            f"p{q}": round(percentile(rtfs, q), 4) if rtfs else None for q in (50, 95, 99)
+        }
+    }
+    if sampler:
+        result["server"] = await sampler.stop()
+    return result
+
+def scenario_key(result):
+    """
+    Identifies a scenario, to match it against the same scenario of a baseline.
+
+    Args:
+        result (dict): The result of the scenario.
+
+    Returns:
+        str: The key of the scenario.
+    """
+    load = f"rate={result['rate']:g}" if result["rate"] else f"concurrency={result['concurrency']}"
+    return f"{result['audio']} {load}"
+
+def compare(results, baseline, tolerance):
+    """
+    Compares the results against a baseline and prints the relative change of each metric.
+
+    Args:
+        results (dict): The results of this run.
+        baseline (dict): The results of the baseline run.
+        tolerance (float): The relative change beyond which a metric counts as a regression.
+
+    Returns:
+        list: The regressions, as (scenario, metric, baseline value, value) tuples.
+    """
+    # Metrics to compare, and whether higher values are better
+    metrics = [
+        ("throughput_rps", lambda r: r["throughput_rps"], True),
+        ("latency_p50_ms", lambda r: r["latency_ms"]["p50"], False),
+        ("latency_p95_ms", lambda r: r["latency_ms"]["p95"], False),
+        ("latency_p99_ms", lambda r: r["latency_ms"]["p99"], False),
+        ("rtf_p50", lambda r: r["real_time_factor"]["p50"], False),
+    ]
+    previous = {scenario_key(r): r for r in baseline["scenarios"]}
+    regressions = []
+
+    print(f"\n{'scenario':<32} {'metric':<16} {'baseline':>12} {'current':>12} {'change':>8}")
+    for result in results["scenarios"]:
+        key = scenario_key(result)
+        if key not in previous:
+            print(f"{key:<32} (not in baseline)")
+            continue
+        for metric, get, higher_is_better in metrics:
+            before, after = get(previous[key]), get(result)
+            if not before or after is None:
+                continue
+            change = after / before - 1
+            regressed = -change > tolerance if higher_is_better else change > tolerance
+            if regressed:
+                regressions.append((key, metric, before, after))
+            print(f"{key:<32} {metric:<16} {before:>12.2f} {after:>12.2f} {change:>8.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+async def run_scenarios(args, client, samples, rates, sampler):
+    scenarios = []
+    for sample in samples:
+        for concurrency in parse_list(args.concurrency, int):
+            for rate in rates:
+                if args.warmup:
+                    await run_scenario(client, sample, args.warmup, concurrency, rate, None)
+                result = await run_scenario(client, sample, args.requests, concurrency, rate, sampler)
+                scenarios.append(result)
+                print(
+                    f"{scenario_key(result):<32} {result['throughput_rps']:>9.1f} req/s  "
+                    f"p50 {result['latency_ms']['p50']} ms  p95 {result['latency_ms']['p95']} ms  "
+                    f"p99 {result['latency_ms']['p99']} ms  RTF p50 {result['real_time_factor']['p50']}  "
+                    f"errors {result['errors']}"
+                )
+    return scenarios
+
+async def run(args):
+    samples = load_samples(args)
+    rates = parse_list(args.rate, float) if args.rate else [None]
+
+    if args.url:
+        client = HTTPClient(args.url, max(parse_list(args.concurrency, int)), args.timeout)
+        sampler = ProcessSampler(args.server_pid) if args.server_pid else None
+        results = await run_scenarios(args, client, samples, rates, sampler)
+        client.executor.shutdown()
+        return results
+
+    # Serve the API in this process with the stub model, without the transcription cache and the job queue
+    prepare_in_process_api()
+
+    import speech_recognition.model as model
+    from api import logging_config
+    from api.asr_api import app
+
+    model._asr_model = StubModel(args.stub_rtf)
+
+    quiet_console(logging_config._listener.handlers)
+    async with app.router.lifespan_context(app):
+        await wait_until_ready(app)
+        # The in-process resources include the benchmark client, which shares the process with the API
+        return await run_scenarios(args, InProcessClient(app), samples, rates, ProcessSampler(os.getpid()))
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the /asr endpoint of the speech recognition API.")
+
+    # Optional argument: URL of the API endpoint
+    parser.add_argument(
+        '--url',
+        type=str,
+        default=None,
+        help='URL of the /asr endpoint to load test (default is an in-process instance of the API with a stub model).'
+    )
+
+    # Optional argument: Durations of the generated audio
+    parser.add_argument(
+        '--durations',
+        type=str,
+        default="1,5,15",
+        help='Comma-separated durations in seconds of the generated audio files.'
+    )
+
+    # Optional argument: Directory of audio files to send instead of generated audio
+    parser.add_argument(
+        '--audio-dir',
+        type=str,
+        default=None,
+        help='Directory of audio files to send instead of generated audio.'
+    )
+
+    # Optional argument: Maximum number of audio files from the directory
+    parser.add_argument(
+        '--audio-limit',
+        type=int,
+        default=3,
+        help='Maximum number of audio files to use from --audio-dir.'
+    )
+
+    # Optional argument: Number of concurrent requests
+    parser.add_argument(
+        '--concurrency',
+        type=str,
+        default="1,8,32",
+        help='Comma-separated numbers of requests in flight at once.'
+    )
+
+    # Optional argument: Arrival rates
+    parser.add_argument(
+        '--rate',
+        type=str,
+        default=None,
+        help='Comma-separated arrival rates in requests per second (open loop). By default, each client sends its next request when the previous one completes (closed loop).'
+    )
+
+    # Optional argument: Number of measured requests per scenario
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=200,
+        help='Number of measured requests per scenario.'
+    )
+
+    # Optional argument: Number of warmup requests per scenario
+    parser.add_argument(
+        '--warmup',
+        type=int,
+        default=10,
+        help='Number of warmup requests per scenario, which are not measured.'
+    )
+
+    # Optional argument: Real-time factor of the stub model
+    parser.add_argument(
+        '--stub-rtf',
+        type=float,
+        default=0.0,
+        help='Real-time factor simulated by the stub model of the in-process API (0 returns immediately).'
+    )
+
+    # Optional argument: Process ID of the server
+    parser.add_argument(
+        '--server-pid',
+        type=int,
+        default=None,
+        help='Process ID of the server (including its workers) to report the RSS and CPU usage of, when load testing a --url.'
+    )
+
+    # Optional argument: Timeout of each request
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=300,
+        help='Timeout of each request in seconds, when load testing a --url.'
+    )
+
+    # Optional argument: Path to write the results to
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Path to write the results to as JSON.'
+    )
+
+    # Optional argument: Path of the baseline results to compare against
+    parser.add_argument(
+        '--baseline',
+        type=str,
+        default=None,
+        help='Path of the JSON results of a previous run to compare against.'
+    )
+
+    # Optional argument: Tolerance of the baseline comparison
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='Relative change beyond which a metric counts as a regression against the baseline.'
+    )
+    args = parser.parse_args()
+
+    results = {
+        "target": args.url or "in-process",
+        "stub_rtf": None if args.url else args.stub_rtf,
+        "python": platform.python_version(),
+        "cpus": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "scenarios": asyncio.run(run(args))
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}.")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} metrics regressed by more than {args.tolerance:.0%} against {args.baseline}.")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}.")
+
+if __name__ == "__main__":
+    main()
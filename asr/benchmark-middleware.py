@@ -0,0 +1,188 @@
+import json
+import time
+import uuid
+import asyncio
+import logging
+import argparse
+
+from benchmark_utils import StubModel, call_app, make_multipart, make_wav, prepare_in_process_api, quiet_console, wait_until_ready
+
+# Run the API without the transcription cache and the job queue, and log to a temporary file
+prepare_in_process_api()
+
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+import speech_recognition.model as model
+from api import logging_config
+from api.asr_api import app
+from api.middleware import MetricsMiddleware, UUIDMiddleware
+from core.metrics import REQUESTS
+
+class LegacyUUIDMiddleware(BaseHTTPMiddleware):
+    """The previous `BaseHTTPMiddleware` implementation of the UUID middleware, for comparison."""
+    async def dispatch(self, request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        logging.getLogger("api.middleware").debug(f"Generated request ID {request_id} for incoming request.")
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        logging.getLogger("api.middleware").debug(f"Added X-Request-ID {request_id} to response headers.")
+        return response
+
+class LegacyMetricsMiddleware(BaseHTTPMiddleware):
+    """The previous `BaseHTTPMiddleware` implementation of the metrics middleware, for comparison."""
+    async def dispatch(self, request, call_next):
+        request.state.received_at = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            endpoint = getattr(request.scope.get("route"), "path", "unmatched")
+            REQUESTS.labels(endpoint, request.method, str(status_code)).inc()
+
+async def measure(request, num_requests, concurrency):
+    """
+    Sends requests with a fixed concurrency and measures the throughput.
+
+    Args:
+        request (callable): Coroutine function that sends one request and returns its status code and body.
+        num_requests (int): The number of requests to send.
+        concurrency (int): The number of requests in flight at once.
+
+    Returns:
+        float: The throughput in requests per second.
+    """
+    remaining = iter(range(num_requests))
+    failures = 0
+
+    async def worker():
+        nonlocal failures
+        for _ in remaining:
+            status, _ = await request()
+            if status != 200:
+                failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    if failures:
+        print(f"  {failures} of {num_requests} requests failed.")
+    return num_requests / elapsed
+
+def use_variant(variant, queue_handler, handlers):
+    """
+    Switches the middleware and logging of the application between the previous and current implementations.
+
+    Args:
+        variant (str): Either "before" (BaseHTTPMiddleware and synchronous logging) or "after"
+            (pure ASGI middleware and queue-based logging).
+        queue_handler (logging.Handler): The handler that puts records on the logging queue.
+        handlers (list): The console and file handlers written by the logging listener.
+    """
+    if variant == "before":
+        app.user_middleware = [Middleware(LegacyMetricsMiddleware), Middleware(LegacyUUIDMiddleware)]
+        logger_handlers = list(handlers)
+    else:
+        app.user_middleware = [Middleware(MetricsMiddleware), Middleware(UUIDMiddleware)]
+        logger_handlers = [queue_handler]
+    app.middleware_stack = None
+
+    for name in logging_config.LOGGER_NAMES:
+        logging.getLogger(name).handlers = logger_handlers
+
+async def run(args):
+    # Serve the API with the stub model
+    model._asr_model = StubModel()
+    content_type, body = make_multipart("sample.wav", make_wav(args.audio_seconds))
+    requests = {
+        "ping": lambda: call_app(app, "GET", "/ping"),
+        "asr": lambda: call_app(app, "POST", "/asr", [("content-type", content_type)], body)
+    }
+
+    # Keep the console quiet during the benchmark, while the log file is still written
+    queue_handler = logging.getLogger().handlers[0]
+    handlers = logging_config._listener.handlers
+    quiet_console(handlers)
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        await wait_until_ready(app)
+
+        for endpoint in args.endpoints.split(","):
+            results[endpoint] = {}
+            for variant in ("before", "after"):
+                use_variant(variant, queue_handler, handlers)
+                await measure(requests[endpoint], args.warmup, args.concurrency)
+                results[endpoint][variant] = await measure(requests[endpoint], args.requests, args.concurrency)
+                print(f"{endpoint:<6} {variant:<7} {results[endpoint][variant]:>10.1f} req/s")
+        use_variant("after", queue_handler, handlers)
+
+    print(f"\n{'endpoint':<10} {'before':>12} {'after':>12} {'change':>8}")
+    for endpoint, result in results.items():
+        change = result["after"] / result["before"] - 1
+        print(f"{endpoint:<10} {result['before']:>12.1f} {result['after']:>12.1f} {change:>8.1%}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the throughput of the request pipeline before and after the pure ASGI middleware and queue-based logging.")
+
+    # Optional argument: Endpoints to benchmark
+    parser.add_argument(
+        '--endpoints',
+        type=str,
+        default="ping,asr",
+        help='Comma-separated list of endpoints to benchmark (ping, asr).'
+    )
+
+    # Optional argument: Number of measured requests per endpoint and variant
+    parser.add_argument(
+        '--requests',
+        type=int,
+        default=2000,
+        help='Number of measured requests per endpoint and variant.'
+    )
+
+    # Optional argument: Number of warmup requests per endpoint and variant
+    parser.add_argument(
+        '--warmup',
+        type=int,
+        default=100,
+        help='Number of warmup requests per endpoint and variant.'
+    )
+
+    # Optional argument: Number of concurrent requests
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=32,
+        help='Number of requests in flight at once.'
+    )
+
+    # Optional argument: Duration of the uploaded audio
+    parser.add_argument(
+        '--audio-seconds',
+        type=float,
+        default=1.0,
+        help='Duration in seconds of the audio uploaded to /asr.'
+    )
+
+    # Optional argument: Path to write the results to
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Path to write the results to as JSON.'
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}.")
+
+if __name__ == "__main__":
+    main()
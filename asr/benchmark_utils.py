@@ -0,0 +1,157 @@
+import os
+import io
+import sys
+import math
+import time
+import uuid
+import wave
+import struct
+import asyncio
+import logging
+import tempfile
+
+class StubModel:
+    """
+    Stand-in for the ASR model, so that the benchmarks measure the service without the cost of the model.
+
+    Args:
+        rtf (float): Real-time factor to simulate, i.e. the model sleeps for `rtf` times the duration
+            of its input (0 returns immediately).
+    """
+    def __init__(self, rtf=0.0):
+        self.rtf = rtf
+
+    def __call__(self, inputs, batch_size=None, **kwargs):
+        batch = inputs if isinstance(inputs, list) else [inputs]
+        if self.rtf > 0:
+            time.sleep(self.rtf * sum(len(x["raw"]) / x["sampling_rate"] for x in batch))
+        outputs = [{"text": "BENCHMARK"} for _ in batch]
+        return outputs if isinstance(inputs, list) else outputs[0]
+
+def make_wav(seconds=1.0, sampling_rate=16000):
+    """
+    Generates a WAV file with a sine tone.
+
+    Args:
+        seconds (float): The duration of the audio in seconds.
+        sampling_rate (int): The sampling rate of the audio.
+
+    Returns:
+        bytes: The contents of the WAV file.
+    """
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(sampling_rate)
+        f.writeframes(b"".join(
+            struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / sampling_rate)))
+            for i in range(int(seconds * sampling_rate))
+        ))
+    return buffer.getvalue()
+
+def make_multipart(filename, content, field="file"):
+    """
+    Encodes a file upload as a multipart/form-data body.
+
+    Args:
+        filename (str): The name of the uploaded file.
+        content (bytes): The contents of the uploaded file.
+        field (str): The name of the form field (default is "file", as expected by /asr).
+
+    Returns:
+        tuple: The content type header and the body.
+    """
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode() + content + f"\r\n--{boundary}--\r\n".encode()
+    return f"multipart/form-data; boundary={boundary}", body
+
+async def call_app(app, method, path, headers=(), body=b""):
+    """
+    Sends a single HTTP request to an ASGI application in-process, without going through the network.
+
+    Args:
+        app: The ASGI application.
+        method (str): The HTTP method.
+        path (str): The request path.
+        headers (tuple): The request headers as (name, value) pairs.
+        body (bytes): The request body.
+
+    Returns:
+        tuple: The status code and the body of the response.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers]
+                   + [(b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    status, chunks = [], []
+
+    async def receive():
+        if messages:
+            return messages.pop()
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            status.append(message["status"])
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return status[0], b"".join(chunks)
+
+def prepare_in_process_api():
+    """
+    Configures the API to be served in this process, which must happen before it is imported.
+
+    The transcription cache and the job queue are disabled, the logs are written to a temporary
+    file, and the speech recognition modules are made importable from the asr directory.
+    """
+    os.environ.setdefault("CACHE_ENABLED", "false")
+    os.environ.setdefault("JOBS_ENABLED", "false")
+    os.environ.setdefault("LOG_FILE", os.path.join(tempfile.mkdtemp(), "benchmark.log"))
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+def quiet_console(handlers):
+    """
+    Keeps the console quiet during a benchmark, while the log file is still written.
+
+    Args:
+        handlers (list): The handlers written by the logging listener.
+    """
+    for handler in handlers:
+        if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+            handler.setStream(open(os.devnull, "w"))
+
+async def wait_until_ready(app, interval=0.05):
+    """
+    Waits for the model of an in-process API to be loaded and warmed up.
+
+    Args:
+        app: The ASGI application of the API, after its startup.
+        interval (float): The polling interval in seconds.
+
+    Raises:
+        SystemExit: If the model failed to load.
+    """
+    model_loader = app.state.model_loader
+    while not model_loader.ready:
+        if model_loader.error is not None:
+            sys.exit(f"Failed to load the model: {model_loader.error}")
+        await asyncio.sleep(interval)
@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import json
+import argparse
+
+import numpy as np
+
+# Make the speech recognition modules importable when running from the asr directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from speech_recognition.asr_logic import transcribe_audio_batch
+from speech_recognition.backends import BACKENDS, load_backend
+from speech_recognition.evaluation import edit_distances, error_rate
+
+def transcribe_with_backend(backend, file_paths, model_name, onnx_model_dir, batch_size):
+    """
+    Loads a model backend and transcribes the sample files with it.
+
+    Args:
+        backend (str): The name of the model backend.
+        file_paths (list): Paths to the sample audio files.
+        model_name (str): The name of the pre-trained model in huggingface.
+        onnx_model_dir (str or None): The directory of the exported ONNX model.
+        batch_size (int): The number of files per forward pass.
+
+    Returns:
+        dict: The transcriptions, total audio duration and wall-clock time of the backend.
+    """
+    print(f"Loading the '{backend}' backend...")
+    asr_model = load_backend(backend, model_name, onnx_model_dir=onnx_model_dir, batch_size=batch_size)
+
+    print(f"Transcribing {len(file_paths)} files with the '{backend}' backend...")
+    start = time.perf_counter()
+    results = transcribe_audio_batch(file_paths, asr_model, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    transcriptions = {}
+    audio_seconds = 0.0
+    for file_path, result in zip(file_paths, results):
+        if isinstance(result, Exception):
+            print(f"Failed to transcribe {file_path} with the '{backend}' backend: {result}")
+            continue
+        transcriptions[file_path] = result[0]
+        audio_seconds += float(result[1])
+
+    return {"transcriptions": transcriptions, "audio_seconds": audio_seconds, "elapsed_seconds": elapsed}
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that model backends produce the same transcriptions on a sample set.")
+
+    # Required argument: Path to the directory containing audio files
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        required=True,
+        help='Path to the directory containing the sample audio files.'
+    )
+
+    # Optional argument: Backends to compare, the first one is the reference
+    parser.add_argument(
+        '--backends',
+        type=str,
+        default=",".join(BACKENDS),
+        help='Comma-separated list of backends to compare. The first backend is used as the reference.'
+    )
+
+    # Optional argument: Pre-trained model in huggingface
+    parser.add_argument(
+        '--model-name',
+        type=str,
+        default=os.getenv("MODEL_NAME", "facebook/wav2vec2-large-960h"),
+        help='Name of the pre-trained model in huggingface.'
+    )
+
+    # Optional argument: Directory of the exported ONNX model
+    parser.add_argument(
+        '--onnx-model-dir',
+        type=str,
+        default=os.getenv("ONNX_MODEL_DIR"),
+        help='Directory to load the exported ONNX model from, or to save it to after exporting.'
+    )
+
+    # Optional argument: Number of sample files
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=100,
+        help='Maximum number of audio files to compare on.'
+    )
+
+    # Optional argument: Number of files per forward pass
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=8,
+        help='Number of files per forward pass.'
+    )
+
+    # Optional argument: Maximum accepted word error rate against the reference backend
+    parser.add_argument(
+        '--max-wer',
+        type=float,
+        default=0.02,
+        help='Maximum word error rate of a backend against the reference backend before the check fails.'
+    )
+
+    # Optional argument: Path to write the report to
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Path to write the comparison report to as JSON.'
+    )
+    args = parser.parse_args()
+
+    # Verify if the specified directory exists
+    data_dir = os.path.abspath(args.data_dir)
+    if not os.path.isdir(data_dir):
+        print(f"The directory {data_dir} does not exist.")
+        sys.exit(1)
+
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    unknown = [backend for backend in backends if backend not in BACKENDS]
+    if unknown:
+        print(f"Unsupported backends: {', '.join(unknown)}. Expected any of: {', '.join(BACKENDS)}.")
+        sys.exit(1)
+
+    # Collect the sample set
+    file_paths = sorted(
+        os.path.join(root, file)
+        for root, _, files in os.walk(data_dir)
+        for file in files
+        if file.lower().endswith('.mp3')
+    )[:args.limit]
+    if not file_paths:
+        print(f"No .mp3 files found in {data_dir}.")
+        sys.exit(1)
+
+    runs = {
+        backend: transcribe_with_backend(backend, file_paths, args.model_name, args.onnx_model_dir, args.batch_size)
+        for backend in backends
+    }
+
+    # Compare every backend against the reference backend
+    reference_backend = backends[0]
+    reference = runs[reference_backend]["transcriptions"]
+    report = {"reference": reference_backend, "files": len(file_paths), "backends": {}}
+    passed = True
+    print(f"\n{'backend':<14} {'exact match':>12} {'WER vs ref':>11} {'audio s/s':>10}")
+    for backend, run in runs.items():
+        common = [path for path in reference if path in run["transcriptions"]]
+        exact = sum(reference[path] == run["transcriptions"][path] for path in common)
+        wer = error_rate(
+            edit_distances([reference[path] for path in common], [run["transcriptions"][path] for path in common]),
+            np.array([len(reference[path].split()) for path in common], dtype=np.int64)
+        )
+        speed = run["audio_seconds"] / run["elapsed_seconds"] if run["elapsed_seconds"] else 0.0
+        disagreements = [
+            {"file": path, "reference": reference[path], "hypothesis": run["transcriptions"][path]}
+            for path in common
+            if reference[path] != run["transcriptions"][path]
+        ]
+
+        report["backends"][backend] = {
+            "exact_match": exact / len(common) if common else 0.0,
+            "wer_vs_reference": wer,
+            "audio_seconds_per_second": speed,
+            "failed_files": len(file_paths) - len(run["transcriptions"]),
+            "disagreements": disagreements
+        }
+        print(f"{backend:<14} {report['backends'][backend]['exact_match']:>12.1%} {wer:>11.2%} {speed:>10.1f}")
+
+        if wer > args.max_wer:
+            passed = False
+            print(f"The '{backend}' backend exceeds the maximum WER of {args.max_wer:.2%} against '{reference_backend}'.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}.")
+
+    sys.exit(0 if passed else 1)
+
+if __name__ == "__main__":
+    main()
@@ -3,89 +3,598 @@ import requests
 import argparse
 import csv
 import sys
+import json
+import time
+import queue
+import random
+import itertools
+import threading
 
-def transcribe_file(file_path, api_url):
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+# Make the speech recognition modules importable for the offline mode, when running from the asr directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+class RateLimiter:
+    """
+    Limits the rate at which requests are sent, shared by all upload threads.
+
+    Args:
+        rate (float or None): The maximum number of requests per second, or None for no limit.
+    """
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        Blocks until the next request may be sent.
+        """
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+def create_session(pool_size):
+    """
+    Creates an HTTP session that keeps connections to the API alive and reuses them across requests.
+
+    Args:
+        pool_size (int): The maximum number of pooled connections, which should match the number of concurrent uploads.
+
+    Returns:
+        requests.Session: The HTTP session.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+def retry_delay(response, attempt, backoff):
+    """
+    Computes how long to wait before retrying a request.
+
+    Args:
+        response (requests.Response or None): The failed response, or None if the request did not complete.
+        attempt (int): The number of attempts made so far.
+        backoff (float): The base delay of the exponential backoff in seconds.
+
+    Returns:
+        float: The delay in seconds, which honours the Retry-After header of the response if present.
+    """
+    if response is not None:
+        try:
+            return float(response.headers['Retry-After'])
+        except (KeyError, ValueError):
+            pass
+    # Exponential backoff with jitter, so that concurrent uploads do not retry in lockstep
+    return backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5)
+
+def transcribe_file(file_path, api_url, session=None, retries=3, backoff=1.0, rate_limiter=None):
     """
     Sends an audio file to the speech recognition API and returns the response.
 
+    Requests that fail with a server error (5xx, including 503 while the model is loading or the
+    API is overloaded), are rate limited (429) or do not complete are retried with exponential backoff.
+
     Args:
         file_path (str): Path to the audio file.
         api_url (str): URL of the speech recognition API endpoint.
+        session (requests.Session or None): HTTP session to send the request with, to reuse its connections.
+        retries (int): The maximum number of retries.
+        backoff (float): The base delay of the exponential backoff in seconds.
+        rate_limiter (RateLimiter or None): Limiter of the rate at which requests are sent.
 
     Returns:
         dict or None: JSON response from the API if successful; otherwise, None.
     """
-    try:
-        with open(file_path, 'rb') as f:
-            files = {'file': f}
-            response = requests.post(api_url, files=files)
-        if response.status_code == 200:
-            return response.json()
-        else:
-            print(f"Failed to transcribe {file_path}: {response.text}")
+    session = session or requests
+    for attempt in range(1, retries + 2):
+        if rate_limiter:
+            rate_limiter.wait()
+        response = None
+        try:
+            with open(file_path, 'rb') as f:
+                files = {'file': f}
+                response = session.post(api_url, files=files)
+            if response.status_code == 200:
+                return response.json()
+            if response.status_code < 500 and response.status_code != 429:
+                print(f"Failed to transcribe {file_path}: {response.text}")
+                return None
+            error = response.text
+        except requests.RequestException as e:
+            error = e
+        except Exception as e:
+            print(f"Error while transcribing {file_path}: {e}")
             return None
-    except Exception as e:
-        print(f"Error while transcribing {file_path}: {e}")
-        return None
 
-def update_csv(csv_path, filename, generated_text, duration):
+        if attempt > retries:
+            print(f"Failed to transcribe {file_path} after {attempt} attempts: {error}")
+            return None
+        delay = retry_delay(response, attempt, backoff)
+        print(f"Attempt {attempt} to transcribe {file_path} failed ({error}); retrying in {delay:.1f}s.")
+        time.sleep(delay)
+
+class ResultsStore:
     """
-    Updates the CSV file by adding or updating the 'generated_text' column for the corresponding row.
+    Stores the transcriptions of a run and merges them into the CSV file once at the end.
+
+    The CSV file is read once into memory and indexed by filename. Completed transcriptions are
+    appended to a journal (one JSON object per line), which is flushed to disk in batches, and the
+    CSV file is only rewritten by `merge`. If a run is interrupted, the journal keeps track of the
+    files that were transcribed, so that a resumed run can skip them and still merge their results.
 
     Args:
         csv_path (str): Path to the CSV file.
-        filename (str): Name of the audio file.
-        generated_text (str): Transcribed text from the API.
+        journal_path (str): Path to the journal of completed transcriptions.
+        flush_every (int): The number of transcriptions buffered before the journal is flushed to disk.
+        resume (bool): Whether to keep the transcriptions of a previous run from the journal, rather than starting a new journal.
+        discard (bool): Whether to start a new journal even if the journal of a previous run holds transcriptions.
+
+    Raises:
+        FileExistsError: If the journal of a previous run holds transcriptions and neither `resume` nor `discard` is set.
     """
-    # Check if the CSV file exists
-    if not os.path.isfile(csv_path):
-        print(f"The CSV file {csv_path} does not exist. Creating a new one with headers.")
-        # Define CSV headers including new columns
-        headers = ['filename', 'text', 'up_votes', 'down_votes', 'age', 'gender', 'accent', 'duration', 'generated_text']
-        rows = []
-    else:
-        # Open the existing CSV file for reading
-        with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            headers = reader.fieldnames
-            rows = list(reader)
-
-    # If 'generated_text' column doesn't exist, add it to headers
-    if 'generated_text' not in headers:
-        headers.append('generated_text')
-        print("Added 'generated_text' column to the CSV headers.")
-
-    # Flag to determine if the filename exists in the CSV
-    found = False
-
-    # Iterate through each row to find the matching filename
-    for row in rows:
-        if row['filename'] == filename:
-            # Update 'generated_text' for the matching filename
-            row['generated_text'] = generated_text
-            # Update 'duration' for the matching filename
-            row['duration'] = duration
-            found = True
-            print(f"Updated 'generated_text' and 'duration' for {filename}.")
-            break # Exit loop after finding the matching row
-
-    # If the filename was not found in the CSV, append a new row
-    if not found:
-        print(f"Filename {filename} not found in CSV. Adding a new row.")
-        # Initialize all other columns as empty or default values if necessary
-        new_row = {header: '' for header in headers}
-        new_row['filename'] = filename
-        new_row['generated_text'] = generated_text
-        new_row['duration'] = duration
-        rows.append(new_row)
-
-    # Write the updated rows back to the CSV file
-    with open(csv_path, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=headers)
-        writer.writeheader() # Write headers to CSV
-        writer.writerows(rows) # Write all rows to CSV
-
-    print(f"CSV '{csv_path}' updated successfully.\n")
+    def __init__(self, csv_path, journal_path, flush_every=50, resume=False, discard=False):
+        self.csv_path = csv_path
+        self.journal_path = journal_path
+        self.flush_every = max(1, flush_every)
+        self.buffer = []
+
+        # The audio files of the journaled transcriptions are deleted, so never truncate a journal by accident
+        if not resume and not discard and os.path.isfile(journal_path) and os.path.getsize(journal_path) > 0:
+            raise FileExistsError(
+                f"The journal {journal_path} holds the transcriptions of an interrupted run, whose audio files were deleted. "
+                "Run again with --resume to keep them, or with --discard-journal to start over without them."
+            )
+
+        # Check if the CSV file exists
+        if not os.path.isfile(csv_path):
+            print(f"The CSV file {csv_path} does not exist. Creating a new one with headers.")
+            # Define CSV headers including new columns
+            self.headers = ['filename', 'text', 'up_votes', 'down_votes', 'age', 'gender', 'accent', 'duration', 'generated_text']
+            self.rows = []
+        else:
+            # Open the existing CSV file for reading
+            with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+                reader = csv.DictReader(csvfile)
+                self.headers = list(reader.fieldnames or [])
+                self.rows = list(reader)
+
+        # If 'generated_text' column doesn't exist, add it to headers
+        if 'generated_text' not in self.headers:
+            self.headers.append('generated_text')
+            print("Added 'generated_text' column to the CSV headers.")
+
+        # Index the rows by filename, so that each update is a dictionary lookup rather than a scan of the file
+        self.index = {row['filename']: row for row in self.rows}
+
+        # Replay the journal of a previous run, or start a new one
+        self.completed = set()
+        if resume and os.path.isfile(journal_path):
+            with open(journal_path, 'r', encoding='utf-8') as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # The last line may be incomplete if the previous run was killed while writing it
+                        continue
+                    self._apply(record)
+            print(f"Resuming from {journal_path} with {len(self.completed)} completed files.")
+        self.journal = open(journal_path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _apply(self, record):
+        """
+        Applies a transcription to the in-memory rows.
+
+        Args:
+            record (dict): The filename, generated text and duration of the transcription.
+        """
+        row = self.index.get(record['filename'])
+        if row is None:
+            # Initialize all other columns as empty or default values if necessary
+            row = {header: '' for header in self.headers}
+            row['filename'] = record['filename']
+            self.rows.append(row)
+            self.index[record['filename']] = row
+        row['generated_text'] = record['generated_text']
+        row['duration'] = record['duration']
+        self.completed.add(record['filename'])
+
+    def add(self, filename, generated_text, duration):
+        """
+        Adds a transcription to the store.
+
+        Args:
+            filename (str): Name of the audio file relative to the data directory's parent (e.g. 'cv-valid-dev/sample-000000.mp3').
+            generated_text (str): Transcribed text from the API.
+            duration (str): Duration of the audio file from the API.
+
+        Returns:
+            bool: Whether the journal was flushed to disk, including this transcription.
+        """
+        record = {'filename': filename, 'generated_text': generated_text, 'duration': duration}
+        self._apply(record)
+        self.buffer.append(json.dumps(record) + "\n")
+        if len(self.buffer) >= self.flush_every:
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        """
+        Writes the buffered transcriptions to the journal and syncs it to disk.
+        """
+        if self.buffer:
+            self.journal.writelines(self.buffer)
+            self.buffer = []
+        self.journal.flush()
+        os.fsync(self.journal.fileno())
+
+    def merge(self):
+        """
+        Writes all rows to the CSV file and removes the journal, whose transcriptions are then in the CSV file.
+        """
+        self.flush()
+        self.journal.close()
+
+        # Write to a temporary file first, so that the CSV file is never left half-written
+        temp_path = self.csv_path + ".tmp"
+        with open(temp_path, 'w', newline='', encoding='utf-8') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=self.headers)
+            writer.writeheader() # Write headers to CSV
+            writer.writerows(self.rows) # Write all rows to CSV
+        os.replace(temp_path, self.csv_path)
+        os.remove(self.journal_path)
+        print(f"CSV '{self.csv_path}' updated successfully with {len(self.completed)} transcriptions.")
+
+    def close(self):
+        """
+        Removes the journal without updating the CSV file, once its transcriptions are stored elsewhere (e.g., indexed in Elasticsearch).
+        """
+        self.flush()
+        self.journal.close()
+        os.remove(self.journal_path)
+
+def transcribe_online(file_paths, api_url, args):
+    """
+    Transcribes audio files by uploading them to the speech recognition API concurrently.
+
+    At most twice as many files as concurrent uploads are in flight at once, so that uploads
+    slow down when the results are not consumed fast enough (e.g., by the indexing stage).
+
+    Args:
+        file_paths (list): Paths to the audio files.
+        api_url (str): URL of the speech recognition API endpoint.
+        args (argparse.Namespace): The command-line arguments.
+
+    Yields:
+        tuple: The path of each audio file and its JSON response from the API (None if it failed), in order of completion.
+    """
+    print(f"Transcribing {len(file_paths)} files with {args.concurrency} concurrent uploads...")
+    session = create_session(args.concurrency)
+    rate_limiter = RateLimiter(args.rate)
+    try:
+        with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+            remaining = iter(file_paths)
+            futures = {}
+
+            def submit(count):
+                for file_path in itertools.islice(remaining, count):
+                    future = executor.submit(transcribe_file, file_path, api_url, session, args.retries, args.backoff, rate_limiter)
+                    futures[future] = file_path
+
+            submit(args.concurrency * 2)
+            while futures:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = futures.pop(future)
+                    submit(1)
+                    yield file_path, future.result()
+    finally:
+        session.close()
+
+def decode_file(file_path, sampling_rate):
+    """
+    Decodes an audio file into a waveform, in a worker process of the offline mode.
+
+    Args:
+        file_path (str): Path to the audio file.
+        sampling_rate (int): The sampling rate to resample the audio to.
+
+    Returns:
+        numpy.ndarray or str: The decoded waveform, or the error message if the file could not be decoded.
+    """
+    from speech_recognition.asr_logic import load_audio
+
+    try:
+        return load_audio(file_path, sampling_rate)
+    except Exception as e:
+        return str(e)
+
+def transcribe_offline(file_paths, args):
+    """
+    Transcribes audio files with the model loaded in this process, without going through the API.
+
+    The audio files are decoded by a pool of worker processes, while the model transcribes the
+    previously decoded files in batches, so that decoding and inference run on all cores at once.
+
+    Args:
+        file_paths (list): Paths to the audio files.
+        args (argparse.Namespace): The command-line arguments.
+
+    Yields:
+        tuple: The path of each audio file and its transcription and duration (None if it failed).
+    """
+    import multiprocessing
+
+    # Start the decoding workers before loading the model, so that they do not inherit it
+    decode_workers = args.decode_workers or os.cpu_count() or 1
+    pool = ProcessPoolExecutor(max_workers=decode_workers, mp_context=multiprocessing.get_context("spawn"))
+
+    from core.config import settings
+    from core.factory import SpeechRecognizerFactory
+    from speech_recognition.asr_logic import transcribe_waveforms
+
+    batch_size = args.batch_size or settings.MAX_BATCH_SIZE
+    sampling_rate = settings.SAMPLING_RATE
+    print(f"Loading the '{settings.MODEL_BACKEND}' backend of {settings.MODEL_NAME}...")
+    if args.torch_threads:
+        import torch
+
+        torch.set_num_threads(args.torch_threads)
+    asr_model = SpeechRecognizerFactory.create_speech_recognizer(use_batch_scheduler=False, use_cache=False).asr_model
+
+    print(f"Transcribing {len(file_paths)} files offline with {decode_workers} decoding workers and batches of {batch_size}...")
+    # Transcribe a few batches at a time, while the next ones are decoded
+    chunk_size = batch_size * 4
+    remaining = iter(file_paths)
+    pending = deque()
+
+    def submit(count):
+        for file_path in remaining:
+            pending.append((file_path, pool.submit(decode_file, file_path, sampling_rate)))
+            count -= 1
+            if count == 0:
+                break
+
+    try:
+        submit(chunk_size * 2)
+        while pending:
+            chunk = [pending.popleft() for _ in range(min(chunk_size, len(pending)))]
+            waveforms, paths = {}, {}
+            for index, (file_path, future) in enumerate(chunk):
+                waveform = future.result()
+                if isinstance(waveform, str):
+                    print(f"Failed to decode {file_path}: {waveform}")
+                    yield file_path, None
+                    continue
+                waveforms[index], paths[index] = waveform, file_path
+            submit(chunk_size)
+
+            for index, result in transcribe_waveforms(waveforms, asr_model, sampling_rate, batch_size).items():
+                if isinstance(result, Exception):
+                    print(f"Failed to transcribe {paths[index]}: {result}")
+                    yield paths[index], None
+                else:
+                    yield paths[index], {'transcription': result[0], 'duration': result[1]}
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def build_document(filename, row, generated_text, duration):
+    """
+    Builds the Elasticsearch document of a transcription, with the metadata of its row in the CSV file.
+
+    The fields are converted as `cv-index.py` does, to match the mappings of the index.
+
+    Args:
+        filename (str): Name of the audio file relative to the data directory's parent.
+        row (dict or None): The row of the audio file in the CSV file, or None if it has none.
+        generated_text (str): Transcribed text.
+        duration (str or float): Duration of the audio file in seconds.
+
+    Returns:
+        dict: The source of the document.
+    """
+    row = row or {}
+
+    def number(value, integer):
+        try:
+            value = float(value)
+        except (TypeError, ValueError):
+            return 0 if integer else 0.0
+        if integer:
+            return int(value) if value.is_integer() else 0
+        return value
+
+    return {
+        'filename': filename,
+        'text': row.get('text') or '',
+        'up_votes': number(row.get('up_votes'), True),
+        'down_votes': number(row.get('down_votes'), True),
+        # Empty metadata is stored as null, so that it is missing from aggregations and filters
+        'age': row.get('age') or None,
+        'gender': row.get('gender') or None,
+        'accent': row.get('accent') or None,
+        'duration': number(duration, False),
+        'generated_text': generated_text
+    }
+
+class BulkIndexer(threading.Thread):
+    """
+    Indexes transcriptions in Elasticsearch as they complete, in a background thread.
+
+    Documents are put on a bounded queue, so that the transcription stage blocks when indexing
+    falls behind. The thread sends them with the bulk API once `buffer_size` documents are
+    buffered or `flush_interval` seconds have passed since the first one, whichever comes first.
+    Once a bulk request completes, the indexed transcriptions are recorded in the results store,
+    which is the checkpoint of the pipeline, and their audio files are deleted.
+
+    Args:
+        es (elasticsearch.Elasticsearch): The Elasticsearch client.
+        index_name (str): The name of the index (or alias) to write to.
+        store (ResultsStore): The results store recording the indexed transcriptions.
+        buffer_size (int): The maximum number of documents per bulk request.
+        queue_size (int): The maximum number of documents waiting to be buffered.
+        flush_interval (float): The maximum number of seconds a document waits in the buffer.
+        retries (int): The maximum number of retries of documents rejected by a full bulk queue (429).
+        backoff (float): The delay in seconds before the first retry, doubled on every retry.
+    """
+    def __init__(self, es, index_name, store, buffer_size=500, queue_size=2000, flush_interval=5.0, retries=3, backoff=1.0):
+        super().__init__(name="bulk-indexer", daemon=True)
+        self.es = es
+        self.index_name = index_name
+        self.store = store
+        self.buffer_size = max(1, buffer_size)
+        self.flush_interval = flush_interval
+        self.retries = retries
+        self.backoff = backoff
+        self.queue = queue.Queue(maxsize=max(1, queue_size))
+        self.indexed = 0
+        self.failed = 0
+        self.error = None
+
+    def put(self, file_path, document):
+        """
+        Queues a document for indexing, blocking while the queue is full.
+
+        Args:
+            file_path (str): Path to the audio file, deleted once the document is indexed.
+            document (dict): The source of the document, as built by `build_document`.
+
+        Raises:
+            RuntimeError: If the indexing thread stopped because of an error.
+        """
+        while True:
+            if self.error is not None:
+                raise RuntimeError(f"Indexing stopped: {self.error}")
+            try:
+                self.queue.put((file_path, document), timeout=1)
+                return
+            except queue.Full:
+                continue
+
+    def close(self):
+        """
+        Indexes the queued documents and stops the thread.
+        """
+        if self.is_alive():
+            # The thread drains the queue before reaching the sentinel, unless it stopped because of an error
+            while self.is_alive():
+                try:
+                    self.queue.put(None, timeout=1)
+                    break
+                except queue.Full:
+                    continue
+            self.join()
+
+    def run(self):
+        buffer = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    # The oldest buffered document has waited for the flush interval
+                    self.flush(buffer)
+                    buffer, deadline = [], None
+                    continue
+                if item is None:
+                    if buffer:
+                        self.flush(buffer)
+                    return
+                buffer.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(buffer) >= self.buffer_size:
+                    self.flush(buffer)
+                    buffer, deadline = [], None
+        except Exception as e:
+            print(f"Failed to index transcriptions in Elasticsearch: {e}")
+            self.error = e
+
+    def flush(self, buffer):
+        """
+        Sends the buffered documents with the bulk API and records the indexed ones.
+
+        Args:
+            buffer (list): The paths of the audio files and their documents.
+        """
+        from elasticsearch import helpers
+
+        # A file buffered twice is indexed once under its filename, with its latest transcription, and
+        # all of its audio files are recorded and deleted together once that document is indexed
+        documents = {}
+        for file_path, document in buffer:
+            file_paths, _ = documents.get(document['filename'], ([], None))
+            documents[document['filename']] = (file_paths + [file_path], document)
+        if len(documents) < len(buffer):
+            print(f"Collapsed {len(buffer) - len(documents)} duplicate transcriptions of the same files.")
+        actions = (
+            {'_index': self.index_name, '_id': filename, '_source': document}
+            for filename, (_, document) in documents.items()
+        )
+        indexed = []
+        for ok, item in helpers.streaming_bulk(
+                self.es,
+                actions,
+                chunk_size=len(documents),
+                max_retries=self.retries,
+                initial_backoff=self.backoff,
+                raise_on_error=False
+            ):
+            # Each item is a single-key dictionary of the operation type to its result
+            (_, result), = item.items()
+            if ok:
+                indexed.append(documents[result['_id']])
+            else:
+                self.failed += 1
+                print(f"Failed to index {result.get('_id')}: {result.get('error')}")
+
+        # Checkpoint the indexed transcriptions before deleting their audio files
+        for _, document in indexed:
+            self.store.add(document['filename'], document['generated_text'], document['duration'])
+        self.store.flush()
+        delete_files([file_path for file_paths, _ in indexed for file_path in file_paths])
+        self.indexed += len(indexed)
+        print(f"Indexed {len(indexed)} transcriptions in '{self.index_name}' ({self.indexed} in total).")
+
+def relative_filename(file_path):
+    """
+    Gets the filename of an audio file as stored in the CSV file.
+
+    Args:
+        file_path (str): Path to the audio file.
+
+    Returns:
+        str: The filename relative to the parent of the data directory (e.g., 'cv-valid-dev/sample-000000.mp3').
+    """
+    return os.path.basename(os.path.dirname(file_path)) + "/" + os.path.basename(file_path)
+
+def delete_files(file_paths):
+    """
+    Deletes the audio files that were transcribed successfully.
+
+    Args:
+        file_paths (list): Paths to the audio files.
+    """
+    for file_path in file_paths:
+        try:
+            os.remove(file_path)
+            print(f"Deleted {file_path}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Failed to delete {file_path}: {e}")
 
 def main():
     parser = argparse.ArgumentParser(description="Transcribe all audio files in a specified directory.")
@@ -113,7 +622,149 @@ def main():
         default="http://localhost:8001/asr",
         help='URL of the speech recognition API endpoint.'
     )
+
+    # Optional argument: Number of concurrent uploads
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Number of audio files uploaded to the API at once, over a pool of keep-alive connections.'
+    )
+
+    # Optional argument: Maximum request rate
+    parser.add_argument(
+        '--rate',
+        type=float,
+        default=None,
+        help='Maximum number of requests per second sent to the API (default is no limit).'
+    )
+
+    # Optional argument: Number of retries
+    parser.add_argument(
+        '--retries',
+        type=int,
+        default=3,
+        help='Maximum number of retries of a file after a server error (5xx) or a connection error.'
+    )
+
+    # Optional argument: Base delay of the exponential backoff
+    parser.add_argument(
+        '--backoff',
+        type=float,
+        default=1.0,
+        help='Base delay in seconds of the exponential backoff between retries, unless the API sends a Retry-After header.'
+    )
+
+    # Optional argument: Path to the journal of completed transcriptions
+    parser.add_argument(
+        '--journal',
+        type=str,
+        default=None,
+        help='Path to the journal of completed transcriptions (default is the CSV file path with a .journal suffix).'
+    )
+
+    # Optional argument: Number of transcriptions per journal flush
+    parser.add_argument(
+        '--flush-every',
+        type=int,
+        default=50,
+        help='Number of transcriptions buffered before the journal is flushed to disk.'
+    )
+
+    # Optional argument: Resume an interrupted run
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume an interrupted run: keep the transcriptions in the journal and skip their files.'
+    )
+
+    # Optional argument: Discard the journal of an interrupted run
+    parser.add_argument(
+        '--discard-journal',
+        action='store_true',
+        help='Start a new journal even if it holds the transcriptions of an interrupted run (their audio files were already deleted, so they are lost).'
+    )
+
+    # Optional argument: Transcribe in this process instead of through the API
+    parser.add_argument(
+        '--offline',
+        action='store_true',
+        help='Transcribe with the model loaded in this process instead of the API (requires the dependencies in requirements.txt, and uses the MODEL_* settings).'
+    )
+
+    # Optional argument: Number of decoding workers of the offline mode
+    parser.add_argument(
+        '--decode-workers',
+        type=int,
+        default=None,
+        help='Number of worker processes decoding audio files in the offline mode (default is the number of CPUs).'
+    )
+
+    # Optional argument: Number of files per forward pass of the offline mode
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=None,
+        help='Number of files per forward pass in the offline mode (default is the MAX_BATCH_SIZE setting).'
+    )
+
+    # Optional argument: Number of torch threads of the offline mode
+    parser.add_argument(
+        '--torch-threads',
+        type=int,
+        default=None,
+        help='Intra-op thread count of torch in the offline mode (default is the torch default).'
+    )
+
+    # Optional argument: Stream the transcriptions into Elasticsearch
+    parser.add_argument(
+        '--index',
+        action='store_true',
+        help='Index each transcription in Elasticsearch as it completes, with the metadata of its row in the CSV file, instead of updating the CSV file (requires elasticsearch).'
+    )
+
+    # Optional argument: URL of Elasticsearch
+    parser.add_argument(
+        '--es-host',
+        type=str,
+        default=os.getenv("ES_HOST", "http://localhost:9200"),
+        help='URL of Elasticsearch for --index, or several comma-separated URLs of nodes of the cluster.'
+    )
+
+    # Optional argument: Name of the index
+    parser.add_argument(
+        '--index-name',
+        type=str,
+        default=os.getenv("INDEX_NAME", "cv-transcriptions"),
+        help='Name of the index (or alias) to write to with --index, which must exist.'
+    )
+
+    # Optional argument: Number of documents per bulk request
+    parser.add_argument(
+        '--index-buffer',
+        type=int,
+        default=500,
+        help='Maximum number of transcriptions per bulk request with --index.'
+    )
+
+    # Optional argument: Number of transcriptions waiting to be indexed
+    parser.add_argument(
+        '--index-queue',
+        type=int,
+        default=2000,
+        help='Maximum number of transcriptions waiting to be indexed with --index, beyond which transcription pauses.'
+    )
+
+    # Optional argument: Maximum delay before indexing
+    parser.add_argument(
+        '--index-flush-interval',
+        type=float,
+        default=5.0,
+        help='Maximum number of seconds a transcription waits to be indexed with --index, when fewer than --index-buffer are waiting.'
+    )
     args = parser.parse_args()
+    if args.resume and args.discard_journal:
+        parser.error("--resume and --discard-journal cannot be used together.")
 
     # Convert provided paths to absolute paths for consistency
     data_dir = os.path.abspath(args.data_dir)
@@ -130,37 +781,124 @@ def main():
         print(f"The directory {data_dir} does not exist.")
         sys.exit(1)
 
-    # Traverse through all audio files in the specified directory
-    for root, _, files in os.walk(data_dir):
-        for file in files:
-            # Process only .mp3 files
-            if file.lower().endswith('.mp3'):
-                # Construct the full path of the audio file
-                file_path = os.path.join(root, file)
-                print(f"Transcribing {file_path}...")
-                # Transcribe the audio file using the API
-                result = transcribe_file(file_path, api_url)
-                if result:
-                    # Extract transcription and duration from the API response
-                    generated_text = result.get('transcription', '').strip()
-                    duration = result.get('duration', 0)  # Optional: If you want to use duration
-
-                    # Extract the filename relative to data_dir (e.g., 'cv-valid-dev/sample-000000.mp3')
-                    relative_path = root.split("/")[-1] + "/" + file
-                    print(f"Transcription: {generated_text}, Duration: {duration}")
-
-                    # Update the CSV file with the transcription and duration
-                    update_csv(csv_path, relative_path, generated_text, duration)
-
-                    # Delete the audio file after successful transcription
-                    try:
-                        os.remove(file_path)
-                        print(f"Deleted {file_path}\n")
-                    except Exception as e:
-                        print(f"Failed to delete {file_path}: {e}\n")
+    # Connect to Elasticsearch before starting, so that a misconfigured run fails early
+    es = None
+    if args.index:
+        from elasticsearch import Elasticsearch
+
+        es = Elasticsearch([host.strip() for host in args.es_host.split(",") if host.strip()])
+        if not es.ping():
+            print(f"Cannot connect to Elasticsearch at {args.es_host}.")
+            sys.exit(1)
+        if not es.indices.exists(index=args.index_name):
+            print(f"The index {args.index_name} does not exist. Create it by running cv-index.py first.")
+            sys.exit(1)
+
+    try:
+        store = ResultsStore(
+            csv_path, args.journal or csv_path + ".journal", args.flush_every, args.resume, args.discard_journal
+        )
+    except FileExistsError as e:
+        print(e)
+        sys.exit(1)
+
+    # Collect all .mp3 files in the specified directory, skipping the files transcribed by an interrupted run
+    file_paths = [
+        os.path.join(root, file)
+        for root, _, files in os.walk(data_dir)
+        for file in files
+        if file.lower().endswith('.mp3')
+    ]
+    skipped = [file_path for file_path in file_paths if relative_filename(file_path) in store.completed]
+    if skipped:
+        print(f"Skipping {len(skipped)} files already transcribed in the journal.")
+        delete_files(skipped)
+        file_paths = [file_path for file_path in file_paths if relative_filename(file_path) not in store.completed]
+    total = len(file_paths)
+    start = time.perf_counter()
+    completed = failed = 0
+    audio_seconds = 0.0
+    # Audio files are only deleted once their transcription is flushed to the journal
+    pending_deletes = []
+
+    # With --index, the journal only records the transcriptions once they are indexed
+    indexer = None
+    if es is not None:
+        indexer = BulkIndexer(
+            es, args.index_name, store, args.index_buffer, args.index_queue, args.index_flush_interval, args.retries, args.backoff
+        )
+        indexer.start()
+
+    if args.offline:
+        results = transcribe_offline(file_paths, args)
+    else:
+        results = transcribe_online(file_paths, api_url, args)
+
+    # Record the transcriptions in the results store as they complete
+    try:
+        for file_path, result in results:
+            if result:
+                # Extract transcription and duration from the result
+                generated_text = result.get('transcription', '').strip()
+                duration = result.get('duration', 0)  # Optional: If you want to use duration
+                print(f"Transcribed {file_path}: {generated_text}, Duration: {duration}")
+
+                if indexer is not None:
+                    # Hand the transcription over to the indexing stage, which records it and deletes the file once indexed
+                    filename = relative_filename(file_path)
+                    indexer.put(file_path, build_document(filename, store.index.get(filename), generated_text, duration))
                 else:
-                    # If transcription failed, skip deleting the file
-                    print(f"Skipping deletion for {file_path} due to transcription failure.\n")
+                    # Record the transcription and duration in the results store
+                    pending_deletes.append(file_path)
+                    if store.add(relative_filename(file_path), generated_text, duration):
+                        delete_files(pending_deletes)
+                        pending_deletes = []
+                completed += 1
+                try:
+                    audio_seconds += float(duration)
+                except (TypeError, ValueError):
+                    pass
+            else:
+                # If transcription failed, skip deleting the file
+                failed += 1
+                print(f"Skipping deletion for {file_path} due to transcription failure.")
+
+            # Report the progress and throughput
+            elapsed = time.perf_counter() - start
+            done = completed + failed
+            print(
+                f"Progress: {done}/{total} files ({failed} failed), "
+                f"{done / elapsed:.1f} files/s, {audio_seconds / elapsed:.1f} audio s/s\n"
+            )
+    except BaseException:
+        # Keep the completed transcriptions in the journal, so that the run can be resumed
+        if indexer is not None:
+            indexer.close()
+        store.flush()
+        delete_files(pending_deletes)
+        print(f"Interrupted after {completed} files. Run again with --resume to continue.")
+        raise
+    finally:
+        results.close()
+
+    if indexer is not None:
+        # Index the remaining transcriptions, whose journal is no longer needed once they are all indexed
+        indexer.close()
+        if indexer.error is not None:
+            store.flush()
+            print(f"Indexing stopped after {indexer.indexed} files. Run again with --resume to continue.")
+            sys.exit(1)
+        store.close()
+        print(f"Indexed {indexer.indexed} transcriptions in '{args.index_name}' ({indexer.failed} failed).")
+    else:
+        # Merge the transcriptions into the CSV file
+        store.merge()
+        delete_files(pending_deletes)
+    elapsed = time.perf_counter() - start
+    print(f"Transcribed {completed} of {total} files in {elapsed:.1f}s ({failed} failed).")
+    if elapsed:
+        # Audio hours per wall-clock hour, i.e. how many times faster than real time the run was
+        print(f"Throughput: {audio_seconds / 3600:.2f} audio hours in {elapsed / 3600:.3f} hours ({audio_seconds / elapsed:.1f} audio hours per hour).")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
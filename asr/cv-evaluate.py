@@ -0,0 +1,281 @@
+import os
+import sys
+import csv
+import time
+import json
+import argparse
+
+import numpy as np
+
+# Make the speech recognition modules importable when running from the asr directory
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+
+from speech_recognition.evaluation import edit_distances, error_rate, normalize_text
+
+# Columns of the CSV file to slice the error rates by, besides the duration
+SLICE_COLUMNS = ['accent', 'age', 'gender']
+
+def read_rows(csv_path, limit):
+    """
+    Reads the rows of the CSV file that have a reference transcription.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        limit (int or None): Maximum number of rows to read.
+
+    Returns:
+        list: The rows of the CSV file as dictionaries.
+    """
+    with open(csv_path, 'r', newline='', encoding='utf-8') as csvfile:
+        rows = [row for row in csv.DictReader(csvfile) if row.get('text', '').strip()]
+    return rows[:limit] if limit else rows
+
+def duration_bucket(duration, edges):
+    """
+    Gets the label of the duration bucket of an audio file.
+
+    Args:
+        duration (str): The duration of the audio file in seconds, as stored in the CSV file.
+        edges (list): The upper bounds of the buckets in seconds, in increasing order.
+
+    Returns:
+        str: The label of the bucket, e.g. '2-4s', or 'unknown' if the duration is missing.
+    """
+    try:
+        seconds = float(duration)
+    except (TypeError, ValueError):
+        return 'unknown'
+    lower = 0
+    for upper in edges:
+        if seconds < upper:
+            return f"{lower:g}-{upper:g}s"
+        lower = upper
+    return f">={lower:g}s"
+
+def transcribe_with_backend(backend, rows, data_dir, model_name, onnx_model_dir, batch_size):
+    """
+    Loads a model backend and transcribes the audio files of the rows with it.
+
+    Args:
+        backend (str): The name of the model backend.
+        rows (list): The rows of the CSV file.
+        data_dir (str): Path to the directory containing the audio files.
+        model_name (str): The name of the pre-trained model in huggingface.
+        onnx_model_dir (str or None): The directory of the exported ONNX model.
+        batch_size (int): The number of files per forward pass.
+
+    Returns:
+        dict: The transcription of each row (None if it failed), total audio duration and wall-clock time.
+    """
+    from speech_recognition.asr_logic import transcribe_audio_batch
+    from speech_recognition.backends import load_backend
+
+    print(f"Loading the '{backend}' backend...")
+    asr_model = load_backend(backend, model_name, onnx_model_dir=onnx_model_dir, batch_size=batch_size)
+
+    file_paths = [os.path.join(data_dir, os.path.basename(row['filename'])) for row in rows]
+    present = [index for index, path in enumerate(file_paths) if os.path.isfile(path)]
+    if len(present) < len(rows):
+        print(f"Skipping {len(rows) - len(present)} rows whose audio file is missing from {data_dir}.")
+
+    print(f"Transcribing {len(present)} files with the '{backend}' backend...")
+    start = time.perf_counter()
+    results = transcribe_audio_batch([file_paths[index] for index in present], asr_model, batch_size=batch_size)
+    elapsed = time.perf_counter() - start
+
+    transcriptions = [None] * len(rows)
+    audio_seconds = 0.0
+    for index, result in zip(present, results):
+        if isinstance(result, Exception):
+            print(f"Failed to transcribe {file_paths[index]} with the '{backend}' backend: {result}")
+            continue
+        transcriptions[index] = result[0]
+        audio_seconds += float(result[1])
+
+    return {"transcriptions": transcriptions, "audio_seconds": audio_seconds, "elapsed_seconds": elapsed}
+
+def score(rows, hypotheses, slices):
+    """
+    Computes the corpus and per-slice word and character error rates of the hypotheses.
+
+    Args:
+        rows (list): The rows of the CSV file.
+        hypotheses (list): The hypothesis transcription of each row, or None if there is none.
+        slices (dict): The slice value of each row, by slice name.
+
+    Returns:
+        dict: The number of scored utterances, WER and CER of the corpus and of each slice value.
+    """
+    scored = np.array([hypothesis is not None for hypothesis in hypotheses])
+    indices = np.flatnonzero(scored)
+    references = [normalize_text(rows[index]['text']) for index in indices]
+    predictions = [normalize_text(hypotheses[index]) for index in indices]
+
+    word_distances = edit_distances(references, predictions, unit="word")
+    char_distances = edit_distances(references, predictions, unit="char")
+    words = np.array([len(reference.split()) for reference in references], dtype=np.int64)
+    chars = np.array([len(reference) for reference in references], dtype=np.int64)
+
+    def summarize(mask):
+        return {
+            "utterances": int(mask.sum()),
+            "wer": error_rate(word_distances[mask], words[mask]),
+            "cer": error_rate(char_distances[mask], chars[mask])
+        }
+
+    report = {"unscored": int(len(rows) - len(indices)), "corpus": summarize(np.ones(len(indices), dtype=bool)), "slices": {}}
+    for name, values in slices.items():
+        values = np.array(values, dtype=object)[indices]
+        report["slices"][name] = {
+            str(value): summarize(values == value) for value in sorted(set(values), key=str)
+        }
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Compute the word and character error rates of transcriptions against the reference transcriptions of a CSV file.")
+
+    # Optional argument: Path to the CSV file
+    parser.add_argument(
+        '--csv-file',
+        type=str,
+        default="data/cv-valid-dev.csv",
+        help='Path to the CSV file containing the reference (text) and generated (generated_text) transcriptions.'
+    )
+
+    # Optional argument: Backends to transcribe the audio files with
+    parser.add_argument(
+        '--backends',
+        type=str,
+        default=None,
+        help='Comma-separated list of model backends to transcribe the audio files with. By default, the generated_text column of the CSV file is scored.'
+    )
+
+    # Optional argument: Path to the directory containing audio files
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        default="data/cv-valid-dev",
+        help='Path to the directory containing the audio files, when transcribing with --backends.'
+    )
+
+    # Optional argument: Pre-trained model in huggingface
+    parser.add_argument(
+        '--model-name',
+        type=str,
+        default=os.getenv("MODEL_NAME", "facebook/wav2vec2-large-960h"),
+        help='Name of the pre-trained model in huggingface.'
+    )
+
+    # Optional argument: Directory of the exported ONNX model
+    parser.add_argument(
+        '--onnx-model-dir',
+        type=str,
+        default=os.getenv("ONNX_MODEL_DIR"),
+        help='Directory to load the exported ONNX model from, or to save it to after exporting.'
+    )
+
+    # Optional argument: Number of files per forward pass
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=8,
+        help='Number of files per forward pass.'
+    )
+
+    # Optional argument: Number of rows to evaluate on
+    parser.add_argument(
+        '--limit',
+        type=int,
+        default=None,
+        help='Maximum number of rows of the CSV file to evaluate on.'
+    )
+
+    # Optional argument: Upper bounds of the duration buckets
+    parser.add_argument(
+        '--duration-buckets',
+        type=str,
+        default="2,4,6,10",
+        help='Comma-separated upper bounds in seconds of the duration buckets.'
+    )
+
+    # Optional argument: Path to write the report to
+    parser.add_argument(
+        '--output',
+        type=str,
+        default=None,
+        help='Path to write the evaluation report to as JSON.'
+    )
+    args = parser.parse_args()
+
+    # Verify if the specified CSV file exists
+    csv_path = os.path.abspath(args.csv_file)
+    if not os.path.isfile(csv_path):
+        print(f"The file {csv_path} does not exist.")
+        sys.exit(1)
+
+    rows = read_rows(csv_path, args.limit)
+    edges = sorted(float(edge) for edge in args.duration_buckets.split(",") if edge.strip())
+    slices = {column: [row.get(column) or 'unknown' for row in rows] for column in SLICE_COLUMNS}
+    slices['duration'] = [duration_bucket(row.get('duration'), edges) for row in rows]
+
+    # Collect the hypotheses to score, either from the CSV file or by transcribing the audio files
+    runs = {}
+    if args.backends:
+        from speech_recognition.backends import BACKENDS
+
+        backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+        unknown = [backend for backend in backends if backend not in BACKENDS]
+        if unknown:
+            print(f"Unsupported backends: {', '.join(unknown)}. Expected any of: {', '.join(BACKENDS)}.")
+            sys.exit(1)
+        data_dir = os.path.abspath(args.data_dir)
+        if not os.path.isdir(data_dir):
+            print(f"The directory {data_dir} does not exist.")
+            sys.exit(1)
+        for backend in backends:
+            runs[backend] = transcribe_with_backend(
+                backend, rows, data_dir, args.model_name, args.onnx_model_dir, args.batch_size
+            )
+    else:
+        runs['generated_text'] = {"transcriptions": [row.get('generated_text') or None for row in rows]}
+
+    report = {"csv_file": csv_path, "rows": len(rows), "sources": {}}
+    for source, run in runs.items():
+        start = time.perf_counter()
+        result = score(rows, run["transcriptions"], slices)
+        result["scoring_seconds"] = time.perf_counter() - start
+        if "elapsed_seconds" in run:
+            result["audio_seconds"] = run["audio_seconds"]
+            result["audio_seconds_per_second"] = run["audio_seconds"] / run["elapsed_seconds"] if run["elapsed_seconds"] else 0.0
+        report["sources"][source] = result
+
+    # Print the accuracy and throughput of each source side by side
+    print(f"\n{'source':<16} {'utterances':>10} {'unscored':>9} {'WER':>8} {'CER':>8} {'audio s/s':>10}")
+    for source, result in report["sources"].items():
+        speed = f"{result['audio_seconds_per_second']:.1f}" if "audio_seconds_per_second" in result else "-"
+        print(
+            f"{source:<16} {result['corpus']['utterances']:>10} {result['unscored']:>9} "
+            f"{result['corpus']['wer']:>8.2%} {result['corpus']['cer']:>8.2%} {speed:>10}"
+        )
+
+    # Print the error rates of each slice, with one column per source
+    sources = list(report["sources"])
+    for name in slices:
+        print(f"\n{name:<16} {'utterances':>10} " + " ".join(f"{source[:16]:>16} {'':>8}" for source in sources))
+        print(f"{'':<16} {'':>10} " + " ".join(f"{'WER':>16} {'CER':>8}" for _ in sources))
+        for value, summary in report["sources"][sources[0]]["slices"][name].items():
+            cells = []
+            for source in sources:
+                values = report["sources"][source]["slices"][name].get(value)
+                cells.append(f"{values['wer']:>16.2%} {values['cer']:>8.2%}" if values else f"{'-':>16} {'-':>8}")
+            print(f"{value:<16} {summary['utterances']:>10} " + " ".join(cells))
+
+    print(f"\nScored {len(rows)} rows in {sum(r['scoring_seconds'] for r in report['sources'].values()):.2f} seconds.")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}.")
+
+if __name__ == "__main__":
+    main()
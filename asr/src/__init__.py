@@ -1,4 +1,4 @@
-from .speech_recognition import transcribe_audio, asr_model
+from .speech_recognition import transcribe_audio, get_asr_model
 from .api.asr_api import app
 
-__all__ = ['transcribe_audio', 'asr_model', 'app']
\ No newline at end of file
+__all__ = ['transcribe_audio', 'get_asr_model', 'app']
\ No newline at end of file
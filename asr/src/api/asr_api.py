@@ -1,33 +1,88 @@
+import asyncio
 import logging
-import logging.config
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.exceptions import RequestValidationError
 
-from .logging_config import LOGGING_CONFIG
+from core.config import settings
+from core.executor import InferenceExecutor
+from core.jobs import open_job_queue
+from core.factory import shutdown_batch_scheduler
+from core.startup import ModelLoader
+
+from .logging_config import configure_logging
 from .routes import router
-from .middleware import UUIDMiddleware
+from .middleware import UUIDMiddleware, MetricsMiddleware
 from .exceptions import (
     SpeechRecognitionError,
+    ServiceOverloadedError,
+    JobNotFoundError,
+    ModelNotReadyError,
+    ProfileNotFoundError,
+    ProfilerBusyError,
     speech_recognition_exception_handler,
+    service_overloaded_exception_handler,
+    job_not_found_exception_handler,
+    model_not_ready_exception_handler,
+    profile_not_found_exception_handler,
+    profiler_busy_exception_handler,
     validation_exception_handler,
     generic_exception_handler
 )
 
 # Apply logging configuration
-logging.config.dictConfig(LOGGING_CONFIG)
+configure_logging()
 logger = logging.getLogger(__name__)
 
+async def load_model(app: FastAPI) -> None:
+    """Load and warm up the model in the background, then start the job queue workers.
+
+    Args:
+        app: The FastAPI application instance.
+    """
+    await asyncio.to_thread(app.state.model_loader.load)
+    if app.state.model_loader.ready and app.state.job_queue is not None:
+        app.state.job_queue.start()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager to handle startup and shutdown events.
 
+    The model is loaded in the background, so that the API starts accepting connections (and
+    answers `/ping`) right away, while `/ready` and the speech recognition endpoints report that
+    the model is not ready until it is loaded and warmed up.
+
     Args:
         app: The FastAPI application instance.
     """
     # Startup actions
     logger.info("Speech Recognition API is starting up...")
+
+    # Create the dedicated executor to run inference off the event loop
+    app.state.inference_executor = InferenceExecutor(
+        executor_type=settings.INFERENCE_EXECUTOR,
+        max_workers=settings.INFERENCE_WORKERS,
+        max_queue_size=settings.MAX_QUEUE_SIZE,
+        retry_after=settings.RETRY_AFTER_SECONDS
+    )
+
+    # Create the job queue, whose background workers pause while interactive requests are in flight
+    # (the job API is disabled if its database cannot be opened, e.g. on a read-only filesystem)
+    app.state.job_queue = None
+    if settings.JOBS_ENABLED:
+        app.state.job_queue = open_job_queue(
+            db_path=settings.JOBS_DB_PATH,
+            num_workers=settings.JOB_WORKERS,
+            batch_size=settings.JOB_BATCH_SIZE,
+            poll_interval=settings.JOB_POLL_INTERVAL_S,
+            is_busy=lambda: app.state.inference_executor.pending > 0,
+            recover=not getattr(app.state, "supervised", False)
+        )
+
+    # Load the model in the background and start the job queue workers once it is ready
+    app.state.model_loader = ModelLoader()
+    model_loading = asyncio.create_task(load_model(app))
     
     # Yield control to the application
     try:
@@ -35,6 +90,11 @@ async def lifespan(app: FastAPI):
     finally:
         # Shutdown actions
         logger.info("Speech Recognition API is shutting down...")
+        model_loading.cancel()
+        if app.state.job_queue is not None:
+            app.state.job_queue.shutdown()
+        app.state.inference_executor.shutdown()
+        shutdown_batch_scheduler()
 
 app = FastAPI(
     title="Speech Recognition API",
@@ -46,12 +106,30 @@ app = FastAPI(
 # Add the UUID middleware
 app.add_middleware(UUIDMiddleware)
 
+# Add the metrics middleware (outermost, so that it also counts requests that fail in other middleware)
+app.add_middleware(MetricsMiddleware)
+
 # Register the custom validation exception handler
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 
 # Register the custom exception handler for Speech Recognition errors
 app.add_exception_handler(SpeechRecognitionError, speech_recognition_exception_handler)
 
+# Register the custom exception handler for requests rejected due to overload
+app.add_exception_handler(ServiceOverloadedError, service_overloaded_exception_handler)
+
+# Register the custom exception handler for requests for unknown jobs
+app.add_exception_handler(JobNotFoundError, job_not_found_exception_handler)
+
+# Register the custom exception handler for requests received before the model is ready
+app.add_exception_handler(ModelNotReadyError, model_not_ready_exception_handler)
+
+# Register the custom exception handler for requests for unknown profiles
+app.add_exception_handler(ProfileNotFoundError, profile_not_found_exception_handler)
+
+# Register the custom exception handler for profiled requests rejected while the profiler is in use
+app.add_exception_handler(ProfilerBusyError, profiler_busy_exception_handler)
+
 # Register the generic exception for all other exceptions
 app.add_exception_handler(Exception, generic_exception_handler)
 
@@ -5,4 +5,9 @@ class ErrorDescriptions(Enum):
 
     INVALID_INPUT_ERROR = "Please ensure the payload adheres to the required format."
     INTERNAL_SERVER_ERROR = "An internal server error occurred. Please try again later."
-    SPEECH_RECOGNITION_ERROR = "An error occurred during speech recognition. Please try again later"
\ No newline at end of file
+    SPEECH_RECOGNITION_ERROR = "An error occurred during speech recognition. Please try again later"
+    SERVICE_OVERLOADED_ERROR = "The service is currently overloaded. Please try again later."
+    JOB_NOT_FOUND_ERROR = "The requested job could not be found."
+    MODEL_NOT_READY_ERROR = "The model is still loading. Please try again later."
+    PROFILE_NOT_FOUND_ERROR = "The requested profile could not be found."
+    PROFILER_BUSY_ERROR = "Another request is being profiled with torch.profiler. Please try again later."
\ No newline at end of file
@@ -1,10 +1,18 @@
 import logging
 
+from fastapi import Request, WebSocketException, status
+from starlette.requests import HTTPConnection
+
+from core.config import settings
+from core.executor import InferenceExecutor
+from core.jobs import JobQueue
+
+from .exceptions import JobNotFoundError, ModelNotReadyError
 from core.factory import SpeechRecognizerFactory, SpeechRecognizer
 
 logger = logging.getLogger(__name__)
 
-def get_speech_recognizer() -> SpeechRecognizer:
+def get_speech_recognizer(connection: HTTPConnection) -> SpeechRecognizer:
     """Factory function to create a new automatic speech recognition instance for dependency injection.
 
     This function serves as a FastAPI dependency to provide a speech recognition instance to the endpoint.
@@ -12,9 +20,19 @@ def get_speech_recognizer() -> SpeechRecognizer:
     thread safety in concurrent environments. This approach also encourages separation of concerns
     by isolating object creation logic from route handlers.
 
+    Requests received before the model is loaded and warmed up are rejected, rather than waiting
+    for the model to load.
+
+    Args:
+        connection (HTTPConnection): The incoming request or WebSocket connection.
+
     Returns:
         SpeechRecognizer: An instance of the SpeechRecognizer class configured for speech recognition.
 
+    Raises:
+        ModelNotReadyError: If the model is not loaded and warmed up yet.
+        WebSocketException: If the model is not loaded and warmed up yet (for WebSocket connections).
+
     Example:
         @router.post("/asr")
         async def run_asr(
@@ -26,5 +44,41 @@ def get_speech_recognizer() -> SpeechRecognizer:
             transcription, duration = speech_recognizer.transcribe_audio(file)
             return {"transcription": transcription, "duration": duration}
     """
+    if not connection.app.state.model_loader.ready:
+        if connection.scope["type"] == "websocket":
+            raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER)
+        raise ModelNotReadyError(retry_after=settings.RETRY_AFTER_SECONDS)
+
     logger.debug("Creating a new SpeechRecognizer instance.")
-    return SpeechRecognizerFactory.create_speech_recognizer()
\ No newline at end of file
+    return SpeechRecognizerFactory.create_speech_recognizer()
+
+def get_inference_executor(connection: HTTPConnection) -> InferenceExecutor:
+    """Dependency function to provide the shared inference executor to the endpoint.
+
+    The executor is created once during application startup and stored on the application state,
+    so that the admission limits apply across all requests and streams handled by the worker.
+
+    Args:
+        connection (HTTPConnection): The incoming request or WebSocket connection.
+
+    Returns:
+        InferenceExecutor: The inference executor of the application.
+    """
+    return connection.app.state.inference_executor
+
+def get_job_queue(request: Request) -> JobQueue:
+    """Dependency function to provide the job queue to the endpoint.
+
+    Args:
+        request (Request): The incoming request object.
+
+    Returns:
+        JobQueue: The job queue of the application.
+
+    Raises:
+        JobNotFoundError: If the job API is disabled.
+    """
+    job_queue = getattr(request.app.state, "job_queue", None)
+    if job_queue is None:
+        raise JobNotFoundError(detail="The job API is disabled.")
+    return job_queue
\ No newline at end of file
@@ -1,9 +1,13 @@
 import logging
 
+from typing import Dict, Optional
+
 from fastapi import HTTPException, status, Request
 from fastapi.responses import JSONResponse
 from fastapi.exceptions import RequestValidationError
 
+from core.metrics import ERRORS
+
 from .constants import ErrorDescriptions
 
 logger = logging.getLogger(__name__)
@@ -21,11 +25,89 @@ class SpeechRecognitionError(HTTPException):
             headers={"X-Error-Code": "SPEECH_RECOGNITION_ERROR"}
         )
 
+class ServiceOverloadedError(HTTPException):
+    """Custom exception for requests rejected because the inference queue is full.
+    
+    Attributes:
+        detail (str): A description of the error.
+        retry_after (int): The number of seconds the client should wait before retrying.
+    """
+    def __init__(
+            self,
+            detail: str = ErrorDescriptions.SERVICE_OVERLOADED_ERROR.value,
+            retry_after: int = 1
+        ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"X-Error-Code": "SERVICE_OVERLOADED_ERROR", "Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
+class JobNotFoundError(HTTPException):
+    """Custom exception for requests for a job that does not exist.
+    
+    Attributes:
+        detail (str): A description of the error.
+    """
+    def __init__(self, detail: str = ErrorDescriptions.JOB_NOT_FOUND_ERROR.value):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail,
+            headers={"X-Error-Code": "JOB_NOT_FOUND_ERROR"}
+        )
+
+class ProfileNotFoundError(HTTPException):
+    """Custom exception for requests for a profile that does not exist.
+    
+    Attributes:
+        detail (str): A description of the error.
+    """
+    def __init__(self, detail: str = ErrorDescriptions.PROFILE_NOT_FOUND_ERROR.value):
+        super().__init__(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail,
+            headers={"X-Error-Code": "PROFILE_NOT_FOUND_ERROR"}
+        )
+
+class ProfilerBusyError(HTTPException):
+    """Custom exception for profiled requests rejected because the profiler is already in use.
+    
+    Attributes:
+        detail (str): A description of the error.
+    """
+    def __init__(self, detail: str = ErrorDescriptions.PROFILER_BUSY_ERROR.value):
+        super().__init__(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=detail,
+            headers={"X-Error-Code": "PROFILER_BUSY_ERROR"}
+        )
+
+class ModelNotReadyError(HTTPException):
+    """Custom exception for requests received before the model is loaded and warmed up.
+    
+    Attributes:
+        detail (str): A description of the error.
+        retry_after (int): The number of seconds the client should wait before retrying.
+    """
+    def __init__(
+            self,
+            detail: str = ErrorDescriptions.MODEL_NOT_READY_ERROR.value,
+            retry_after: int = 1
+        ):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"X-Error-Code": "MODEL_NOT_READY_ERROR", "Retry-After": str(retry_after)}
+        )
+        self.retry_after = retry_after
+
 def build_error_response(
         request: Request, 
         error_code: str, 
         message: str, 
-        status_code: int
+        status_code: int,
+        headers: Optional[Dict[str, str]] = None
     ) -> JSONResponse:
     """Constructs a standardized JSON error response.
 
@@ -34,12 +116,14 @@ def build_error_response(
         error_code (str): A unique error code identifying the error type.
         message (str): A descriptive error message.
         status_code (int): The HTTP status code for the response.
+        headers (Optional[Dict[str, str]]): Additional headers to include in the response.
 
     Returns:
         JSONResponse: A JSON response containing error details and the request ID.
     """
     request_id = request.state.request_id
     logger.error(f"Request ID {request_id}: {message}")
+    ERRORS.labels(error_code).inc()
     
     return JSONResponse(
         status_code=status_code,
@@ -49,7 +133,8 @@ def build_error_response(
                 "message": message
             },
             "request_id": request_id
-        }
+        },
+        headers=headers
     )
 
 async def validation_exception_handler(
@@ -110,4 +195,106 @@ async def speech_recognition_exception_handler(
         error_code="SPEECH_RECOGNITION_ERROR",
         message=exc.detail,
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-    )
\ No newline at end of file
+    )
+
+async def service_overloaded_exception_handler(
+        request: Request,
+        exc: ServiceOverloadedError
+    ) -> JSONResponse:
+    """Handler for ServiceOverloadedError.
+
+    Args:
+        request: The incoming request object.
+        exc: The exception instance.
+
+    Returns:
+        JSONResponse: A JSON response with error details and a Retry-After header.
+    """
+    return build_error_response(
+        request=request,
+        error_code="SERVICE_OVERLOADED_ERROR",
+        message=exc.detail,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+async def job_not_found_exception_handler(
+        request: Request,
+        exc: JobNotFoundError
+    ) -> JSONResponse:
+    """Handler for JobNotFoundError.
+
+    Args:
+        request: The incoming request object.
+        exc: The exception instance.
+
+    Returns:
+        JSONResponse: A JSON response with error details.
+    """
+    return build_error_response(
+        request=request,
+        error_code="JOB_NOT_FOUND_ERROR",
+        message=exc.detail,
+        status_code=status.HTTP_404_NOT_FOUND
+    )
+
+async def model_not_ready_exception_handler(
+        request: Request,
+        exc: ModelNotReadyError
+    ) -> JSONResponse:
+    """Handler for ModelNotReadyError.
+
+    Args:
+        request: The incoming request object.
+        exc: The exception instance.
+
+    Returns:
+        JSONResponse: A JSON response with error details and a Retry-After header.
+    """
+    return build_error_response(
+        request=request,
+        error_code="MODEL_NOT_READY_ERROR",
+        message=exc.detail,
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
+async def profile_not_found_exception_handler(
+        request: Request,
+        exc: ProfileNotFoundError
+    ) -> JSONResponse:
+    """Handler for ProfileNotFoundError.
+
+    Args:
+        request: The incoming request object.
+        exc: The exception instance.
+
+    Returns:
+        JSONResponse: A JSON response with error details.
+    """
+    return build_error_response(
+        request=request,
+        error_code="PROFILE_NOT_FOUND_ERROR",
+        message=exc.detail,
+        status_code=status.HTTP_404_NOT_FOUND
+    )
+
+async def profiler_busy_exception_handler(
+        request: Request,
+        exc: ProfilerBusyError
+    ) -> JSONResponse:
+    """Handler for ProfilerBusyError.
+
+    Args:
+        request: The incoming request object.
+        exc: The exception instance.
+
+    Returns:
+        JSONResponse: A JSON response with error details.
+    """
+    return build_error_response(
+        request=request,
+        error_code="PROFILER_BUSY_ERROR",
+        message=exc.detail,
+        status_code=status.HTTP_409_CONFLICT
+    )
@@ -1,5 +1,17 @@
+import atexit
+import logging
+import logging.config
+import os
+import queue
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
 from core.config import settings
 
+# Loggers that write to the console and the log file
+LOGGER_NAMES = ("", "fastapi", "uvicorn", "uvicorn.access")
+
 # Define logging configuration
 LOGGING_CONFIG = {
     "version": 1,
@@ -38,5 +50,67 @@ LOGGING_CONFIG = {
             "level": "INFO",
             "propagate": False,
         },
+        "uvicorn.access": {  # Uvicorn access logger
+            "handlers": ["console", "file"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
-}
\ No newline at end of file
+}
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+def configure_logging() -> QueueListener:
+    """Apply the logging configuration with the console and file handlers moved off the calling threads.
+
+    The loggers only put their records on a queue through a `QueueHandler`, which is cheap and never
+    blocks. A `QueueListener` thread takes the records off the queue and writes them to the console
+    and the log file, so that the event loop never waits for a write.
+
+    Returns:
+        QueueListener: The started listener that writes the queued records.
+    """
+    global _listener, _queue_handler
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+    handlers = []
+    for name in LOGGER_NAMES:
+        for handler in logging.getLogger(name).handlers:
+            if handler not in handlers:
+                handlers.append(handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = QueueHandler(log_queue)
+    for name in LOGGER_NAMES:
+        logging.getLogger(name).handlers = [_queue_handler]
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+    # Write the queued records before the process exits
+    atexit.register(stop_logging)
+    return _listener
+
+def stop_logging() -> None:
+    """Write the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def _restart_listener() -> None:
+    """Start a new listener thread in a forked child process, where the listener thread of the parent does not exist.
+
+    The child gets a new queue, so that records queued in the parent process at the time of the
+    fork are left to the parent, which writes them itself.
+    """
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler.queue = log_queue
+    _listener = QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+os.register_at_fork(after_in_child=_restart_listener)
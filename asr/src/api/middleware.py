@@ -1,46 +1,96 @@
+import time
 import uuid
 import logging
 
-from typing import Callable
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from core.metrics import REQUESTS
 
 logger = logging.getLogger(__name__)
 
-class UUIDMiddleware(BaseHTTPMiddleware):
+class UUIDMiddleware:
     """Middleware to generate and attach a unique UUID to each request.
-    
+
     The UUID is used to trace the request through the entire processing lifecycle.
     It is to be added to the request state and included in the response headers.
+
+    This is a pure ASGI middleware: unlike `BaseHTTPMiddleware`, it does not run the endpoint in a
+    separate task or pass the response body through a memory stream, it only adds a header to the
+    response start message. WebSocket connections get a request ID too.
     """
-    async def dispatch(
-            self, 
-            request: Request, 
-            call_next: Callable[[Request], Response]
-        ) -> Response:
-        """Process the incoming request, generate a UUID, and attach it to the request state and response headers.
+    def __init__(self, app: ASGIApp):
+        """Initialize the UUIDMiddleware instance.
 
         Args:
-            request: The incoming HTTP request.
-            call_next: The next middleware or request handler.
+            app: The next ASGI application in the middleware stack.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the incoming request, generate a UUID, and attach it to the request state and response headers.
 
-        Returns:
-            Response: The HTTP response with the UUID included in the headers.        
+        Args:
+            scope: The ASGI connection scope.
+            receive: The ASGI receive channel.
+            send: The ASGI send channel.
         """
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
         # Generate a unique UUID for the request
         request_id = str(uuid.uuid4())
-        
+
         # Attach the UUID to the request state for later access
-        request.state.request_id = request_id
-        logger.debug(f"Generated request ID {request_id} for incoming request.")
-        
-        # Process the request and get the response
-        response = await call_next(request)
-        
-        # Add the UUID to the response headers
-        response.headers["X-Request-ID"] = request_id
-        logger.debug(f"Added X-Request-ID {request_id} to response headers.")
-        
-        return response
\ No newline at end of file
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message) -> None:
+            # Add the UUID to the response headers
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append("X-Request-ID", request_id)
+            await send(message)
+
+        await self.app(scope, receive, send_with_request_id)
+
+class MetricsMiddleware:
+    """Middleware to count the requests handled by the API.
+
+    The time the request was received is attached to the request state, so that endpoints can
+    measure how long it took to receive and parse the request body.
+    """
+    def __init__(self, app: ASGIApp):
+        """Initialize the MetricsMiddleware instance.
+
+        Args:
+            app: The next ASGI application in the middleware stack.
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process the incoming request and count it by endpoint, method and status code.
+
+        Args:
+            scope: The ASGI connection scope.
+            receive: The ASGI receive channel.
+            send: The ASGI send channel.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        scope.setdefault("state", {})["received_at"] = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Count by the path template of the matched route to keep the number of series bounded
+            endpoint = getattr(scope.get("route"), "path", "unmatched")
+            REQUESTS.labels(endpoint, scope["method"], str(status_code)).inc()
@@ -1,21 +1,46 @@
 import logging
 import os
+import time
 
-from fastapi import APIRouter, Depends, Request, UploadFile, File
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Request, UploadFile, File, WebSocket, WebSocketDisconnect, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, Response
 
-from core.factory import SpeechRecognizer
+from core.config import settings
+from core.executor import InferenceExecutor
+from core.factory import SpeechRecognizer, transcription_cache
+from core.jobs import JobQueue, read_manifest
+from core.metrics import ERRORS, STAGE_LATENCY, render_metrics
+from core.profiling import PROFILERS, find_profile, profile_call, profile_path
+from speech_recognition.archive import close_expanded, expand_archives
+from speech_recognition.streaming import FfmpegStreamDecoder, StreamingTranscriber, pcm16_to_float32
 
-from .dependencies import get_speech_recognizer
-from .schemas import Transcription
-from .exceptions import SpeechRecognitionError
+from .uploads import UploadRoute
+from .dependencies import get_speech_recognizer, get_inference_executor, get_job_queue
+from .schemas import (
+    Transcription,
+    BatchTranscription,
+    FileTranscription,
+    ErrorDetail,
+    Job,
+    PartialTranscription,
+    FinalTranscription,
+    ExecutorStats,
+    CacheStats,
+    Readiness
+)
+from .constants import ErrorDescriptions
+from .exceptions import SpeechRecognitionError, ServiceOverloadedError, JobNotFoundError, ProfileNotFoundError
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(
     prefix="",
     tags=["Speech Recognition"],
+    route_class=UploadRoute
     )
 
 @router.get("/ping")
@@ -27,18 +52,85 @@ async def health_check() -> str:
     """
     return JSONResponse(content="pong", status_code=200)
 
+@router.get("/ready", response_model=Readiness)
+async def readiness_check(request: Request) -> JSONResponse:
+    """Endpoint to check whether the API is ready to serve speech recognition requests.
+
+    Unlike `/ping`, which only reports that the API is running, this endpoint reports ready once the
+    model is loaded and warmed up. It is meant for load balancer health checks, so that new instances
+    only receive traffic once their first requests are as fast as the following ones.
+
+    Args:
+        request: The incoming request object.
+
+    Returns:
+        JSONResponse: The readiness of the API and the duration of each startup phase, with status
+            code 200 if the API is ready or 503 otherwise.
+    """
+    readiness = Readiness(**request.app.state.model_loader.readiness())
+    return JSONResponse(
+        content=readiness.model_dump(),
+        status_code=status.HTTP_200_OK if readiness.ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+@router.get("/stats", response_model=ExecutorStats)
+async def executor_stats(
+    inference_executor: InferenceExecutor = Depends(get_inference_executor)
+    ) -> ExecutorStats:
+    """Endpoint to report the load of the inference executor for autoscaling.
+    
+    Args:
+        inference_executor: The InferenceExecutor instance provided by dependency injection.
+
+    Returns:
+        ExecutorStats: The number of in-flight and queued inference tasks and their limits.
+    """
+    return ExecutorStats(**inference_executor.stats())
+
+@router.get("/stats/cache", response_model=CacheStats)
+async def cache_stats() -> CacheStats:
+    """Endpoint to report the counters of the transcription cache.
+
+    Returns:
+        CacheStats: The number of cached transcriptions, hits, misses and evictions.
+    """
+    if transcription_cache is None:
+        return CacheStats(enabled=False)
+    return CacheStats(enabled=True, **transcription_cache.stats())
+
+@router.get("/metrics")
+async def metrics() -> Response:
+    """Endpoint to expose the metrics of the API in the Prometheus text format.
+
+    The metrics include the latency of each stage of speech recognition, the requests and errors
+    by error code, the load of the inference executor, the audio transcribed and the real-time factor.
+
+    Returns:
+        Response: The metrics in the Prometheus text format.
+    """
+    content, media_type = await run_in_threadpool(render_metrics)
+    return Response(content=content, media_type=media_type)
+
 @router.post("/asr", response_model=Transcription)
 async def run_asr(
     request: Request, 
     file: UploadFile = File(...), 
-    speech_recognizer: SpeechRecognizer = Depends(get_speech_recognizer)
+    speech_recognizer: SpeechRecognizer = Depends(get_speech_recognizer),
+    inference_executor: InferenceExecutor = Depends(get_inference_executor)
     ) -> Transcription:
     """Endpoint for speech recognition on input file.
+
+    If profiling is enabled in the settings, a request with an `X-Profile` header is profiled and its
+    trace is stored under its request ID (see `/profiles/{request_id}`). The header value selects the
+    profiler ("cprofile" or "torch"), and any other value uses the default profiler. Profiled requests
+    take the same path as the others, through the transcription cache and the batch scheduler, so that
+    the trace shows where a slow request actually spends its time.
     
     Args:
         request: The incoming request object.
         file: The input file for speech recognition.
         speech_recognizer: The SpeechRecognizer instance provided by dependency injection.
+        inference_executor: The InferenceExecutor instance provided by dependency injection.
     
     Returns:
         Transcription: A response containing transcribed text, duration, and request ID.
@@ -46,22 +138,32 @@ async def run_asr(
     Raises:
         RequestValidationError: If the input file is empty or not in the expected format.
         SpeechRecognitionError: If an error occurs during speech recognition.
+        ServiceOverloadedError: If the inference queue is full.
     """
     request_id = request.state.request_id
     logger.info(f"Request ID {request_id}: Received speech recognition request.")
+    STAGE_LATENCY.labels("upload").observe(time.perf_counter() - request.state.received_at)
 
     try:
-        # Save the uploaded file to a temporary location
-        file_location = os.path.join("data", file.filename)
-        with open(file_location, "wb") as buffer:
-            buffer.write(await file.read())
-
-        # Perform speech recognition
-        transcription, duration = speech_recognizer.transcribe_audio(file_location)
+        # Perform speech recognition on the inference executor to keep the event loop responsive.
+        # The upload is streamed into an in-memory spool (or to disk only above the spool threshold)
+        # while the multipart body is parsed, and is then streamed from the spool to the decoder.
+        profiler = request.headers.get("X-Profile") if settings.PROFILING_ENABLED else None
+        if profiler:
+            profiler = profiler if profiler in PROFILERS else settings.PROFILER
+            logger.info(f"Request ID {request_id}: Profiling speech recognition with {profiler}.")
+            transcription, duration = await inference_executor.submit(
+                profile_call,
+                profiler,
+                profile_path(settings.PROFILE_DIR, request_id, profiler),
+                speech_recognizer.transcribe_audio,
+                file.file
+                )
+        else:
+            transcription, duration = await inference_executor.submit(
+                speech_recognizer.transcribe_audio, file.file
+                )
         logger.info(f"Request ID {request_id}: Speech recognition successful.")
-        
-        # Optionally, remove the file after processing
-        os.remove(file_location)
 
         # Return the transcribed text along with file duration and request_id
         return Transcription(
@@ -80,7 +182,327 @@ async def run_asr(
         # Propagate the except to be handled by the custom exception handler
         raise e
     
+    except ServiceOverloadedError as e:
+        logger.warning(f"Request ID {request_id}: {e}")
+        # Propagate the except to be handled by the custom exception handler
+        raise e
+
     except Exception as e:
         logger.error(f"Request ID {request_id}: {e}")
         # Propagate the exception to be handled by the generic exception handler
-        raise e
\ No newline at end of file
+        raise e
+
+@router.get("/profiles/{request_id}")
+async def get_profile(request_id: str) -> FileResponse:
+    """Endpoint to download the trace of a profiled request.
+
+    The trace is a cProfile file (`.prof`, readable with pstats or snakeviz) or a torch.profiler trace
+    in the Chrome trace format (`.json`, readable with chrome://tracing or Perfetto).
+
+    Args:
+        request_id: The ID of the profiled request, as returned in its `X-Request-ID` header.
+
+    Returns:
+        FileResponse: The trace of the request.
+
+    Raises:
+        ProfileNotFoundError: If profiling is disabled or the request was not profiled.
+    """
+    if not settings.PROFILING_ENABLED:
+        raise ProfileNotFoundError(detail="Profiling is disabled.")
+    path = find_profile(settings.PROFILE_DIR, request_id)
+    if path is None:
+        raise ProfileNotFoundError()
+    return FileResponse(path, filename=os.path.basename(path))
+
+@router.post("/asr/batch", response_model=BatchTranscription)
+async def run_asr_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    speech_recognizer: SpeechRecognizer = Depends(get_speech_recognizer),
+    inference_executor: InferenceExecutor = Depends(get_inference_executor)
+    ) -> BatchTranscription:
+    """Endpoint for speech recognition on multiple input files in a single request.
+
+    The files can be uploaded as multiple `files` parts, as zip or tar archives, or both. All files
+    are run through the model in padded batches rather than one forward pass per file.
+    
+    Args:
+        request: The incoming request object.
+        files: The input files (or archives of input files) for speech recognition.
+        speech_recognizer: The SpeechRecognizer instance provided by dependency injection.
+        inference_executor: The InferenceExecutor instance provided by dependency injection.
+    
+    Returns:
+        BatchTranscription: A response containing the transcribed text and duration, or the error, for each
+            file, together with the combined transcription and total duration of the successful files.
+
+    Raises:
+        RequestValidationError: If the request contains more files than allowed or the archives are too large.
+        ServiceOverloadedError: If the inference queue is full.
+    """
+    request_id = request.state.request_id
+    logger.info(f"Request ID {request_id}: Received batch speech recognition request.")
+    STAGE_LATENCY.labels("upload").observe(time.perf_counter() - request.state.received_at)
+
+    files = [(file.filename, file.file) for file in files]
+    try:
+        uploads = await run_in_threadpool(
+            expand_archives,
+            files,
+            settings.MAX_BATCH_FILES,
+            settings.ARCHIVE_MAX_MEMBER_SIZE,
+            settings.ARCHIVE_MAX_TOTAL_SIZE,
+            settings.UPLOAD_SPOOL_MAX_SIZE
+        )
+    except ValueError as e:
+        logger.error(f"Request ID {request_id}: {e}")
+        raise RequestValidationError(errors=[{"loc": ("body", "files"), "msg": str(e), "type": "value_error"}])
+
+    try:
+        # Run the whole batch as a single task on the inference executor
+        outputs = await inference_executor.submit(
+            speech_recognizer.transcribe_batch, [source for _, source in uploads]
+            )
+    finally:
+        close_expanded(uploads, files)
+
+    results = []
+    for (filename, _), output in zip(uploads, outputs):
+        if isinstance(output, SpeechRecognitionError):
+            ERRORS.labels("SPEECH_RECOGNITION_ERROR").inc()
+            results.append(FileTranscription(
+                filename=filename,
+                error=ErrorDetail(code="SPEECH_RECOGNITION_ERROR", message=output.detail)
+            ))
+        else:
+            transcription, duration = output
+            results.append(FileTranscription(filename=filename, transcription=transcription, duration=duration))
+
+    failures = sum(result.error is not None for result in results)
+    logger.info(f"Request ID {request_id}: Batch speech recognition completed with {failures} of {len(results)} files failed.")
+
+    succeeded = [result for result in results if result.error is None]
+    return BatchTranscription(
+        transcription="\n".join(result.transcription for result in succeeded),
+        duration=str(round(sum(float(result.duration) for result in succeeded), 1)),
+        results=results,
+        request_id=request_id
+        )
+
+@router.post("/jobs", response_model=Job, status_code=202)
+async def create_job(
+    request: Request,
+    files: Optional[List[UploadFile]] = File(None),
+    manifest: Optional[UploadFile] = File(None),
+    job_queue: JobQueue = Depends(get_job_queue)
+    ) -> Job:
+    """Endpoint to queue an asynchronous transcription job for a large number of files.
+
+    The files can be uploaded as multiple `files` parts or as zip or tar archives, or listed in a
+    `manifest` of files on the server (relative to the configured manifest root). The job is stored
+    in a persistent queue and transcribed in batches by background workers.
+
+    Args:
+        request: The incoming request object.
+        files: The input files (or archives of input files) for speech recognition.
+        manifest: A CSV file with a `filename` column, or a list with one file name per line.
+        job_queue: The JobQueue instance provided by dependency injection.
+
+    Returns:
+        Job: A response containing the ID and status of the queued job.
+
+    Raises:
+        RequestValidationError: If no files are given, the manifest is invalid, or the job or its archives are too large.
+    """
+    request_id = request.state.request_id
+    logger.info(f"Request ID {request_id}: Received job request.")
+
+    def invalid_input(message: str) -> RequestValidationError:
+        logger.error(f"Request ID {request_id}: {message}")
+        return RequestValidationError(errors=[{"loc": ("body",), "msg": message, "type": "value_error"}])
+
+    entries = []
+    uploaded, uploads = [], []
+    try:
+        try:
+            if files:
+                uploaded = [(file.filename, file.file) for file in files]
+                uploads = await run_in_threadpool(
+                    expand_archives,
+                    uploaded,
+                    settings.JOB_MAX_FILES,
+                    settings.ARCHIVE_MAX_MEMBER_SIZE,
+                    settings.ARCHIVE_MAX_TOTAL_SIZE,
+                    settings.UPLOAD_SPOOL_MAX_SIZE
+                )
+                entries.extend((filename, None, source) for filename, source in uploads)
+
+            if manifest is not None:
+                if settings.JOBS_MANIFEST_ROOT is None:
+                    raise invalid_input("Manifests are not enabled on this server.")
+                content = (await manifest.read()).decode("utf-8")
+                entries.extend(
+                    (filename, path, None) for filename, path in read_manifest(content, settings.JOBS_MANIFEST_ROOT)
+                )
+        except (ValueError, UnicodeDecodeError) as e:
+            raise invalid_input(str(e))
+
+        if not entries:
+            raise invalid_input("A job must contain at least one file.")
+        if len(entries) > settings.JOB_MAX_FILES:
+            raise invalid_input(f"A job may contain at most {settings.JOB_MAX_FILES} files.")
+
+        # The uploaded files are read into the queue one at a time
+        job_id = await run_in_threadpool(job_queue.create_job, entries)
+        logger.info(f"Request ID {request_id}: Queued job {job_id} with {len(entries)} files.")
+    finally:
+        close_expanded(uploads, uploaded)
+
+    return Job(job_id=job_id, status="queued", total=len(entries), completed=0, failed=0, request_id=request_id)
+
+@router.get("/jobs/{job_id}", response_model=Job)
+async def get_job(
+    request: Request,
+    job_id: str,
+    offset: int = 0,
+    limit: int = 100,
+    job_queue: JobQueue = Depends(get_job_queue)
+    ) -> Job:
+    """Endpoint to report the progress and results of an asynchronous transcription job.
+
+    Args:
+        request: The incoming request object.
+        job_id: The ID of the job.
+        offset: The index of the first file to return results for.
+        limit: The maximum number of files to return results for.
+        job_queue: The JobQueue instance provided by dependency injection.
+
+    Returns:
+        Job: A response containing the status, progress and a page of results of the job.
+
+    Raises:
+        JobNotFoundError: If the job does not exist.
+    """
+    job = await run_in_threadpool(job_queue.get_job, job_id, max(0, offset), max(0, min(limit, 1000)))
+    if job is None:
+        raise JobNotFoundError()
+
+    results = [
+        FileTranscription(
+            filename=result["filename"],
+            transcription=result["transcription"],
+            duration=result["duration"],
+            error=ErrorDetail(code="SPEECH_RECOGNITION_ERROR", message=result["error"]) if result["error"] else None
+        )
+        for result in job["results"]
+    ]
+    return Job(**{**job, "results": results}, request_id=request.state.request_id)
+
+@router.websocket("/asr/stream")
+async def stream_asr(
+    websocket: WebSocket,
+    audio_format: str = Query("pcm", alias="format"),
+    speech_recognizer: SpeechRecognizer = Depends(get_speech_recognizer),
+    inference_executor: InferenceExecutor = Depends(get_inference_executor)
+    ) -> None:
+    """Endpoint for streaming speech recognition over a WebSocket.
+
+    The client sends the audio as binary messages and a text message (e.g. "EOS") to end the stream.
+    With `format=pcm` (default), the audio is expected as 16-bit signed little-endian mono PCM at the
+    configured sampling rate. With `format=encoded`, any stream ffmpeg can decode (e.g. webm/opus) is
+    accepted. A partial transcription is sent whenever a window of new audio has been decoded, followed
+    by a final transcription with the duration of the stream before the connection is closed.
+
+    The decodes of the stream count against the admission limits of the inference executor. If the
+    executor is full, the connection is closed with code 1013 (try again later).
+
+    Args:
+        websocket: The WebSocket connection.
+        audio_format: The format of the streamed audio, either "pcm" or "encoded" (the `format` query parameter).
+        speech_recognizer: The SpeechRecognizer instance provided by dependency injection.
+        inference_executor: The InferenceExecutor instance provided by dependency injection.
+    """
+    request_id = websocket.state.request_id
+    if audio_format not in ("pcm", "encoded"):
+        logger.error(f"Request ID {request_id}: Unsupported stream format '{audio_format}'.")
+        await websocket.close(code=status.WS_1003_UNSUPPORTED_DATA)
+        return
+
+    if inference_executor.full:
+        logger.warning(f"Request ID {request_id}: Rejecting stream, the inference executor is full.")
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+        return
+
+    await websocket.accept()
+    logger.info(f"Request ID {request_id}: Received streaming speech recognition request.")
+
+    transcriber = StreamingTranscriber(
+        speech_recognizer.asr_model,
+        sampling_rate=settings.SAMPLING_RATE,
+        window_s=settings.STREAM_WINDOW_S,
+        right_context_s=settings.STREAM_RIGHT_CONTEXT_S,
+        max_pending_s=settings.STREAM_MAX_PENDING_S
+    )
+    decoder = FfmpegStreamDecoder(settings.SAMPLING_RATE) if audio_format == "encoded" else None
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(code=message.get("code", status.WS_1000_NORMAL_CLOSURE))
+
+            # A text message marks the end of the stream
+            data = message.get("bytes")
+            if data is None:
+                break
+
+            samples = await run_in_threadpool(decoder.write, data) if decoder else pcm16_to_float32(data)
+            # The transcriber keeps the stream state in this process, so it runs on a local thread
+            partial = await inference_executor.submit_local(transcriber.feed, samples)
+            if partial is not None:
+                await websocket.send_json(
+                    PartialTranscription(transcription=partial, request_id=request_id).model_dump()
+                )
+
+        samples = await run_in_threadpool(decoder.close) if decoder else None
+        transcription = await inference_executor.submit_local(transcriber.finish, samples)
+        logger.info(f"Request ID {request_id}: Streaming speech recognition successful.")
+
+        await websocket.send_json(
+            FinalTranscription(
+                transcription=transcription,
+                duration=transcriber.duration,
+                request_id=request_id
+            ).model_dump()
+        )
+        await websocket.close()
+
+    except WebSocketDisconnect:
+        logger.info(f"Request ID {request_id}: Client disconnected from the stream.")
+
+    except ServiceOverloadedError as e:
+        logger.warning(f"Request ID {request_id}: Closing stream, the inference executor is full.")
+        await websocket.send_json({
+            "error": {
+                "code": "SERVICE_OVERLOADED_ERROR",
+                "message": e.detail
+            },
+            "request_id": request_id
+        })
+        await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+
+    except Exception as e:
+        logger.error(f"Request ID {request_id}: {e}")
+        await websocket.send_json({
+            "error": {
+                "code": "SPEECH_RECOGNITION_ERROR",
+                "message": ErrorDescriptions.SPEECH_RECOGNITION_ERROR.value
+            },
+            "request_id": request_id
+        })
+        await websocket.close(code=status.WS_1011_INTERNAL_ERROR)
+
+    finally:
+        if decoder is not None:
+            decoder.terminate()
\ No newline at end of file
@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional
+
 from pydantic import BaseModel
 
 class BaseResponse(BaseModel):
@@ -16,4 +18,131 @@ class Transcription(BaseResponse):
         duration (str): The duration of the file.
     """
     transcription: str
-    duration: str
\ No newline at end of file
+    duration: str
+
+class ErrorDetail(BaseModel):
+    """Schema to represent an error.
+
+    Attributes:
+        code (str): A unique error code identifying the error type.
+        message (str): A descriptive error message.
+    """
+    code: str
+    message: str
+
+class FileTranscription(BaseModel):
+    """Schema to represent the result of speech recognition on one file of a batch.
+
+    Either the transcription and duration, or the error, is set.
+
+    Attributes:
+        filename (str): The name of the file (`<archive name>/<member name>` for files from an archive).
+        transcription (Optional[str]): The transcribed text from the file.
+        duration (Optional[str]): The duration of the file.
+        error (Optional[ErrorDetail]): The error raised while transcribing the file.
+    """
+    filename: str
+    transcription: Optional[str] = None
+    duration: Optional[str] = None
+    error: Optional[ErrorDetail] = None
+
+class BatchTranscription(Transcription):
+    """Schema to represent the response structure for speech recognition on a batch of files.
+
+    The `transcription` and `duration` of the batch cover the files transcribed successfully, so that
+    the response can be read like a single `Transcription`, while `results` has the outcome of each file.
+
+    Attributes:
+        transcription (str): The transcribed text of the successful files, one per line, in upload order.
+        duration (str): The total duration of the successful files.
+        results (List[FileTranscription]): The result for each file, in the order they were uploaded.
+    """
+    results: List[FileTranscription]
+
+class Job(BaseResponse):
+    """Schema to represent the progress and results of an asynchronous transcription job.
+
+    Attributes:
+        job_id (str): The unique identifier for the job.
+        status (str): The status of the job, one of "queued", "running" or "completed".
+        total (int): The number of files in the job.
+        completed (int): The number of files transcribed successfully.
+        failed (int): The number of files that failed to be transcribed.
+        results (List[FileTranscription]): The results of the finished files in the requested page.
+    """
+    job_id: str
+    status: str
+    total: int
+    completed: int
+    failed: int
+    results: List[FileTranscription] = []
+
+class PartialTranscription(BaseResponse):
+    """Schema to represent a partial transcription sent while audio is being streamed.
+
+    Attributes:
+        type (str): The type of the message, always "partial".
+        transcription (str): The transcribed text of the audio received so far.
+    """
+    type: str = "partial"
+    transcription: str
+
+class FinalTranscription(Transcription):
+    """Schema to represent the final transcription sent once the audio stream has ended.
+
+    Attributes:
+        type (str): The type of the message, always "final".
+    """
+    type: str = "final"
+
+class ExecutorStats(BaseModel):
+    """Schema to represent the load of the inference executor.
+
+    Attributes:
+        executor_type (str): The type of pool inference runs on.
+        in_flight (int): The number of inference tasks currently running.
+        queue_depth (int): The number of inference tasks waiting for a free worker.
+        max_workers (int): The maximum number of inference tasks to run concurrently.
+        max_queue_size (int): The maximum number of inference tasks waiting for a free worker.
+    """
+    executor_type: str
+    in_flight: int
+    queue_depth: int
+    max_workers: int
+    max_queue_size: int
+
+class CacheStats(BaseModel):
+    """Schema to represent the counters of the transcription cache.
+
+    Attributes:
+        enabled (bool): Whether the transcription cache is enabled.
+        entries (int): The number of transcriptions held in memory.
+        max_entries (int): The maximum number of transcriptions held in memory.
+        hits (int): The number of lookups served from the cache.
+        disk_hits (int): The number of lookups served from the persistent cache.
+        misses (int): The number of lookups not found in the cache.
+        evictions (int): The number of transcriptions evicted from memory.
+    """
+    enabled: bool
+    entries: int = 0
+    max_entries: int = 0
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+class Readiness(BaseModel):
+    """Schema to represent the readiness of the API to serve speech recognition requests.
+
+    Attributes:
+        ready (bool): Whether the model is loaded and warmed up.
+        model_loaded (bool): Whether the model is loaded.
+        warmed_up (bool): Whether the warmup inference has run.
+        startup_seconds (Dict[str, float]): The duration in seconds of each completed startup phase.
+        error (Optional[str]): The error raised while loading the model, if any.
+    """
+    ready: bool
+    model_loaded: bool
+    warmed_up: bool
+    startup_seconds: Dict[str, float] = {}
+    error: Optional[str] = None
\ No newline at end of file
@@ -0,0 +1,50 @@
+from typing import Callable, Coroutine, Any
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from python_multipart.multipart import parse_options_header
+from starlette.datastructures import FormData
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from core.config import settings
+
+class SpooledMultiPartParser(MultiPartParser):
+    """Multipart parser that keeps uploaded files in memory unless they exceed the spool threshold.
+
+    Starlette spools uploaded files to disk above 1 MB, which is smaller than most audio uploads.
+    """
+    max_file_size = settings.UPLOAD_SPOOL_MAX_SIZE
+
+class UploadRequest(Request):
+    """Request that parses multipart bodies with the `SpooledMultiPartParser`."""
+    async def form(self, *, max_files: int = 1000, max_fields: int = 1000) -> FormData:
+        """Parse the body of the request as a form.
+
+        Args:
+            max_files (int): The maximum number of files in the form.
+            max_fields (int): The maximum number of fields in the form.
+
+        Returns:
+            FormData: The fields and uploaded files of the form.
+
+        Raises:
+            HTTPException: If the multipart body is malformed or exceeds the limits.
+        """
+        content_type, _ = parse_options_header(self.headers.get("Content-Type"))
+        if content_type != b"multipart/form-data":
+            return await super().form(max_files=max_files, max_fields=max_fields)
+        parser = SpooledMultiPartParser(self.headers, self.stream(), max_files=max_files, max_fields=max_fields)
+        try:
+            return await parser.parse()
+        except MultiPartException as exc:
+            raise HTTPException(status_code=400, detail=exc.message)
+
+class UploadRoute(APIRoute):
+    """Route whose handler receives an `UploadRequest`, so that its uploads use the spool threshold."""
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        route_handler = super().get_route_handler()
+
+        async def upload_route_handler(request: Request) -> Response:
+            return await route_handler(UploadRequest(request.scope, request.receive))
+
+        return upload_route_handler
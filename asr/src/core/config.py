@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import ConfigDict
 from pydantic_settings import BaseSettings
 
@@ -7,12 +9,84 @@ class Settings(BaseSettings):
     Attributes:
         DEBUG (bool): Flag to enable debug mode.
         MODEL_NAME (str): The name of the pre-trained model in huggingface to use for speech recognition.
+        MODEL_BACKEND (str): The inference backend to run the model with, one of "pytorch", "pytorch-int8" or "onnx".
+        ONNX_MODEL_DIR (Optional[str]): Directory to load the exported ONNX model from, or to save it to after exporting.
+        MODEL_DIR (Optional[str]): Local directory to load the model from with memory-mapped safetensors weights, or to save it to on first start.
+        WARMUP_AUDIO_S (float): The length in seconds of the audio run through the model before the API reports ready (0 disables warmup).
         LOG_FILE (str): Path to the log file to store application logs.
+        SAMPLING_RATE (int): The sampling rate in Hz that audio is decoded to before speech recognition.
+        MAX_BATCH_SIZE (int): The maximum number of concurrent requests to group into a single forward pass.
+        MAX_BATCH_WAIT_MS (float): The maximum time in milliseconds to wait for a batch to fill up.
+        CHUNK_LENGTH_S (float): The length in seconds of the chunks long audio is split into for inference (0 disables chunking).
+        CHUNK_STRIDE_S (float): The overlap in seconds on each side of a chunk used to stitch the outputs across chunk boundaries.
+        STREAM_WINDOW_S (float): The amount of new streamed audio in seconds that triggers a partial transcription.
+        STREAM_RIGHT_CONTEXT_S (float): The amount of streamed audio in seconds whose words may still be revised.
+        STREAM_MAX_PENDING_S (float): The maximum amount of uncommitted streamed audio in seconds to decode at once.
+        SERVER_WORKERS (int): The number of worker processes forked by the pre-fork supervisor (`python -m core.server`).
+        TORCH_THREADS (Optional[int]): The intra-op thread count of torch in each worker (defaults to the available CPUs divided by the workers).
+        INFERENCE_EXECUTOR (str): The type of pool to run inference on, either "thread" or "process" (each
+            process worker loads its own copy of the model on its first task, which takes as long and as
+            much memory as the first load).
+        INFERENCE_WORKERS (int): The maximum number of inference tasks to run concurrently.
+        MAX_QUEUE_SIZE (int): The maximum number of inference tasks waiting for a free worker before rejecting requests.
+        RETRY_AFTER_SECONDS (int): The number of seconds rejected clients are asked to wait before retrying.
+        UPLOAD_SPOOL_MAX_SIZE (int): The size in bytes above which an uploaded file is spooled to a temporary file on disk.
+        MAX_BATCH_FILES (int): The maximum number of files accepted in a single batch request.
+        ARCHIVE_MAX_MEMBER_SIZE (int): The maximum decompressed size in bytes of a single file in an uploaded archive.
+        ARCHIVE_MAX_TOTAL_SIZE (int): The maximum decompressed size in bytes of all files in the uploaded archives of a request.
+        JOBS_ENABLED (bool): Flag to enable the asynchronous job API and its background workers.
+        JOBS_DB_PATH (str): Path to the SQLite database of the persistent job queue.
+        JOBS_MANIFEST_ROOT (Optional[str]): Directory that file names in job manifests are relative to (manifests are rejected if unset).
+        JOB_MAX_FILES (int): The maximum number of files accepted in a single job.
+        JOB_WORKERS (int): The number of background workers transcribing queued jobs.
+        JOB_BATCH_SIZE (int): The number of queued files a worker claims at once (they are transcribed one at a time).
+        JOB_POLL_INTERVAL_S (float): The time in seconds a worker waits when the queue is empty or interactive requests are in flight.
+        PROFILING_ENABLED (bool): Flag to allow requests to be profiled with the `X-Profile` header.
+        PROFILER (str): The default profiler for profiled requests, either "cprofile" or "torch".
+        PROFILE_DIR (str): Directory to store the traces of profiled requests in.
+        CACHE_ENABLED (bool): Flag to enable the transcription cache.
+        CACHE_MAX_ENTRIES (int): The maximum number of transcriptions held in the in-memory cache.
+        CACHE_DB_PATH (Optional[str]): Path to the SQLite database of the persistent cache (disabled if unset).
     """
     # Define the settings attributes with default values
     DEBUG: bool = False
     MODEL_NAME: str = "facebook/wav2vec2-large-960h"
+    MODEL_BACKEND: str = "pytorch"
+    ONNX_MODEL_DIR: Optional[str] = None
+    MODEL_DIR: Optional[str] = None
+    WARMUP_AUDIO_S: float = 1.0
     LOG_FILE: str = "logs/app.log"
+    SAMPLING_RATE: int = 16000
+    MAX_BATCH_SIZE: int = 8
+    MAX_BATCH_WAIT_MS: float = 10.0
+    CHUNK_LENGTH_S: float = 20.0
+    CHUNK_STRIDE_S: float = 4.0
+    STREAM_WINDOW_S: float = 1.0
+    STREAM_RIGHT_CONTEXT_S: float = 2.0
+    STREAM_MAX_PENDING_S: float = 15.0
+    SERVER_WORKERS: int = 1
+    TORCH_THREADS: Optional[int] = None
+    INFERENCE_EXECUTOR: str = "thread"
+    INFERENCE_WORKERS: int = 8
+    MAX_QUEUE_SIZE: int = 32
+    RETRY_AFTER_SECONDS: int = 1
+    UPLOAD_SPOOL_MAX_SIZE: int = 16 * 1024 * 1024
+    MAX_BATCH_FILES: int = 256
+    ARCHIVE_MAX_MEMBER_SIZE: int = 256 * 1024 * 1024
+    ARCHIVE_MAX_TOTAL_SIZE: int = 1024 * 1024 * 1024
+    JOBS_ENABLED: bool = True
+    JOBS_DB_PATH: str = "jobs/jobs.db"
+    JOBS_MANIFEST_ROOT: Optional[str] = None
+    JOB_MAX_FILES: int = 100000
+    JOB_WORKERS: int = 1
+    JOB_BATCH_SIZE: int = 8
+    JOB_POLL_INTERVAL_S: float = 1.0
+    PROFILING_ENABLED: bool = False
+    PROFILER: str = "cprofile"
+    PROFILE_DIR: str = "profiles"
+    CACHE_ENABLED: bool = True
+    CACHE_MAX_ENTRIES: int = 1024
+    CACHE_DB_PATH: Optional[str] = None
 
     # Load environment variables from the .env file
     model_config = ConfigDict(env_file=".env", extra="allow")
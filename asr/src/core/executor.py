@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import time
+
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from api.exceptions import ServiceOverloadedError
+from core.metrics import IN_FLIGHT, QUEUE_DEPTH, STAGE_LATENCY
+
+logger = logging.getLogger(__name__)
+
+def _run_timed(fn: Callable[..., Any], *args: Any) -> Tuple[float, Any, Optional[Exception]]:
+    """Run a function on a worker and report when it started.
+
+    The monotonic clock is shared by all processes on the host, so the start time can be compared
+    with the submission time in the parent process. Exceptions are returned rather than raised, so
+    that the start time is also reported for failed tasks.
+
+    Args:
+        fn (Callable): The function to run.
+        *args: The positional arguments to pass to the function.
+
+    Returns:
+        Tuple[float, Any, Optional[Exception]]: The monotonic time at which the function started, its
+            return value and the exception it raised, if any.
+    """
+    started = time.monotonic()
+    try:
+        return started, fn(*args), None
+    except Exception as e:
+        return started, None, e
+
+class InferenceExecutor:
+    """Class to run blocking speech recognition off the event loop with bounded admission.
+
+    Inference runs on a dedicated thread or process pool so that the event loop stays free to
+    serve other requests (e.g. health checks). At most `max_workers` tasks run at once and at most
+    `max_queue_size` further tasks wait for a free worker. Once both are full, new tasks are
+    rejected immediately with a `ServiceOverloadedError` instead of queueing until they time out.
+
+    Attributes:
+        executor_type (str): The type of pool to run inference on, either "thread" or "process".
+        max_workers (int): The maximum number of inference tasks to run concurrently.
+        max_queue_size (int): The maximum number of inference tasks waiting for a free worker.
+        retry_after (int): The number of seconds clients are asked to wait before retrying when rejected.
+    """
+    EXECUTOR_TYPES = {
+        "thread": ThreadPoolExecutor,
+        "process": ProcessPoolExecutor
+    }
+
+    def __init__(
+            self,
+            executor_type: str = "thread",
+            max_workers: int = 8,
+            max_queue_size: int = 32,
+            retry_after: int = 1
+        ):
+        """Initialize the InferenceExecutor instance.
+
+        Args:
+            executor_type (str): The type of pool to run inference on, either "thread" or "process".
+            max_workers (int): The maximum number of inference tasks to run concurrently.
+            max_queue_size (int): The maximum number of inference tasks waiting for a free worker.
+            retry_after (int): The number of seconds clients are asked to wait before retrying when rejected.
+
+        Raises:
+            ValueError: If the executor type is not supported.
+        """
+        if executor_type not in self.EXECUTOR_TYPES:
+            raise ValueError(
+                f"Unsupported executor type '{executor_type}'. "
+                f"Expected one of: {', '.join(self.EXECUTOR_TYPES)}."
+            )
+        self.executor_type = executor_type
+        self.max_workers = max(1, max_workers)
+        self.max_queue_size = max(0, max_queue_size)
+        self.retry_after = retry_after
+        self._executor: Executor = self.EXECUTOR_TYPES[executor_type](max_workers=self.max_workers)
+        self._local_executor: Optional[Executor] = self._executor if executor_type == "thread" else None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """int: The number of admitted tasks that have not completed yet."""
+        return self._pending
+
+    @property
+    def full(self) -> bool:
+        """bool: Whether the workers and the admission queue are full, so that new tasks are rejected."""
+        return self._pending >= self.max_workers + self.max_queue_size
+
+    @property
+    def in_flight(self) -> int:
+        """int: The number of tasks currently running on a worker."""
+        return min(self._pending, self.max_workers)
+
+    @property
+    def queue_depth(self) -> int:
+        """int: The number of admitted tasks waiting for a free worker."""
+        return max(0, self._pending - self.max_workers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get a snapshot of the executor load.
+
+        Returns:
+            Dict[str, Any]: The executor type, in-flight count, queue depth and their limits.
+        """
+        return {
+            "executor_type": self.executor_type,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size
+        }
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function on the pool and wait for its result without blocking the event loop.
+
+        For the "process" executor type, the function and its arguments must be picklable. Binary file
+        objects (e.g. uploaded files) are read into bytes before they are sent to the worker process,
+        on a thread of the default executor so that the event loop is not blocked by the reads.
+
+        Args:
+            fn (Callable): The blocking function to run.
+            *args: The positional arguments to pass to the function.
+
+        Returns:
+            Any: The return value of the function.
+
+        Raises:
+            ServiceOverloadedError: If the workers and the admission queue are full.
+        """
+        self._admit()
+        try:
+            loop = asyncio.get_running_loop()
+            if self.executor_type == "process":
+                args = await loop.run_in_executor(None, self._to_picklable, args)
+            return await self._run(self._executor, fn, *args)
+        finally:
+            self._release()
+
+    async def submit_local(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function on a thread of this process, subject to the same admission limits as `submit`.
+
+        This is meant for tasks that keep state in this process between calls and therefore cannot
+        be sent to a worker process (e.g. the incremental decodes of a streaming transcriber). For the
+        "thread" executor type the tasks share the pool with `submit`; for the "process" executor
+        type they run on a separate thread pool of `max_workers` threads.
+
+        Args:
+            fn (Callable): The blocking function to run.
+            *args: The positional arguments to pass to the function.
+
+        Returns:
+            Any: The return value of the function.
+
+        Raises:
+            ServiceOverloadedError: If the workers and the admission queue are full.
+        """
+        self._admit()
+        try:
+            if self._local_executor is None:
+                self._local_executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="inference-local"
+                )
+            return await self._run(self._local_executor, fn, *args)
+        finally:
+            self._release()
+
+    def _admit(self) -> None:
+        """Admit a new task, or reject it if the workers and the admission queue are full.
+
+        Raises:
+            ServiceOverloadedError: If the workers and the admission queue are full.
+        """
+        if self.full:
+            logger.warning(
+                f"Rejecting inference task: {self.in_flight} in flight, {self.queue_depth} queued."
+            )
+            raise ServiceOverloadedError(retry_after=self.retry_after)
+
+        # The counter is only updated from the event loop thread, so no lock is required
+        self._pending += 1
+        self._report_load()
+
+    def _release(self) -> None:
+        """Release the admission slot of a completed task."""
+        self._pending -= 1
+        self._report_load()
+
+    async def _run(self, executor: Executor, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking function on a pool and record how long it waited for a free worker.
+
+        Args:
+            executor (Executor): The pool to run the function on.
+            fn (Callable): The blocking function to run.
+            *args: The positional arguments to pass to the function.
+
+        Returns:
+            Any: The return value of the function.
+        """
+        loop = asyncio.get_running_loop()
+        submitted = time.monotonic()
+        started, result, error = await loop.run_in_executor(executor, _run_timed, fn, *args)
+        STAGE_LATENCY.labels("queue_wait").observe(max(0.0, started - submitted))
+        if error is not None:
+            raise error
+        return result
+
+    def _report_load(self) -> None:
+        """Update the in-flight and queue depth gauges."""
+        IN_FLIGHT.set(self.in_flight)
+        QUEUE_DEPTH.set(self.queue_depth)
+
+    @staticmethod
+    def _to_picklable(arg: Any) -> Any:
+        """Read binary file objects into bytes so that they can be sent to a worker process.
+
+        Lists and tuples are converted element by element.
+
+        Args:
+            arg: The argument to convert.
+
+        Returns:
+            Any: The contents of the file object as bytes, otherwise the argument itself.
+        """
+        if isinstance(arg, (list, tuple)):
+            return type(arg)(InferenceExecutor._to_picklable(item) for item in arg)
+        if hasattr(arg, "read"):
+            arg.seek(0)
+            return arg.read()
+        return arg
+
+    def shutdown(self) -> None:
+        """Shut down the pools after the running tasks complete."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        if self._local_executor is not None and self._local_executor is not self._executor:
+            self._local_executor.shutdown(wait=True, cancel_futures=True)
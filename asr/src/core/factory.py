@@ -1,47 +1,228 @@
-from typing import Tuple
+from typing import List, Tuple, Optional, Union
 import logging
+import threading
 
-from speech_recognition.asr_logic import transcribe_audio
-from speech_recognition.model import asr_model
+from fastapi.exceptions import RequestValidationError
+
+from speech_recognition.asr_logic import AudioDecodeError, AudioSource, transcribe_audio, transcribe_audio_batch
+from speech_recognition.batching import BatchScheduler
+from speech_recognition.cache import TranscriptionCache
+from speech_recognition.instrumentation import time_stage
+from speech_recognition.model import LockedModel, get_asr_model
 from api.exceptions import SpeechRecognitionError
+from core.config import settings
+
+# The asr model behind a lock shared by all its callers, and the shared batch scheduler in front of
+# it, created once the model is loaded
+_locked_model: Optional[LockedModel] = None
+_batch_scheduler: Optional[BatchScheduler] = None
+_batch_scheduler_lock = threading.Lock()
+
+def cache_namespace() -> str:
+    """Get the namespace of the transcription cache from the settings that change the transcription.
+
+    These are the model name and its backend (since quantized backends may transcribe slightly
+    differently), the sampling rate the audio is decoded to, and the chunking of long audio, so that
+    the persistent tier never serves transcriptions made with other settings.
+
+    Returns:
+        str: The namespace hashed together with the audio.
+    """
+    return (
+        f"{settings.MODEL_NAME}:{settings.MODEL_BACKEND}:sr={settings.SAMPLING_RATE}"
+        f":chunk={settings.CHUNK_LENGTH_S}:stride={settings.CHUNK_STRIDE_S}"
+    )
+
+# Initialize the shared transcription cache, keyed on the audio content and the cache namespace
+transcription_cache = TranscriptionCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    db_path=settings.CACHE_DB_PATH,
+    namespace=cache_namespace()
+) if settings.CACHE_ENABLED else None
+
+def get_locked_model() -> LockedModel:
+    """Get the asr model behind the shared lock, loading the model on first use.
+
+    Every call to the model in this process goes through the returned wrapper, so that the batch
+    scheduler, direct batch inference and streams never run forward passes concurrently.
+
+    Returns:
+        LockedModel: The asr model behind the shared lock.
+    """
+    global _locked_model
+    if _locked_model is None:
+        with _batch_scheduler_lock:
+            if _locked_model is None:
+                _locked_model = LockedModel(get_asr_model())
+    return _locked_model
+
+def get_batch_scheduler() -> BatchScheduler:
+    """Get the shared batch scheduler, creating it (and loading the asr model) on first use.
+
+    Returns:
+        BatchScheduler: The batch scheduler in front of the asr model.
+    """
+    global _batch_scheduler
+    if _batch_scheduler is None:
+        model = get_locked_model()
+        with _batch_scheduler_lock:
+            if _batch_scheduler is None:
+                _batch_scheduler = BatchScheduler(
+                    model,
+                    max_batch_size=settings.MAX_BATCH_SIZE,
+                    max_wait_time=settings.MAX_BATCH_WAIT_MS / 1000
+                )
+    return _batch_scheduler
+
+def shutdown_batch_scheduler() -> None:
+    """Stop the shared batch scheduler, if it was created."""
+    if _batch_scheduler is not None:
+        _batch_scheduler.shutdown()
 
 class SpeechRecognizer:
     """Class to run speech recognition using an Automatic Speech Recognition (ASR) model.
     
     Attributes:
-        asr_model: The ASR model for speech recognition.
+        asr_model: The ASR model for speech recognition, behind the lock shared by all its callers.
+        batch_scheduler: The scheduler that groups concurrent requests into batches for the ASR model.
+        cache: The cache of transcriptions keyed by the audio content.
     """
-    def __init__(self, asr_model):
+    def __init__(
+            self,
+            asr_model,
+            batch_scheduler: Optional[BatchScheduler] = None,
+            cache: Optional[TranscriptionCache] = None
+        ):
         """Initialize the SpeechRecognizer instance with an Automatic Speech Recognition (ASR) model.
         
         Args:
             asr_model: The ASR model for speech recognition.
+            batch_scheduler (Optional[BatchScheduler]): The scheduler that groups concurrent requests
+                into batches for the ASR model. If None, the ASR model is called directly.
+            cache (Optional[TranscriptionCache]): The cache of transcriptions keyed by the audio content.
+                If None, every request runs speech recognition.
         """
         self.asr_model = asr_model
+        self.batch_scheduler = batch_scheduler
+        self.cache = cache
+
+    def __reduce__(self):
+        """Pickle the instance by reference to the factory.
+
+        The ASR model is not picklable, so an instance sent to a worker process is recreated
+        from the model that is already loaded in that process.
+        """
+        return (
+            SpeechRecognizerFactory.create_speech_recognizer,
+            (self.batch_scheduler is not None, self.cache is not None)
+        )
 
-    def transcribe_audio(self, file: str) -> Tuple[str, str]:
+    def transcribe_audio(self, file: AudioSource) -> Tuple[str, str]:
         """Transcribe the input audio file.
+
+        If a cache is configured, a cached transcription of the same audio is returned without
+        decoding the audio at all.
         
         Args:
-            file (str): The audio file to be analyzed.
+            file (AudioSource): The path to the audio file, the raw audio bytes or a binary file object.
 
         Returns:
             Tuple[str, str]: A tuple containing the transcribed text and file duration.
+
+        Raises:
+            RequestValidationError: If the audio is malformed or in an unsupported format.
+            SpeechRecognitionError: If speech recognition fails for any other reason.
         """
         try: 
-            return transcribe_audio(file, self.asr_model)
+            key = None
+            if self.cache is not None:
+                with time_stage("cache_lookup"):
+                    key = self.cache.key_for(file)
+                    cached = self.cache.get(key)
+                if cached is not None:
+                    return cached
+
+            result = transcribe_audio(
+                file,
+                self.batch_scheduler or self.asr_model,
+                sampling_rate=settings.SAMPLING_RATE
+            )
+
+            if key is not None:
+                self.cache.put(key, result)
+            return result
+
+        except AudioDecodeError as e:
+            # Audio that cannot be decoded is an invalid input rather than a failure of the service
+            logging.error(f"Speech recognition failed: {e}")
+            raise RequestValidationError(errors=[{"loc": ("body", "file"), "msg": str(e), "type": "value_error"}])
 
         except Exception as e:
             logging.error(f"Speech recognition failed: {e}")
             raise SpeechRecognitionError(detail=str(e))
 
+    def transcribe_batch(self, files: List[AudioSource]) -> List[Union[Tuple[str, str], SpeechRecognitionError]]:
+        """Transcribe multiple input audio files with batched forward passes.
+
+        Cached transcriptions are returned directly and only the remaining files are decoded and
+        run through the ASR model in batches.
+
+        Args:
+            files (List[AudioSource]): The audio files to be analyzed.
+
+        Returns:
+            List[Union[Tuple[str, str], SpeechRecognitionError]]: For each file, in order, either a
+                tuple containing the transcribed text and file duration, or the error raised for it.
+        """
+        results: List[Union[Tuple[str, str], SpeechRecognitionError, None]] = [None] * len(files)
+        keys: List[Optional[str]] = [None] * len(files)
+        misses: List[int] = []
+        for index, file in enumerate(files):
+            if self.cache is not None:
+                try:
+                    with time_stage("cache_lookup"):
+                        keys[index] = self.cache.key_for(file)
+                        results[index] = self.cache.get(keys[index])
+                except OSError as e:
+                    # The file cannot be read (e.g. a missing file from a manifest)
+                    logging.error(f"Speech recognition failed: {e}")
+                    results[index] = SpeechRecognitionError(detail=str(e))
+                    continue
+            if results[index] is None:
+                misses.append(index)
+
+        outputs = transcribe_audio_batch(
+            [files[index] for index in misses],
+            self.asr_model,
+            sampling_rate=settings.SAMPLING_RATE,
+            batch_size=settings.MAX_BATCH_SIZE
+        )
+        for index, output in zip(misses, outputs):
+            if isinstance(output, Exception):
+                logging.error(f"Speech recognition failed: {output}")
+                results[index] = SpeechRecognitionError(detail=str(output))
+                continue
+            results[index] = output
+            if keys[index] is not None:
+                self.cache.put(keys[index], output)
+
+        return results
+
 class SpeechRecognizerFactory:
     """Factory class to create SpeechRecognizer instances."""
     @staticmethod
-    def create_speech_recognizer() -> SpeechRecognizer:
+    def create_speech_recognizer(use_batch_scheduler: bool = True, use_cache: bool = True) -> SpeechRecognizer:
         """Create and return a new SpeechRecognizer instance.
+
+        Args:
+            use_batch_scheduler (bool): Whether to run the ASR model through the shared batch scheduler.
+            use_cache (bool): Whether to use the shared transcription cache.
         
         Returns:
             SpeechRecognizer: A new instance of the SpeechRecognizer class.
         """
-        return SpeechRecognizer(asr_model=asr_model)
\ No newline at end of file
+        return SpeechRecognizer(
+            asr_model=get_locked_model(),
+            batch_scheduler=get_batch_scheduler() if use_batch_scheduler else None,
+            cache=transcription_cache if use_cache else None
+        )
\ No newline at end of file
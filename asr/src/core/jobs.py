@@ -0,0 +1,395 @@
+import csv
+import io
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from api.exceptions import SpeechRecognitionError
+from core.factory import SpeechRecognizerFactory
+from speech_recognition.asr_logic import AudioSource
+
+logger = logging.getLogger(__name__)
+
+def read_manifest(content: str, root: str) -> List[Tuple[str, str]]:
+    """Parse a manifest of audio files to transcribe.
+
+    The manifest is either a CSV file with a `filename` column (e.g. `cv-valid-dev.csv`) or a plain
+    list with one file per line. File names are resolved relative to `root` and may not point
+    outside of it.
+
+    Args:
+        content (str): The contents of the manifest.
+        root (str): The directory that the file names are relative to.
+
+    Returns:
+        List[Tuple[str, str]]: The name and resolved path of each file.
+
+    Raises:
+        ValueError: If a file name points outside of the root directory.
+    """
+    lines = content.splitlines()
+    if lines and "filename" in next(csv.reader([lines[0]])):
+        filenames = [row["filename"] for row in csv.DictReader(io.StringIO(content))]
+    else:
+        filenames = lines
+
+    root = os.path.realpath(root)
+    files = []
+    for filename in (filename.strip() for filename in filenames):
+        if not filename:
+            continue
+        path = os.path.realpath(os.path.join(root, filename))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"File '{filename}' in the manifest is outside of the manifest root.")
+        files.append((filename, path))
+    return files
+
+def open_job_queue(db_path: str, **kwargs: Any) -> Optional["JobQueue"]:
+    """Open the job queue, or disable the job API if its database cannot be opened.
+
+    The API must still start on a read-only filesystem (e.g. a container without a writable volume
+    for the queue), so a failure to create or open the database only disables the job API.
+
+    Args:
+        db_path (str): The path to the SQLite database of the queue.
+        **kwargs: The other arguments of `JobQueue`.
+
+    Returns:
+        Optional[JobQueue]: The job queue, or None if its database cannot be opened.
+    """
+    try:
+        return JobQueue(db_path, **kwargs)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Failed to open the job queue at {db_path}, disabling the job API: {e}")
+        return None
+
+class JobQueue:
+    """Durable queue of transcription jobs drained by a pool of background workers.
+
+    Jobs and their files are stored in a SQLite database, so that queued work survives restarts.
+    Uploaded files are stored in the database until they are transcribed, while files listed in a
+    manifest are read from disk by the workers. Workers claim pending files in batches of
+    `batch_size` and transcribe them one at a time. Whenever `is_busy` reports interactive traffic,
+    the workers pause before their next file, so that backfills do not compete with `/asr` requests.
+
+    Attributes:
+        db_path (str): The path to the SQLite database of the queue.
+        num_workers (int): The number of background worker threads.
+        batch_size (int): The maximum number of files a worker claims at once.
+        poll_interval (float): The time in seconds a worker waits when idle or paused.
+    """
+    def __init__(
+            self,
+            db_path: str,
+            num_workers: int = 1,
+            batch_size: int = 8,
+            poll_interval: float = 1.0,
+            is_busy: Optional[Callable[[], bool]] = None,
+            recover: bool = True
+        ):
+        """Initialize the JobQueue instance and the database schema.
+
+        Files that were being transcribed when the service stopped are put back in the queue, and the
+        files of jobs that were still being uploaded are dropped, unless `recover` is False (e.g. when several processes share the queue and it was recovered already).
+
+        Args:
+            db_path (str): The path to the SQLite database of the queue.
+            num_workers (int): The number of background worker threads.
+            batch_size (int): The maximum number of files a worker claims at once.
+            poll_interval (float): The time in seconds a worker waits when idle or paused.
+            is_busy (Optional[Callable[[], bool]]): Callable reporting whether interactive requests are in flight.
+            recover (bool): Whether to put files that were being transcribed back in the queue.
+        """
+        self.db_path = db_path
+        self.num_workers = max(0, num_workers)
+        self.batch_size = max(1, batch_size)
+        self.poll_interval = poll_interval
+        self._is_busy = is_busy or (lambda: False)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._workers: List[threading.Thread] = []
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30, isolation_level=None)
+        try:
+            self._create_schema()
+        except sqlite3.Error:
+            self._connection.close()
+            raise
+        if not recover:
+            return
+        with self._lock:
+            recovered = self._connection.execute(
+                "UPDATE job_items SET status = 'pending' WHERE status = 'running'"
+            ).rowcount
+            # Drop the files of jobs that were still being uploaded
+            self._connection.execute("DELETE FROM job_items WHERE status = 'staged'")
+        if recovered:
+            logger.info(f"Requeued {recovered} files that were being transcribed before the restart.")
+
+    def _create_schema(self) -> None:
+        """Create the tables of the queue if they do not exist."""
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS job_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL REFERENCES jobs(id),
+                filename TEXT NOT NULL,
+                path TEXT,
+                audio BLOB,
+                status TEXT NOT NULL DEFAULT 'pending',
+                transcription TEXT,
+                duration TEXT,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS job_items_status ON job_items(status, id);
+            CREATE INDEX IF NOT EXISTS job_items_job ON job_items(job_id, id);
+            """
+        )
+
+    def start(self) -> None:
+        """Start the background worker threads."""
+        self._stop.clear()
+        for index in range(self.num_workers):
+            worker = threading.Thread(target=self._work, name=f"asr-job-worker-{index}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def shutdown(self) -> None:
+        """Stop the background worker threads after their current batch and close the database."""
+        self._stop.set()
+        for worker in self._workers:
+            worker.join()
+        self._workers = []
+        self._connection.close()
+
+    def create_job(
+            self,
+            files: List[Tuple[str, Optional[str], Optional[AudioSource]]],
+            stage_size: int = 16 * 1024 * 1024
+        ) -> str:
+        """Queue a new job.
+
+        Uploaded files are read without holding the lock of the queue and staged in batches of at
+        most `stage_size` bytes, each inserted in its own short transaction, so that only one batch
+        is held in memory at once and the workers and progress requests are not blocked while the
+        files are read. Staged files are invisible to the workers until the job is published in a
+        final short transaction, and are removed if a file cannot be read.
+
+        Args:
+            files (List[Tuple[str, Optional[str], Optional[AudioSource]]]): The name of each file, together
+                with either its path on disk (for manifests) or its contents as bytes or a binary file
+                object (for uploads).
+            stage_size (int): The number of bytes of uploaded files to read before inserting them.
+
+        Returns:
+            str: The ID of the new job.
+        """
+        job_id = str(uuid.uuid4())
+        try:
+            batch: List[Tuple[str, str, Optional[str], Optional[bytes]]] = []
+            batch_bytes = 0
+            for filename, path, audio in files:
+                if audio is not None and not isinstance(audio, (bytes, bytearray)):
+                    audio.seek(0)
+                    audio = audio.read()
+                batch.append((job_id, filename, path, audio))
+                batch_bytes += len(audio) if audio is not None else 0
+                # Manifests are staged every 1000 files, so that each transaction stays short
+                if batch_bytes >= stage_size or len(batch) >= 1000:
+                    self._stage(batch)
+                    batch, batch_bytes = [], 0
+            self._stage(batch)
+
+            with self._lock:
+                self._connection.execute("BEGIN IMMEDIATE")
+                try:
+                    self._connection.execute(
+                        "INSERT INTO jobs (id, created_at) VALUES (?, ?)", (job_id, time.time())
+                    )
+                    self._connection.execute(
+                        "UPDATE job_items SET status = 'pending' WHERE job_id = ? AND status = 'staged'", (job_id,)
+                    )
+                    self._connection.execute("COMMIT")
+                except Exception:
+                    self._connection.execute("ROLLBACK")
+                    raise
+        except Exception:
+            with self._lock:
+                self._connection.execute("DELETE FROM job_items WHERE job_id = ?", (job_id,))
+            raise
+        logger.info(f"Queued job {job_id} with {len(files)} files.")
+        return job_id
+
+    def _stage(self, rows: List[Tuple[str, str, Optional[str], Optional[bytes]]]) -> None:
+        """Insert a batch of files of a job that is not published yet.
+
+        Args:
+            rows (List[Tuple[str, str, Optional[str], Optional[bytes]]]): The job ID, name, path and
+                contents of each file.
+        """
+        if not rows:
+            return
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "INSERT INTO job_items (job_id, filename, path, audio, status) VALUES (?, ?, ?, ?, 'staged')",
+                    rows
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def get_job(self, job_id: str, offset: int = 0, limit: int = 100) -> Optional[Dict[str, Any]]:
+        """Get the progress and a page of the results of a job.
+
+        Args:
+            job_id (str): The ID of the job.
+            offset (int): The index of the first file to return results for.
+            limit (int): The maximum number of files to return results for.
+
+        Returns:
+            Optional[Dict[str, Any]]: The status, file counts and results of the job, or None if it does not exist.
+        """
+        with self._lock:
+            if self._connection.execute("SELECT 1 FROM jobs WHERE id = ?", (job_id,)).fetchone() is None:
+                return None
+            counts = dict(self._connection.execute(
+                "SELECT status, COUNT(*) FROM job_items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+            rows = self._connection.execute(
+                "SELECT filename, status, transcription, duration, error FROM job_items "
+                "WHERE job_id = ? ORDER BY id LIMIT ? OFFSET ?",
+                (job_id, limit, offset)
+            ).fetchall()
+
+        total = sum(counts.values())
+        completed = counts.get("completed", 0)
+        failed = counts.get("failed", 0)
+        if completed + failed == total:
+            status = "completed"
+        elif completed + failed + counts.get("running", 0) > 0:
+            status = "running"
+        else:
+            status = "queued"
+
+        return {
+            "job_id": job_id,
+            "status": status,
+            "total": total,
+            "completed": completed,
+            "failed": failed,
+            "results": [
+                {"filename": filename, "transcription": transcription, "duration": duration, "error": error}
+                for filename, item_status, transcription, duration, error in rows
+                if item_status in ("completed", "failed")
+            ]
+        }
+
+    def _claim(self) -> List[Tuple[int, Optional[str], Optional[bytes]]]:
+        """Claim a batch of pending files for the calling worker.
+
+        Returns:
+            List[Tuple[int, Optional[str], Optional[bytes]]]: The ID, path and contents of each claimed file.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(
+                    "SELECT id, path, audio FROM job_items WHERE status = 'pending' ORDER BY id LIMIT ?",
+                    (self.batch_size,)
+                ).fetchall()
+                self._connection.executemany(
+                    "UPDATE job_items SET status = 'running' WHERE id = ?", [(row[0],) for row in rows]
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        return rows
+
+    def _complete(self, item_ids: List[int], outputs: List[Any]) -> None:
+        """Store the results of a batch and drop the stored contents of its files.
+
+        Args:
+            item_ids (List[int]): The IDs of the files in the batch.
+            outputs (List[Any]): For each file, either a tuple containing the transcribed text and
+                duration, or the error raised while transcribing it.
+        """
+        updates = []
+        for item_id, output in zip(item_ids, outputs):
+            if isinstance(output, Exception):
+                detail = output.detail if isinstance(output, SpeechRecognitionError) else str(output)
+                updates.append(("failed", None, None, detail, item_id))
+            else:
+                updates.append(("completed", output[0], output[1], None, item_id))
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(
+                    "UPDATE job_items SET status = ?, transcription = ?, duration = ?, error = ?, audio = NULL "
+                    "WHERE id = ?",
+                    updates
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def _requeue(self, item_ids: List[int]) -> None:
+        """Put claimed files that were not transcribed back in the queue.
+
+        Args:
+            item_ids (List[int]): The IDs of the files.
+        """
+        with self._lock:
+            self._connection.executemany(
+                "UPDATE job_items SET status = 'pending' WHERE id = ?", [(item_id,) for item_id in item_ids]
+            )
+
+    def _work(self) -> None:
+        """Main loop of a background worker thread.
+
+        The claimed files are transcribed one at a time, and the worker waits for interactive
+        requests to finish before each file, so that a backfill holds the model for at most one
+        file while interactive requests are waiting.
+        """
+        speech_recognizer = SpeechRecognizerFactory.create_speech_recognizer()
+        while not self._stop.is_set():
+            if self._is_busy():
+                self._stop.wait(self.poll_interval)
+                continue
+
+            rows = self._claim()
+            if not rows:
+                self._stop.wait(self.poll_interval)
+                continue
+
+            for index, (item_id, path, audio) in enumerate(rows):
+                while self._is_busy() and not self._stop.is_set():
+                    self._stop.wait(self.poll_interval)
+                if self._stop.is_set():
+                    self._requeue([row[0] for row in rows[index:]])
+                    break
+                try:
+                    output = speech_recognizer.transcribe_batch([audio if audio is not None else path])[0]
+                except Exception as e:
+                    logger.error(f"Job worker failed to transcribe a file: {e}")
+                    output = e
+                self._complete([item_id], [output])
+            else:
+                logger.debug(f"Job worker transcribed a batch of {len(rows)} files.")
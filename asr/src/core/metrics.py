@@ -0,0 +1,106 @@
+import os
+
+from typing import Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+
+from speech_recognition import instrumentation
+
+# Latency buckets in seconds, up to the time it takes to transcribe a few minutes of audio
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Real-time factor buckets (processing time divided by audio duration, below 1 is faster than real time)
+RTF_BUCKETS = (0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+# Latency of each stage of a speech recognition request:
+# - upload: receiving and parsing the multipart body of the request
+# - queue_wait: waiting for a free worker of the inference executor
+# - cache_lookup: hashing the audio and looking it up in the transcription cache
+# - decode: decoding and resampling the audio with ffmpeg
+# - batch_wait: waiting for the batch scheduler to fill and run a batch
+# - inference: running the model (including batch_wait for requests through the batch scheduler)
+# - duration: computing the duration of the decoded audio
+STAGE_LATENCY = Histogram(
+    "asr_stage_duration_seconds",
+    "Latency of each stage of speech recognition in seconds.",
+    ["stage"],
+    buckets=LATENCY_BUCKETS
+)
+
+REQUESTS = Counter(
+    "asr_requests",
+    "Requests handled by the API by endpoint, method and status code.",
+    ["endpoint", "method", "status"]
+)
+
+ERRORS = Counter(
+    "asr_errors",
+    "Errors returned by the API by error code.",
+    ["code"]
+)
+
+IN_FLIGHT = Gauge(
+    "asr_inference_in_flight",
+    "Inference tasks currently running on the inference executor.",
+    multiprocess_mode="livesum"
+)
+
+QUEUE_DEPTH = Gauge(
+    "asr_inference_queue_depth",
+    "Inference tasks waiting for a free worker of the inference executor.",
+    multiprocess_mode="livesum"
+)
+
+AUDIO_SECONDS = Counter(
+    "asr_audio_seconds",
+    "Seconds of audio transcribed by the model."
+)
+
+REAL_TIME_FACTOR = Histogram(
+    "asr_real_time_factor",
+    "Time spent decoding and transcribing audio divided by its duration.",
+    buckets=RTF_BUCKETS
+)
+
+def observe_transcription(audio_seconds: float, elapsed: float) -> None:
+    """Record the audio transcribed by the model and its real-time factor.
+
+    Args:
+        audio_seconds (float): The duration of the transcribed audio in seconds.
+        elapsed (float): The time in seconds spent decoding and transcribing the audio.
+    """
+    AUDIO_SECONDS.inc(audio_seconds)
+    if audio_seconds > 0:
+        REAL_TIME_FACTOR.observe(elapsed / audio_seconds)
+
+# Record the timings of the speech recognition logic, which does not depend on this module
+instrumentation.set_observers(
+    stage=lambda stage, seconds: STAGE_LATENCY.labels(stage).observe(seconds),
+    transcription=observe_transcription
+)
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render the metrics in the Prometheus text format.
+
+    If `PROMETHEUS_MULTIPROC_DIR` is set (e.g. for the pre-fork supervisor or the process executor),
+    the metrics of all processes are aggregated. Otherwise only the metrics of the current process
+    are reported.
+
+    Returns:
+        Tuple[bytes, str]: The rendered metrics and their content type.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
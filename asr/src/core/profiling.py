@@ -0,0 +1,102 @@
+import cProfile
+import logging
+import os
+import threading
+import uuid
+
+from typing import Any, Callable, Optional
+
+from api.exceptions import ProfilerBusyError
+
+logger = logging.getLogger(__name__)
+
+# File extension of the trace written by each profiler
+PROFILERS = {
+    "cprofile": ".prof",    # Python call profile, readable with pstats or snakeviz
+    "torch": ".json"        # torch.profiler operator trace in the Chrome trace format
+}
+
+# torch.profiler is global to the process, so only one request at a time may be profiled with it
+_torch_profiler_lock = threading.Lock()
+
+def profile_path(profile_dir: str, request_id: str, profiler: str) -> str:
+    """Get the path of the trace of a request.
+
+    Args:
+        profile_dir (str): The directory the traces are stored in.
+        request_id (str): The ID of the profiled request.
+        profiler (str): The profiler that captured the trace, one of "cprofile" or "torch".
+
+    Returns:
+        str: The path of the trace.
+    """
+    return os.path.join(profile_dir, f"{request_id}{PROFILERS[profiler]}")
+
+def find_profile(profile_dir: str, request_id: str) -> Optional[str]:
+    """Find the trace of a request.
+
+    Args:
+        profile_dir (str): The directory the traces are stored in.
+        request_id (str): The ID of the profiled request.
+
+    Returns:
+        Optional[str]: The path of the trace, or None if the request ID is invalid or was not profiled.
+    """
+    try:
+        # Only accept request IDs generated by the API, so that the ID cannot point outside of the directory
+        request_id = str(uuid.UUID(request_id))
+    except ValueError:
+        return None
+    for profiler in PROFILERS:
+        path = profile_path(profile_dir, request_id, profiler)
+        if os.path.isfile(path):
+            return path
+    return None
+
+def profile_call(profiler: str, path: str, fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a function under a profiler and store its trace.
+
+    The trace is stored even if the function raises, since slow requests that end up failing are
+    as interesting as slow requests that succeed.
+
+    Args:
+        profiler (str): The profiler to capture the trace with, one of "cprofile" or "torch".
+        path (str): The path to store the trace at.
+        fn (Callable): The function to profile.
+        *args: The positional arguments to pass to the function.
+
+    Returns:
+        Any: The return value of the function.
+
+    Raises:
+        ValueError: If the profiler is not supported.
+        ProfilerBusyError: If torch.profiler is already profiling another request in this process.
+    """
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unsupported profiler '{profiler}'. Expected one of: {', '.join(PROFILERS)}.")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    if profiler == "torch":
+        from torch.profiler import ProfilerActivity, profile
+
+        if not _torch_profiler_lock.acquire(blocking=False):
+            raise ProfilerBusyError()
+        try:
+            trace = profile(activities=[ProfilerActivity.CPU], record_shapes=True)
+            trace.start()
+            # The trace is only exported once the profiler has started
+            try:
+                return fn(*args)
+            finally:
+                trace.stop()
+                trace.export_chrome_trace(path)
+                logger.info(f"Stored torch.profiler trace at {path}.")
+        finally:
+            _torch_profiler_lock.release()
+
+    trace = cProfile.Profile()
+    try:
+        return trace.runcall(fn, *args)
+    finally:
+        trace.dump_stats(path)
+        logger.info(f"Stored cProfile trace at {path}.")
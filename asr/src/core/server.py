@@ -0,0 +1,262 @@
+import argparse
+import gc
+import logging
+import math
+import os
+import signal
+import sys
+
+from typing import Dict, Optional
+
+import uvicorn
+
+from prometheus_client import multiprocess
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+def cgroup_cpu_quota() -> Optional[float]:
+    """Read the CPU quota of the cgroup of this process, in CPUs.
+
+    The quota is read from `cpu.max` under cgroup v2, or from `cpu.cfs_quota_us` and
+    `cpu.cfs_period_us` under cgroup v1.
+
+    Returns:
+        Optional[float]: The number of CPUs the cgroup may use, or None if it is not limited.
+    """
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+
+    for directory in ("/sys/fs/cgroup/cpu", "/sys/fs/cgroup/cpu,cpuacct"):
+        try:
+            with open(os.path.join(directory, "cpu.cfs_quota_us")) as f:
+                quota = int(f.read())
+            with open(os.path.join(directory, "cpu.cfs_period_us")) as f:
+                period = int(f.read())
+        except (OSError, ValueError):
+            continue
+        return None if quota <= 0 or period <= 0 else quota / period
+
+    return None
+
+def available_cpus() -> int:
+    """Count the CPUs this process may run on.
+
+    Both the CPU affinity of the process and the CPU quota of its cgroup (e.g. a container CPU
+    limit) are taken into account, since `os.cpu_count` reports all CPUs of the host.
+
+    Returns:
+        int: The number of available CPUs (at least 1).
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, math.ceil(quota))
+
+    return max(1, cpus)
+
+def torch_threads_per_worker(num_workers: int, torch_threads: Optional[int] = None) -> int:
+    """Compute the intra-op thread count of torch in each inference worker.
+
+    Each worker runs one forward pass at a time (all callers of the model in a worker share a lock),
+    so the available CPUs are split evenly between the workers to avoid oversubscription.
+
+    Args:
+        num_workers (int): The number of inference worker processes.
+        torch_threads (Optional[int]): A fixed thread count that overrides the automatic one.
+
+    Returns:
+        int: The number of intra-op threads per worker (at least 1).
+    """
+    if torch_threads:
+        return max(1, torch_threads)
+    return max(1, available_cpus() // max(1, num_workers))
+
+class PreforkSupervisor:
+    """Supervisor that loads the model once and forks the inference workers from it.
+
+    The supervisor binds the listening socket and loads the model weights, then forks `num_workers`
+    worker processes that each serve the API on the shared socket. The weights are shared with the
+    workers through copy-on-write: torch never writes to them during inference, so their pages stay
+    shared and the memory of each additional worker is limited to its activations and interpreter
+    state. No inference runs in the supervisor, since the thread pools of torch do not survive a fork.
+    Workers that exit unexpectedly are forked again from the supervisor.
+
+    Attributes:
+        config (uvicorn.Config): The configuration of the uvicorn servers run by the workers.
+        num_workers (int): The number of inference worker processes.
+        torch_threads (int): The intra-op thread count of torch in each worker.
+    """
+    def __init__(self, config: uvicorn.Config, num_workers: int, torch_threads: int):
+        """Initialize the PreforkSupervisor instance.
+
+        Args:
+            config (uvicorn.Config): The configuration of the uvicorn servers run by the workers.
+            num_workers (int): The number of inference worker processes.
+            torch_threads (int): The intra-op thread count of torch in each worker.
+        """
+        self.config = config
+        self.num_workers = max(1, num_workers)
+        self.torch_threads = torch_threads
+        self._workers: Dict[int, int] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        """Load the model, fork the workers and supervise them until the supervisor is stopped."""
+        from api.asr_api import app
+        from core.jobs import open_job_queue
+        from speech_recognition.model import get_asr_model
+
+        socket = self.config.bind_socket()
+
+        if settings.MODEL_BACKEND == "onnx":
+            # ONNX Runtime sessions do not survive a fork, so each worker loads its own copy
+            logger.warning("The 'onnx' backend cannot share its weights across workers; each worker loads its own copy.")
+        else:
+            import torch
+
+            # Keep torch single-threaded in the supervisor, so that loading the model (e.g. the
+            # quantization of the "pytorch-int8" backend) does not start the OpenMP thread pool,
+            # which does not survive the fork. The workers set their own thread count.
+            torch.set_num_threads(1)
+            logger.info("Loading the model in the supervisor to share it with the workers.")
+            get_asr_model()
+
+        # Recover the job queue once in the supervisor rather than in each worker, so that a restarted
+        # worker does not requeue the files that other workers are transcribing
+        if settings.JOBS_ENABLED:
+            job_queue = open_job_queue(settings.JOBS_DB_PATH, num_workers=0)
+            if job_queue is not None:
+                job_queue.shutdown()
+        app.state.supervised = True
+
+        # Keep the objects created so far out of garbage collection, so that the collector of each
+        # worker does not write to (and thereby copy) the pages shared with the supervisor
+        gc.collect()
+        gc.freeze()
+
+        signal.signal(signal.SIGTERM, self._stop)
+        signal.signal(signal.SIGINT, self._stop)
+
+        for slot in range(self.num_workers):
+            self._fork(slot, socket)
+        logger.info(
+            f"Started {self.num_workers} workers with {self.torch_threads} torch threads each "
+            f"on {self.config.host}:{self.config.port}."
+        )
+
+        while self._workers:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            slot = self._workers.pop(pid, None)
+            if slot is None:
+                continue
+            if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+                # Drop the gauges of the exited worker from the aggregated metrics
+                multiprocess.mark_process_dead(pid)
+            if not self._stopping:
+                logger.error(f"Worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting it.")
+                self._fork(slot, socket)
+
+        socket.close()
+        logger.info("All workers have exited.")
+
+    def _fork(self, slot: int, socket) -> None:
+        """Fork a worker process that serves the API on the shared socket.
+
+        Args:
+            slot (int): The index of the worker.
+            socket: The listening socket shared by the workers.
+        """
+        pid = os.fork()
+        if pid:
+            self._workers[pid] = slot
+            return
+
+        # Worker process: restore the default signal handlers, which uvicorn replaces with its own
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        exit_code = 0
+        try:
+            import torch
+
+            torch.set_num_threads(self.torch_threads)
+            uvicorn.Server(self.config).run(sockets=[socket])
+        except BaseException as e:
+            logger.exception(f"Worker {os.getpid()} failed: {e}")
+            exit_code = 1
+        finally:
+            # Skip the cleanup inherited from the supervisor, apart from writing the queued log records
+            from api.logging_config import stop_logging
+
+            stop_logging()
+            os._exit(exit_code)
+
+    def _stop(self, signum: int, frame) -> None:
+        """Forward a termination signal to the workers and stop restarting them."""
+        self._stopping = True
+        logger.info(f"Received signal {signum}; stopping {len(self._workers)} workers.")
+        for pid in list(self._workers):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the speech recognition API with pre-forked workers sharing the model weights.")
+
+    # Optional argument: Host to bind to
+    parser.add_argument(
+        '--host',
+        type=str,
+        default="0.0.0.0",
+        help='Host to bind the API to.'
+    )
+
+    # Optional argument: Port to bind to
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8001,
+        help='Port to bind the API to.'
+    )
+
+    # Optional argument: Number of inference workers
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=settings.SERVER_WORKERS,
+        help='Number of inference worker processes.'
+    )
+
+    # Optional argument: Number of torch threads per worker
+    parser.add_argument(
+        '--torch-threads',
+        type=int,
+        default=settings.TORCH_THREADS,
+        help='Intra-op thread count of torch in each worker (default is the available CPUs divided by the workers).'
+    )
+    args = parser.parse_args()
+
+    config = uvicorn.Config("api.asr_api:app", host=args.host, port=args.port)
+    supervisor = PreforkSupervisor(
+        config,
+        num_workers=args.workers,
+        torch_threads=torch_threads_per_worker(args.workers, args.torch_threads)
+    )
+    supervisor.run()
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+import logging
+import time
+
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from core.config import settings
+from speech_recognition.model import get_asr_model, warm_up
+
+logger = logging.getLogger(__name__)
+
+class ModelLoader:
+    """Class to load and warm up the ASR model in the background and track its readiness.
+
+    Startup is split into phases whose durations are logged and reported by the readiness probe,
+    so that the time it takes a new instance to become ready can be measured:
+    - `import`: importing the inference libraries (transformers and torch).
+    - `load`: loading the model weights (and downloading them on the first start).
+    - `warmup`: running the warmup inferences.
+    - `total`: all of the above.
+
+    Attributes:
+        model_loaded (bool): Whether the model is loaded.
+        warmed_up (bool): Whether the warmup inference has run.
+        timings (Dict[str, float]): The duration in seconds of each completed startup phase.
+        error (Optional[str]): The error raised while loading the model, if any.
+    """
+    def __init__(self):
+        """Initialize the ModelLoader instance."""
+        self.model_loaded = False
+        self.warmed_up = False
+        self.timings: Dict[str, float] = {}
+        self.error: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        """bool: Whether the model is loaded and warmed up."""
+        return self.model_loaded and self.warmed_up
+
+    def load(self) -> None:
+        """Load and warm up the model, recording the duration of each phase.
+
+        Errors are logged and recorded rather than raised, so that the API keeps reporting that it
+        is not ready instead of crashing.
+        """
+        started = time.perf_counter()
+        try:
+            with self._phase("import"):
+                import torch  # noqa: F401
+                import transformers  # noqa: F401
+
+            with self._phase("load"):
+                asr_model = get_asr_model()
+            self.model_loaded = True
+
+            if settings.WARMUP_AUDIO_S > 0:
+                with self._phase("warmup"):
+                    warm_up(asr_model, sampling_rate=settings.SAMPLING_RATE, audio_s=settings.WARMUP_AUDIO_S)
+            self.warmed_up = True
+
+            self.timings["total"] = round(time.perf_counter() - started, 3)
+            logger.info(f"Model is ready after {self.timings['total']:.2f}s ({self._format_timings()}).")
+
+        except Exception as e:
+            self.error = str(e)
+            logger.exception(f"Failed to load the model: {e}")
+
+    def readiness(self) -> Dict[str, Any]:
+        """Get a snapshot of the readiness of the model.
+
+        Returns:
+            Dict[str, Any]: The readiness flags, the duration of each completed phase and the error, if any.
+        """
+        return {
+            "ready": self.ready,
+            "model_loaded": self.model_loaded,
+            "warmed_up": self.warmed_up,
+            "startup_seconds": dict(self.timings),
+            "error": self.error
+        }
+
+    @contextmanager
+    def _phase(self, name: str) -> Iterator[None]:
+        """Record the duration of a startup phase if it completes."""
+        logger.info(f"Startup phase '{name}' started.")
+        started = time.perf_counter()
+        yield
+        self.timings[name] = round(time.perf_counter() - started, 3)
+        logger.info(f"Startup phase '{name}' completed in {self.timings[name]:.2f}s.")
+
+    def _format_timings(self) -> str:
+        """Format the phase durations for logging."""
+        return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in self.timings.items() if name != "total")
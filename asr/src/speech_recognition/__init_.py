@@ -1,4 +1,4 @@
 from .asr_logic import transcribe_audio
-from .model import asr_model
+from .model import get_asr_model
 
-__all__ = ['transcribe_audio', 'asr_model']
\ No newline at end of file
+__all__ = ['transcribe_audio', 'get_asr_model']
\ No newline at end of file
@@ -0,0 +1,162 @@
+import tarfile
+import tempfile
+import zipfile
+import zlib
+
+from typing import IO, List, Tuple
+
+from .asr_logic import AudioSource
+
+def _is_archive(source: AudioSource) -> bool:
+    """Check whether a binary file object is a zip or tar archive.
+
+    Args:
+        source (AudioSource): The binary file object.
+
+    Returns:
+        bool: True if the file object is a zip or tar archive, otherwise False.
+    """
+    if isinstance(source, (str, bytes, bytearray)):
+        return False
+    try:
+        source.seek(0)
+        if zipfile.is_zipfile(source):
+            return True
+        source.seek(0)
+        with tarfile.open(fileobj=source, mode="r:*"):
+            return True
+    except (tarfile.TarError, OSError, EOFError):
+        return False
+    finally:
+        source.seek(0)
+
+def _spool_member(
+        member: IO[bytes],
+        name: str,
+        max_size: int,
+        spool_size: int,
+        chunk_size: int = 1024 * 1024
+    ) -> Tuple[IO[bytes], int]:
+    """Copy an archive member into a spooled temporary file, counting the bytes actually read.
+
+    Args:
+        member (IO[bytes]): The binary file object of the archive member.
+        name (str): The name of the member, used in error messages.
+        max_size (int): The maximum number of decompressed bytes the member may have.
+        spool_size (int): The size in bytes above which the member is spooled to a temporary file on disk.
+        chunk_size (int): The number of bytes to read at a time (default is 1 MiB).
+
+    Returns:
+        Tuple[IO[bytes], int]: The spooled temporary file positioned at the start, and the size of the member.
+
+    Raises:
+        ValueError: If the member decompresses to more than `max_size` bytes.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=spool_size)
+    size = 0
+    try:
+        for chunk in iter(lambda: member.read(chunk_size), b""):
+            size += len(chunk)
+            if size > max_size:
+                raise ValueError(f"The archive member {name} exceeds the maximum decompressed size.")
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled, size
+
+def close_expanded(
+        expanded: List[Tuple[str, AudioSource]],
+        files: List[Tuple[str, AudioSource]]
+    ) -> None:
+    """Close the temporary files that `expand_archives` created for archive members.
+
+    The uploaded files themselves are left open, since they are owned by the caller.
+
+    Args:
+        expanded (List[Tuple[str, AudioSource]]): The names and contents returned by `expand_archives`.
+        files (List[Tuple[str, AudioSource]]): The names and contents of the uploaded files.
+    """
+    uploaded = {id(source) for _, source in files}
+    for _, source in expanded:
+        if id(source) not in uploaded and hasattr(source, "close"):
+            source.close()
+
+def expand_archives(
+        files: List[Tuple[str, AudioSource]],
+        max_files: int = 256,
+        max_member_size: int = 256 * 1024 * 1024,
+        max_total_size: int = 1024 * 1024 * 1024,
+        spool_size: int = 16 * 1024 * 1024
+    ) -> List[Tuple[str, AudioSource]]:
+    """Replace zip and tar archives in a list of uploaded files with the files they contain.
+
+    The members of an archive are streamed into spooled temporary files, which are kept in memory
+    up to `spool_size` bytes, and named `<archive name>/<member name>`. Directories and other
+    non-regular members are skipped. The size declared in the archive is checked before a member
+    is read, and the bytes actually read are counted while it is decompressed, so that an archive
+    cannot expand into an unbounded amount of memory or disk. The caller closes the temporary
+    files with `close_expanded`.
+
+    Args:
+        files (List[Tuple[str, AudioSource]]): The names and contents of the uploaded files.
+        max_files (int): The maximum number of files allowed after expansion (default is 256).
+        max_member_size (int): The maximum decompressed size in bytes of a single archive member (default is 256 MiB).
+        max_total_size (int): The maximum decompressed size in bytes of all archive members (default is 1 GiB).
+        spool_size (int): The size in bytes above which a member is spooled to a temporary file on disk (default is 16 MiB).
+
+    Returns:
+        List[Tuple[str, AudioSource]]: The names and contents of the audio files.
+
+    Raises:
+        ValueError: If the number of files exceeds `max_files`, an archive is corrupt, or the archive members
+            exceed the size limits.
+    """
+    expanded: List[Tuple[str, AudioSource]] = []
+    total_size = 0
+
+    def add_member(name: str, declared_size: int, member: IO[bytes]) -> None:
+        nonlocal total_size
+        with member:
+            if declared_size > max_member_size:
+                raise ValueError(f"The archive member {name} exceeds the maximum decompressed size.")
+            if total_size + declared_size > max_total_size:
+                raise ValueError("The archive members exceed the maximum total decompressed size.")
+            spooled, size = _spool_member(
+                member, name, min(max_member_size, max_total_size - total_size), spool_size
+            )
+        expanded.append((name, spooled))
+        total_size += size
+
+    try:
+        for name, source in files:
+            if not _is_archive(source):
+                expanded.append((name, source))
+            elif zipfile.is_zipfile(source):
+                source.seek(0)
+                with zipfile.ZipFile(source) as archive:
+                    for member in archive.infolist():
+                        if not member.is_dir():
+                            add_member(f"{name}/{member.filename}", member.file_size, archive.open(member))
+                        if len(expanded) > max_files:
+                            break
+            else:
+                source.seek(0)
+                with tarfile.open(fileobj=source, mode="r:*") as archive:
+                    for member in archive:
+                        if member.isfile():
+                            add_member(f"{name}/{member.name}", member.size, archive.extractfile(member))
+                        if len(expanded) > max_files:
+                            break
+
+            if len(expanded) > max_files:
+                raise ValueError(f"A batch may contain at most {max_files} files.")
+    except (zipfile.BadZipFile, tarfile.TarError, zlib.error, EOFError) as e:
+        close_expanded(expanded, files)
+        raise ValueError(f"The archive {name} is corrupt: {e}") from e
+    except BaseException:
+        close_expanded(expanded, files)
+        raise
+
+    return expanded
@@ -1,45 +1,248 @@
-from pydub import AudioSegment
+import io
+import os
+import shutil
+import subprocess
+import threading
+import time
 
-from typing import List, Dict, Any, Tuple, Callable
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Tuple, Callable, Union, BinaryIO
+
+from .instrumentation import observe_transcription, time_stage
+
+# Audio input accepted by the decoder: a file path, raw bytes or a binary file object
+AudioSource = Union[str, bytes, BinaryIO]
+
+class AudioDecodeError(ValueError):
+    """Exception raised when the audio is malformed or in a format that ffmpeg cannot decode."""
+
+def _feed(source: BinaryIO, pipe: BinaryIO) -> None:
+    """Copy a binary file object to the stdin of the decoder, in a writer thread.
+
+    Args:
+        source (BinaryIO): The binary file object.
+        pipe (BinaryIO): The stdin pipe of the decoder, closed once the file is copied.
+    """
+    try:
+        shutil.copyfileobj(source, pipe)
+    except (BrokenPipeError, ValueError):
+        # The decoder exited before reading the whole input (e.g. malformed audio)
+        pass
+    finally:
+        try:
+            pipe.close()
+        except BrokenPipeError:
+            pass
+
+def load_audio(
+        source: AudioSource,
+        sampling_rate: int = 16000
+    ) -> np.ndarray:
+    """Decode audio into a mono float32 waveform at the given sampling rate.
+
+    The audio is piped to ffmpeg through stdin and decoded and resampled exactly once, so that the
+    same waveform can be used both for speech recognition and for measuring the duration. File
+    objects are streamed to the pipe by a writer thread in chunks, whether they are held in memory
+    or on disk, so neither a copy of the whole file nor a temporary file is created.
+
+    Args:
+        source (AudioSource): The path to the audio file, the raw audio bytes or a binary file object.
+        sampling_rate (int): The sampling rate to resample the audio to (default is 16000 Hz).
+
+    Returns:
+        np.ndarray: The decoded waveform as a 1-D float32 array.
+
+    Raises:
+        AudioDecodeError: If the audio is malformed or in an unsupported format.
+        ValueError: If ffmpeg is not installed.
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return load_audio(f, sampling_rate)
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    source.seek(0)
+
+    command = [
+        "ffmpeg", "-i", "pipe:0",
+        "-ac", "1",                 # Downmix to mono
+        "-ar", str(sampling_rate),  # Resample to the target sampling rate
+        "-f", "f32le",              # Output raw little-endian float32 samples
+        "-hide_banner", "-loglevel", "quiet",
+        "pipe:1"
+    ]
+    try:
+        with subprocess.Popen(command, stdin=subprocess.PIPE, stdout=subprocess.PIPE) as process:
+            writer = threading.Thread(target=_feed, args=(source, process.stdin), daemon=True)
+            writer.start()
+            output = process.stdout.read()
+            writer.join()
+    except FileNotFoundError as e:
+        raise ValueError("ffmpeg was not found but is required to decode audio files.") from e
+
+    waveform = np.frombuffer(output, np.float32)
+    if waveform.shape[0] == 0:
+        raise AudioDecodeError("The audio is either malformed or in an unsupported format.")
+    return waveform
 
 def get_audio_duration(
-        file_path: str,
-        time_unit: int = 1000,
+        waveform: np.ndarray,
+        sampling_rate: int = 16000,
         decimal_places: int = 1
     ) -> float:
-    """Get the duration of an audio file in seconds.
-    
+    """Get the duration of a decoded waveform in seconds.
+
     Args:
-        file_path (str): The path to the audio file.
-        time_unit (int): The time unit to convert the duration to (default is 1000 for seconds).
+        waveform (np.ndarray): The decoded waveform.
+        sampling_rate (int): The sampling rate of the waveform (default is 16000 Hz).
         decimal_places (int): The number of decimal places to round the duration to (default is 1).
 
     Returns:
-        float: The duration of the audio file in seconds.
+        float: The duration of the waveform in seconds.
     """
-    audio = AudioSegment.from_file(file_path)
-    duration_seconds = len(audio) / time_unit  # Convert to specified time unit
+    duration_seconds = len(waveform) / sampling_rate  # Convert sample count to seconds
     duration_seconds = round(duration_seconds, decimal_places) # Round to specified decimal places
     return duration_seconds
 
 def transcribe_audio(
-        file_path: str, 
-        asr_model: Callable[[str], List[Dict[str, Any]]]
+        source: AudioSource,
+        asr_model: Callable[[Dict[str, Any]], Dict[str, Any]],
+        sampling_rate: int = 16000
     ) -> Tuple[str, str]:
-    """Transcribe the input audio file.
-    
+    """Transcribe the input audio.
+
     Args:
-        file_path (str): The audio file to be transcribed.
+        source (AudioSource): The path to the audio file, the raw audio bytes or a binary file object.
         asr_model (Callable): The ASR model for speech recognition.
+        sampling_rate (int): The sampling rate expected by the ASR model (default is 16000 Hz).
 
     Returns:
         Tuple[str, str]: A tuple containing the transcribed text and file duration.
     """
 
-    # Perform speech recognition
-    transcription = asr_model(file_path)
+    started = time.perf_counter()
+
+    # Decode the audio once
+    with time_stage("decode"):
+        waveform = load_audio(source, sampling_rate)
+
+    # Perform speech recognition on the decoded waveform
+    with time_stage("inference"):
+        transcription = asr_model({"raw": waveform, "sampling_rate": sampling_rate})
+
+    # Get the duration of the audio file from its sample count
+    with time_stage("duration"):
+        duration = get_audio_duration(waveform, sampling_rate)
+
+    observe_transcription(len(waveform) / sampling_rate, time.perf_counter() - started)
+    return transcription.get('text', ''), str(duration)
+
+def transcribe_waveforms(
+        waveforms: Dict[int, np.ndarray],
+        asr_model: Callable[..., List[Dict[str, Any]]],
+        sampling_rate: int = 16000,
+        batch_size: int = 8
+    ) -> Dict[int, Union[Tuple[str, str], Exception]]:
+    """Transcribe decoded waveforms with batched forward passes.
+
+    The waveforms are sorted by length to minimise padding and run through the ASR model in padded
+    batches of `batch_size`. If a batch fails, each waveform is run on its own so that one failing
+    input does not fail the others.
+
+    Args:
+        waveforms (Dict[int, np.ndarray]): The decoded waveforms, keyed by an arbitrary index.
+        asr_model (Callable): The ASR model for speech recognition.
+        sampling_rate (int): The sampling rate of the waveforms (default is 16000 Hz).
+        batch_size (int): The maximum number of inputs per forward pass (default is 8).
+
+    Returns:
+        Dict[int, Union[Tuple[str, str], Exception]]: For each index, either a tuple containing the
+            transcribed text and duration, or the exception raised while transcribing it.
+    """
+    results: Dict[int, Union[Tuple[str, str], Exception]] = {}
+    if not waveforms:
+        return results
+
+    # Sort by length so that inputs of similar length are padded together
+    order = sorted(waveforms, key=lambda index: len(waveforms[index]))
+    try:
+        with time_stage("inference"):
+            outputs = asr_model(
+                [{"raw": waveforms[index], "sampling_rate": sampling_rate} for index in order],
+                batch_size=batch_size
+            )
+    except Exception:
+        # Fall back to one forward pass per input to isolate the failing inputs
+        outputs = []
+        for index in order:
+            try:
+                outputs.append(asr_model({"raw": waveforms[index], "sampling_rate": sampling_rate}))
+            except Exception as e:
+                outputs.append(e)
+
+    for index, output in zip(order, outputs):
+        if isinstance(output, Exception):
+            results[index] = output
+        else:
+            with time_stage("duration"):
+                duration = get_audio_duration(waveforms[index], sampling_rate)
+            results[index] = (output.get('text', ''), str(duration))
+    return results
+
+def transcribe_audio_batch(
+        sources: List[AudioSource],
+        asr_model: Callable[..., List[Dict[str, Any]]],
+        sampling_rate: int = 16000,
+        batch_size: int = 8
+    ) -> List[Union[Tuple[str, str], Exception]]:
+    """Transcribe multiple audio inputs with batched forward passes.
+
+    The inputs are decoded in groups of `batch_size` (the decodes of a group run concurrently, each in
+    its own ffmpeg process), and each group is sorted by length to minimise padding and run through
+    the ASR model as one padded batch before the next group is decoded. At most `batch_size` decoded
+    waveforms are therefore held in memory at once, however many inputs there are. Failures are
+    reported per input so that one malformed file does not fail the whole batch.
+
+    Args:
+        sources (List[AudioSource]): The audio inputs to be transcribed.
+        asr_model (Callable): The ASR model for speech recognition.
+        sampling_rate (int): The sampling rate expected by the ASR model (default is 16000 Hz).
+        batch_size (int): The maximum number of inputs per forward pass (default is 8).
+
+    Returns:
+        List[Union[Tuple[str, str], Exception]]: For each input, in order, either a tuple containing
+            the transcribed text and duration, or the exception raised while transcribing it.
+    """
+    results: List[Union[Tuple[str, str], Exception, None]] = [None] * len(sources)
+    if not sources:
+        return []
+    started = time.perf_counter()
+    batch_size = max(1, batch_size)
+    audio_seconds = 0.0
+
+    def decode(source: AudioSource) -> np.ndarray:
+        with time_stage("decode"):
+            return load_audio(source, sampling_rate)
+
+    with ThreadPoolExecutor(max_workers=min(len(sources), batch_size, os.cpu_count() or 1)) as pool:
+        for start in range(0, len(sources), batch_size):
+            # Decode the inputs of the group concurrently
+            waveforms: Dict[int, np.ndarray] = {}
+            group = range(start, min(start + batch_size, len(sources)))
+            futures = {index: pool.submit(decode, sources[index]) for index in group}
+            for index, future in futures.items():
+                try:
+                    waveforms[index] = future.result()
+                except Exception as e:
+                    results[index] = e
 
-    # Get the duration of the audio file
-    duration = get_audio_duration(file_path)
+            for index, result in transcribe_waveforms(waveforms, asr_model, sampling_rate, batch_size).items():
+                results[index] = result
+                if not isinstance(result, Exception):
+                    audio_seconds += len(waveforms[index]) / sampling_rate
 
-    return transcription.get('text', ''), str(duration)
\ No newline at end of file
+    observe_transcription(audio_seconds, time.perf_counter() - started)
+    return results
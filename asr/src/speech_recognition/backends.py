@@ -0,0 +1,188 @@
+import logging
+import os
+
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+if TYPE_CHECKING:
+    from transformers import Pipeline
+
+logger = logging.getLogger(__name__)
+
+# Names of the weight files written by `save_pretrained` with safetensors serialization
+SAFETENSORS_WEIGHTS = ("model.safetensors", "model.safetensors.index.json")
+
+def prepare_model_dir(model_name: str, model_dir: Optional[str] = None) -> str:
+    """Resolve where to load the model from, saving it to a local directory on first use.
+
+    If `model_dir` is set and does not contain the model yet, the model is downloaded from
+    huggingface and saved there with safetensors weights. Later starts load the weights from the
+    local directory, where they are memory-mapped instead of read and copied into memory.
+    The weights are written last, so an interrupted save is completed on the next start.
+
+    Args:
+        model_name (str): The name of the pre-trained model in huggingface.
+        model_dir (Optional[str]): The local directory of the model (None loads from huggingface).
+
+    Returns:
+        str: The local directory of the model, or the model name if no directory is set.
+    """
+    if model_dir is None:
+        return model_name
+    if any(os.path.isfile(os.path.join(model_dir, name)) for name in SAFETENSORS_WEIGHTS):
+        return model_dir
+
+    from transformers import AutoFeatureExtractor, AutoModelForCTC, AutoTokenizer
+
+    logger.info(f"Saving {model_name} to {model_dir} with safetensors weights.")
+    os.makedirs(model_dir, exist_ok=True)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(model_dir)
+    AutoFeatureExtractor.from_pretrained(model_name).save_pretrained(model_dir)
+    AutoModelForCTC.from_pretrained(model_name).save_pretrained(model_dir, safe_serialization=True)
+    return model_dir
+
+def _model_kwargs(model_path: str) -> Dict[str, Any]:
+    """Get the arguments to load the weights of the model with.
+
+    Args:
+        model_path (str): The local directory or the huggingface name of the model.
+
+    Returns:
+        Dict[str, Any]: Arguments that require memory-mapped safetensors weights for local directories.
+    """
+    return {"use_safetensors": True} if os.path.isdir(model_path) else {}
+
+def _build_pipeline(model: Any, model_name: str, **pipeline_kwargs: Any) -> "Pipeline":
+    """Wrap a CTC model in an automatic speech recognition pipeline.
+
+    Args:
+        model: The CTC model (a PyTorch model or an ONNX Runtime model).
+        model_name (str): The name of the pre-trained model to load the tokenizer and feature extractor from.
+        **pipeline_kwargs: Additional arguments for the pipeline (e.g. chunking and batch size).
+
+    Returns:
+        Pipeline: The automatic speech recognition pipeline.
+    """
+    from transformers import AutoFeatureExtractor, AutoTokenizer, pipeline
+
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=AutoTokenizer.from_pretrained(model_name),
+        feature_extractor=AutoFeatureExtractor.from_pretrained(model_name),
+        **pipeline_kwargs
+    )
+
+def load_pytorch(model_name: str, **pipeline_kwargs: Any) -> "Pipeline":
+    """Load the model as a plain fp32 PyTorch pipeline.
+
+    Args:
+        model_name (str): The name of the pre-trained model in huggingface.
+        **pipeline_kwargs: Additional arguments for the pipeline (e.g. chunking and batch size).
+
+    Returns:
+        Pipeline: The automatic speech recognition pipeline.
+    """
+    from transformers import pipeline
+
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model_name,
+        model_kwargs=_model_kwargs(model_name),
+        **pipeline_kwargs
+    )
+
+def load_pytorch_int8(model_name: str, **pipeline_kwargs: Any) -> "Pipeline":
+    """Load the model as a PyTorch pipeline with dynamically int8-quantized linear layers.
+
+    The weights of the linear layers (the bulk of the transformer encoder) are stored in int8 and
+    their activations are quantized on the fly, which reduces memory and speeds up CPU inference.
+    The convolutional feature encoder stays in fp32.
+
+    Args:
+        model_name (str): The name of the pre-trained model in huggingface.
+        **pipeline_kwargs: Additional arguments for the pipeline (e.g. chunking and batch size).
+
+    Returns:
+        Pipeline: The automatic speech recognition pipeline.
+    """
+    import torch
+    from transformers import AutoModelForCTC
+
+    model = AutoModelForCTC.from_pretrained(model_name, **_model_kwargs(model_name)).eval()
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return _build_pipeline(model, model_name, **pipeline_kwargs)
+
+def load_onnx(model_name: str, onnx_model_dir: Optional[str] = None, **pipeline_kwargs: Any) -> "Pipeline":
+    """Load the model as an ONNX Runtime pipeline.
+
+    If `onnx_model_dir` contains an exported model, it is loaded from there. Otherwise the model is
+    exported to ONNX from huggingface and, if `onnx_model_dir` is set, saved there for the next start.
+
+    Args:
+        model_name (str): The name of the pre-trained model in huggingface.
+        onnx_model_dir (Optional[str]): The directory of the exported ONNX model.
+        **pipeline_kwargs: Additional arguments for the pipeline (e.g. chunking and batch size).
+
+    Returns:
+        Pipeline: The automatic speech recognition pipeline.
+
+    Raises:
+        ImportError: If optimum with ONNX Runtime support is not installed.
+    """
+    try:
+        from optimum.onnxruntime import ORTModelForCTC
+    except ImportError as e:
+        raise ImportError(
+            "The 'onnx' model backend requires optimum with ONNX Runtime support. "
+            "Install it with `pip install -r requirements-onnx.txt`."
+        ) from e
+
+    if onnx_model_dir and os.path.isfile(os.path.join(onnx_model_dir, "model.onnx")):
+        logger.info(f"Loading ONNX model from {onnx_model_dir}.")
+        model = ORTModelForCTC.from_pretrained(onnx_model_dir)
+    else:
+        logger.info(f"Exporting {model_name} to ONNX.")
+        model = ORTModelForCTC.from_pretrained(model_name, export=True)
+        if onnx_model_dir:
+            model.save_pretrained(onnx_model_dir)
+    return _build_pipeline(model, model_name, **pipeline_kwargs)
+
+# Model backends selectable with the MODEL_BACKEND setting
+BACKENDS: Dict[str, Callable[..., "Pipeline"]] = {
+    "pytorch": load_pytorch,
+    "pytorch-int8": load_pytorch_int8,
+    "onnx": load_onnx
+}
+
+def load_backend(
+        backend: str,
+        model_name: str,
+        model_dir: Optional[str] = None,
+        onnx_model_dir: Optional[str] = None,
+        **pipeline_kwargs: Any
+    ) -> "Pipeline":
+    """Load the model with the given inference backend.
+
+    All backends return a huggingface pipeline, so they share the callable interface used by
+    `SpeechRecognizer` (including batching and chunking).
+
+    Args:
+        backend (str): The name of the backend, one of "pytorch", "pytorch-int8" or "onnx".
+        model_name (str): The name of the pre-trained model in huggingface.
+        model_dir (Optional[str]): The local directory to load the model from (see `prepare_model_dir`).
+        onnx_model_dir (Optional[str]): The directory of the exported ONNX model (only used by the "onnx" backend).
+        **pipeline_kwargs: Additional arguments for the pipeline (e.g. chunking and batch size).
+
+    Returns:
+        Pipeline: The automatic speech recognition pipeline.
+
+    Raises:
+        ValueError: If the backend is not supported.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unsupported model backend '{backend}'. Expected one of: {', '.join(BACKENDS)}.")
+    model_path = prepare_model_dir(model_name, model_dir)
+    logger.info(f"Loading {model_path} with the '{backend}' backend.")
+    if backend == "onnx":
+        return load_onnx(model_path, onnx_model_dir=onnx_model_dir, **pipeline_kwargs)
+    return BACKENDS[backend](model_path, **pipeline_kwargs)
@@ -0,0 +1,177 @@
+import logging
+import queue
+import threading
+import time
+
+from concurrent.futures import Future
+from typing import List, Dict, Any, Tuple, Callable, Optional
+
+from .instrumentation import observe_stage
+
+logger = logging.getLogger(__name__)
+
+class BatchScheduler:
+    """Scheduler to group concurrent speech recognition requests into batches for the ASR model.
+
+    Requests submitted from different threads are queued and collected by a single background
+    worker thread. The worker waits for up to `max_wait_time` seconds (or until `max_batch_size`
+    requests are collected) and then runs a single padded forward pass over the whole batch.
+    Each result is handed back to the request that submitted it through a `Future`.
+
+    Attributes:
+        asr_model: The ASR model for speech recognition.
+        max_batch_size (int): The maximum number of requests to run in a single forward pass.
+        max_wait_time (float): The maximum time in seconds to wait for a batch to fill up.
+    """
+    def __init__(
+            self,
+            asr_model: Callable[..., Any],
+            max_batch_size: int = 8,
+            max_wait_time: float = 0.01
+        ):
+        """Initialize the BatchScheduler instance.
+
+        Args:
+            asr_model: The ASR model for speech recognition.
+            max_batch_size (int): The maximum number of requests to run in a single forward pass.
+            max_wait_time (float): The maximum time in seconds to wait for a batch to fill up.
+        """
+        self.asr_model = asr_model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_time = max(0.0, max_wait_time)
+        self._queue: "queue.Queue[Optional[Tuple[Any, Future, float]]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+
+    def __call__(self, inputs: Any) -> Dict[str, Any]:
+        """Run speech recognition on a single input through the scheduler.
+
+        This mirrors the call signature of the ASR model so that the scheduler can be used
+        wherever the model is expected.
+
+        Args:
+            inputs: A single input accepted by the ASR model.
+
+        Returns:
+            Dict[str, Any]: The output of the ASR model for the input.
+        """
+        return self.submit(inputs).result()
+
+    def submit(self, inputs: Any) -> Future:
+        """Queue a single input for batched speech recognition.
+
+        Args:
+            inputs: A single input accepted by the ASR model.
+
+        Returns:
+            Future: A future that resolves to the output of the ASR model for the input.
+        """
+        self._ensure_worker()
+        future: Future = Future()
+        self._queue.put((inputs, future, time.perf_counter()))
+        return future
+
+    def shutdown(self) -> None:
+        """Stop the background worker thread after the queued requests are processed."""
+        with self._lock:
+            if self._worker is None:
+                return
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+
+    def _ensure_worker(self) -> None:
+        """Start the background worker thread on first use.
+
+        The worker is started lazily so that importing this module does not spawn threads,
+        which keeps it safe to fork worker processes after import.
+        """
+        with self._lock:
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run,
+                    name="asr-batch-scheduler",
+                    daemon=True
+                )
+                self._worker.start()
+
+    def _collect_batch(self) -> Optional[List[Tuple[Any, Future, float]]]:
+        """Block until at least one request is queued, then collect a batch of requests.
+
+        Returns:
+            Optional[List[Tuple[Any, Future, float]]]: The collected batch, or None if the scheduler is shutting down.
+        """
+        item = self._queue.get()
+        if item is None:
+            return None
+
+        batch = [item]
+        deadline = time.monotonic() + self.max_wait_time
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # Process the current batch first, then stop on the next iteration
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run_batch(self, batch: List[Tuple[Any, Future, float]]) -> None:
+        """Run a single forward pass over a batch and resolve the futures of its requests.
+
+        If the batched forward pass fails, each request is retried on its own so that one
+        malformed input does not fail the other requests in the same batch.
+
+        Args:
+            batch (List[Tuple[Any, Future, float]]): The batch of inputs, their futures and the time they were queued.
+        """
+        started = time.perf_counter()
+        for _, _, queued_at in batch:
+            observe_stage("batch_wait", started - queued_at)
+
+        inputs = [self._copy_inputs(inputs) for inputs, _, _ in batch]
+        try:
+            if len(inputs) == 1:
+                outputs = [self.asr_model(inputs[0])]
+            else:
+                # The pipeline batches the chunks of long inputs, so keep up to max_batch_size chunks per forward pass
+                outputs = self.asr_model(inputs, batch_size=self.max_batch_size)
+            logger.debug(f"Processed batch of {len(inputs)} speech recognition requests.")
+        except Exception as e:
+            logger.warning(f"Batched speech recognition failed, retrying requests individually: {e}")
+            for inputs, future, _ in batch:
+                try:
+                    future.set_result(self.asr_model(self._copy_inputs(inputs)))
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+
+        for (_, future, _), output in zip(batch, outputs):
+            future.set_result(output)
+
+    @staticmethod
+    def _copy_inputs(inputs: Any) -> Any:
+        """Copy dictionary inputs before passing them to the ASR model.
+
+        The huggingface pipeline pops keys from dictionary inputs, so a shallow copy keeps the
+        original input intact in case it has to be retried individually.
+
+        Args:
+            inputs: A single input accepted by the ASR model.
+
+        Returns:
+            Any: A shallow copy of the input if it is a dictionary, otherwise the input itself.
+        """
+        return dict(inputs) if isinstance(inputs, dict) else inputs
+
+    def _run(self) -> None:
+        """Main loop of the background worker thread."""
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                break
+            self._run_batch(batch)
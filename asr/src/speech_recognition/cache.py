@@ -0,0 +1,236 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .asr_logic import AudioSource
+
+logger = logging.getLogger(__name__)
+
+def hash_audio(
+        source: AudioSource,
+        namespace: str = "",
+        chunk_size: int = 1024 * 1024
+    ) -> str:
+    """Compute a content-addressed key for the audio.
+
+    The audio is hashed in chunks so that file objects and files on disk are not loaded into
+    memory as a whole. The namespace (e.g. the model name) is hashed together with the audio so
+    that transcriptions from different models do not collide.
+
+    Args:
+        source (AudioSource): The path to the audio file, the raw audio bytes or a binary file object.
+        namespace (str): The namespace to hash together with the audio.
+        chunk_size (int): The number of bytes to read at a time (default is 1 MiB).
+
+    Returns:
+        str: The hexadecimal SHA-256 digest of the namespace and the audio.
+    """
+    digest = hashlib.sha256(namespace.encode("utf-8") + b"\0")
+
+    if isinstance(source, (bytes, bytearray)):
+        digest.update(source)
+    elif isinstance(source, str):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    else:
+        source.seek(0)
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            digest.update(chunk)
+        source.seek(0)
+
+    return digest.hexdigest()
+
+class TranscriptionCache:
+    """Cache of transcriptions keyed by a hash of the audio content.
+
+    Entries are held in a size-bounded in-memory LRU tier and, optionally, in a persistent SQLite
+    tier that survives restarts and is shared by all worker processes on the host. Lookups check
+    the memory tier first and promote entries found on disk into memory. The lock only guards the
+    memory tier, so that threads do not wait for each other's disk reads and writes. If the
+    database cannot be opened (e.g. a read-only directory), the cache falls back to the memory tier.
+
+    Attributes:
+        max_entries (int): The maximum number of entries in the memory tier (0 disables it).
+        db_path (Optional[str]): The path to the SQLite database of the disk tier (None disables it).
+        namespace (str): The namespace hashed together with the audio (e.g. the model name).
+        hits (int): The number of lookups served from the cache.
+        disk_hits (int): The number of lookups served from the disk tier.
+        misses (int): The number of lookups not found in the cache.
+        evictions (int): The number of entries evicted from the memory tier.
+    """
+    def __init__(
+            self,
+            max_entries: int = 1024,
+            db_path: Optional[str] = None,
+            namespace: str = ""
+        ):
+        """Initialize the TranscriptionCache instance.
+
+        Args:
+            max_entries (int): The maximum number of entries in the memory tier (0 disables it).
+            db_path (Optional[str]): The path to the SQLite database of the disk tier (None disables it).
+            namespace (str): The namespace hashed together with the audio (e.g. the model name).
+        """
+        self.max_entries = max(0, max_entries)
+        self.db_path = db_path
+        self.namespace = namespace
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._disk_disabled = False
+        self._connection: Optional[sqlite3.Connection] = None
+        self._connection_pid: Optional[int] = None
+
+    def key_for(self, source: AudioSource) -> str:
+        """Compute the cache key for the audio.
+
+        Args:
+            source (AudioSource): The path to the audio file, the raw audio bytes or a binary file object.
+
+        Returns:
+            str: The cache key of the audio.
+        """
+        return hash_audio(source, namespace=self.namespace)
+
+    def get(self, key: str) -> Optional[Tuple[str, str]]:
+        """Look up a transcription in the cache.
+
+        Args:
+            key (str): The cache key of the audio.
+
+        Returns:
+            Optional[Tuple[str, str]]: The cached transcribed text and duration, or None if not cached.
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._get_from_disk(key)
+        with self._lock:
+            if value is not None:
+                self._put_in_memory(key, value)
+                self.hits += 1
+                self.disk_hits += 1
+                return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Tuple[str, str]) -> None:
+        """Store a transcription in the cache.
+
+        Args:
+            key (str): The cache key of the audio.
+            value (Tuple[str, str]): The transcribed text and duration.
+        """
+        with self._lock:
+            self._put_in_memory(key, value)
+        self._put_on_disk(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get a snapshot of the cache counters.
+
+        Returns:
+            Dict[str, Any]: The number of entries, hits, disk hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions
+            }
+
+    def _put_in_memory(self, key: str, value: Tuple[str, str]) -> None:
+        """Store an entry in the memory tier, evicting the least recently used entries if full."""
+        if self.max_entries == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite database of the disk tier on first use.
+
+        A new connection is opened in each process, since SQLite connections must not be shared
+        across a fork. The connection is shared by the threads of the process in autocommit mode,
+        so that each statement is its own transaction. If the database cannot be opened, the disk
+        tier is disabled for the lifetime of the process.
+
+        Returns:
+            Optional[sqlite3.Connection]: The connection, or None if the disk tier is disabled.
+        """
+        if self.db_path is None or self._disk_disabled:
+            return None
+        if self._connection is None or self._connection_pid != os.getpid():
+            with self._connect_lock:
+                if self._connection is None or self._connection_pid != os.getpid():
+                    try:
+                        directory = os.path.dirname(self.db_path)
+                        if directory:
+                            os.makedirs(directory, exist_ok=True)
+                        connection = sqlite3.connect(
+                            self.db_path, check_same_thread=False, timeout=30, isolation_level=None
+                        )
+                        connection.execute("PRAGMA journal_mode=WAL")
+                        connection.execute(
+                            "CREATE TABLE IF NOT EXISTS transcriptions ("
+                            "key TEXT PRIMARY KEY, transcription TEXT NOT NULL, "
+                            "duration TEXT NOT NULL, created_at REAL NOT NULL)"
+                        )
+                    except (sqlite3.Error, OSError) as e:
+                        logger.warning(
+                            f"Failed to open the transcription cache at {self.db_path}, "
+                            f"falling back to the in-memory cache: {e}"
+                        )
+                        self._disk_disabled = True
+                        return None
+                    self._connection = connection
+                    self._connection_pid = os.getpid()
+        return self._connection
+
+    def _get_from_disk(self, key: str) -> Optional[Tuple[str, str]]:
+        """Look up an entry in the disk tier."""
+        try:
+            connection = self._connect()
+            if connection is None:
+                return None
+            row = connection.execute(
+                "SELECT transcription, duration FROM transcriptions WHERE key = ?", (key,)
+            ).fetchone()
+            return (row[0], row[1]) if row else None
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Failed to read from the transcription cache at {self.db_path}: {e}")
+            return None
+
+    def _put_on_disk(self, key: str, value: Tuple[str, str]) -> None:
+        """Store an entry in the disk tier."""
+        try:
+            connection = self._connect()
+            if connection is None:
+                return
+            connection.execute(
+                "INSERT OR REPLACE INTO transcriptions (key, transcription, duration, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, value[0], value[1], time.time())
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Failed to write to the transcription cache at {self.db_path}: {e}")
@@ -0,0 +1,132 @@
+import re
+
+import numpy as np
+
+from typing import Dict, List, Sequence
+
+# Characters kept by the normalization: letters, digits, apostrophes and spaces
+_NON_WORD = re.compile(r"[^a-z0-9' ]+")
+
+def normalize_text(text: str) -> str:
+    """Normalize a transcription for scoring.
+
+    The model outputs upper-case text without punctuation while the references are lower-case, so
+    both are lower-cased and stripped of punctuation (except apostrophes) and repeated whitespace.
+
+    Args:
+        text (str): The transcription.
+
+    Returns:
+        str: The normalized transcription.
+    """
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+def _encode(texts: Sequence[str], unit: str, vocabulary: Dict[str, int]) -> List[List[int]]:
+    """Encode transcriptions as sequences of token IDs.
+
+    Args:
+        texts (Sequence[str]): The normalized transcriptions.
+        unit (str): The unit to tokenize into, either "word" or "char".
+        vocabulary (Dict[str, int]): The IDs of the tokens seen so far, extended in place.
+
+    Returns:
+        List[List[int]]: The token IDs of each transcription.
+    """
+    return [
+        [vocabulary.setdefault(token, len(vocabulary)) for token in (text.split() if unit == "word" else text)]
+        for text in texts
+    ]
+
+def _pad(sequences: List[List[int]], width: int, fill: int) -> np.ndarray:
+    """Pad sequences of token IDs into a 2-D array.
+
+    Args:
+        sequences (List[List[int]]): The token IDs of each transcription.
+        width (int): The width of the array.
+        fill (int): The ID to pad with.
+
+    Returns:
+        np.ndarray: The padded array of shape (len(sequences), width).
+    """
+    padded = np.full((len(sequences), width), fill, dtype=np.int64)
+    for row, sequence in enumerate(sequences):
+        padded[row, :len(sequence)] = sequence
+    return padded
+
+def edit_distances(
+        references: Sequence[str],
+        hypotheses: Sequence[str],
+        unit: str = "word",
+        batch_size: int = 1024
+    ) -> np.ndarray:
+    """Compute the Levenshtein distance between each reference and hypothesis.
+
+    The pairs are sorted by length and scored in batches, one row of the dynamic programming table
+    at a time for the whole batch. Within a row, deletions and substitutions only depend on the
+    previous row, and insertions are resolved with a running minimum along the row
+    (`d[j] = j + min_{k <= j}(d'[k] - k)`), so that no Python loop runs over the hypothesis tokens.
+
+    Args:
+        references (Sequence[str]): The normalized reference transcriptions.
+        hypotheses (Sequence[str]): The normalized hypothesis transcriptions.
+        unit (str): The unit of the distance, either "word" or "char" (default is "word").
+        batch_size (int): The number of pairs scored at once (default is 1024).
+
+    Returns:
+        np.ndarray: The edit distance of each pair, in the order of the inputs.
+
+    Raises:
+        ValueError: If the unit is not supported or the inputs differ in length.
+    """
+    if unit not in ("word", "char"):
+        raise ValueError(f"Unsupported unit '{unit}'. Expected 'word' or 'char'.")
+    if len(references) != len(hypotheses):
+        raise ValueError(f"Got {len(references)} references but {len(hypotheses)} hypotheses.")
+
+    vocabulary: Dict[str, int] = {}
+    ref_tokens = _encode(references, unit, vocabulary)
+    hyp_tokens = _encode(hypotheses, unit, vocabulary)
+    ref_lengths = np.array([len(tokens) for tokens in ref_tokens], dtype=np.int64)
+    hyp_lengths = np.array([len(tokens) for tokens in hyp_tokens], dtype=np.int64)
+    distances = np.zeros(len(references), dtype=np.int64)
+
+    # Sort by length so that pairs of similar lengths are padded to the same width
+    order = np.lexsort((hyp_lengths, ref_lengths))
+    for start in range(0, len(order), batch_size):
+        batch = order[start:start + batch_size]
+        ref_len, hyp_len = ref_lengths[batch], hyp_lengths[batch]
+        # Padding never matches, since the padding IDs differ between references and hypotheses
+        refs = _pad([ref_tokens[i] for i in batch], int(ref_len.max(initial=0)), -1)
+        hyps = _pad([hyp_tokens[i] for i in batch], int(hyp_len.max(initial=0)), -2)
+        rows = np.arange(len(batch))
+        columns = np.arange(hyps.shape[1] + 1)
+
+        # Row 0 of the table: the distance from an empty reference is the number of insertions
+        previous = np.broadcast_to(columns, (len(batch), len(columns))).copy()
+        result = hyp_len.copy()
+        for i in range(1, refs.shape[1] + 1):
+            substitution = previous[:, :-1] + (refs[:, i - 1:i] != hyps)
+            current = np.empty_like(previous)
+            current[:, 0] = i
+            current[:, 1:] = np.minimum(previous[:, 1:] + 1, substitution)
+            current = np.minimum.accumulate(current - columns, axis=1) + columns
+            # Read the distance of the pairs whose reference ends at this row
+            done = ref_len == i
+            result[done] = current[rows[done], hyp_len[done]]
+            previous = current
+        distances[batch] = result
+
+    return distances
+
+def error_rate(distances: np.ndarray, reference_lengths: np.ndarray) -> float:
+    """Compute a corpus-level error rate.
+
+    Args:
+        distances (np.ndarray): The edit distance of each pair.
+        reference_lengths (np.ndarray): The number of reference tokens of each pair.
+
+    Returns:
+        float: The total edit distance divided by the total number of reference tokens.
+    """
+    total = int(reference_lengths.sum())
+    return float(distances.sum()) / total if total else 0.0
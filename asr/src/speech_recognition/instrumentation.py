@@ -0,0 +1,60 @@
+import time
+
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+# Observers of the stage latencies and of the transcribed audio, which do nothing until the
+# application registers its own (e.g. `core.metrics` registers Prometheus-backed observers)
+_stage_observer: Callable[[str, float], None] = lambda stage, seconds: None
+_transcription_observer: Callable[[float, float], None] = lambda audio_seconds, elapsed: None
+
+def set_observers(
+        stage: Optional[Callable[[str, float], None]] = None,
+        transcription: Optional[Callable[[float, float], None]] = None
+    ) -> None:
+    """Register the observers that record the timings of speech recognition.
+
+    This keeps the speech recognition logic free of any metrics library, so that it can be used
+    on its own (e.g. by the scripts) without recording anything.
+
+    Args:
+        stage (Optional[Callable[[str, float], None]]): Called with the name of a stage and its latency in seconds.
+        transcription (Optional[Callable[[float, float], None]]): Called with the duration of the transcribed
+            audio in seconds and the time in seconds spent decoding and transcribing it.
+    """
+    global _stage_observer, _transcription_observer
+    if stage is not None:
+        _stage_observer = stage
+    if transcription is not None:
+        _transcription_observer = transcription
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """Record the latency of a stage of speech recognition.
+
+    Args:
+        stage (str): The name of the stage.
+        seconds (float): The latency of the stage in seconds.
+    """
+    _stage_observer(stage, seconds)
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """Record the latency of the wrapped stage of speech recognition.
+
+    Args:
+        stage (str): The name of the stage.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stage_observer(stage, time.perf_counter() - started)
+
+def observe_transcription(audio_seconds: float, elapsed: float) -> None:
+    """Record the audio transcribed by the model.
+
+    Args:
+        audio_seconds (float): The duration of the transcribed audio in seconds.
+        elapsed (float): The time in seconds spent decoding and transcribing the audio.
+    """
+    _transcription_observer(audio_seconds, elapsed)
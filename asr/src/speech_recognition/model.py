@@ -1,10 +1,104 @@
-from transformers import pipeline
+import logging
+import threading
+
+import numpy as np
+
+from typing import Any, Callable, Dict, Optional
 
 from core.config import settings
 
-# Initialize asr model
-asr_model = pipeline(
-    "automatic-speech-recognition",
-    model=settings.MODEL_NAME
-)
+from .backends import load_backend
+
+logger = logging.getLogger(__name__)
+
+_asr_model: Optional[Callable[..., Any]] = None
+_lock = threading.Lock()
+
+def get_asr_model() -> Callable[..., Any]:
+    """Get the ASR model, loading it with the configured inference backend on first use.
+
+    The model is not loaded when this module is imported, so that the API can start serving
+    health checks while the model loads in the background. Worker processes that inherit an
+    already loaded model from their parent reuse it instead of loading it again.
+
+    Audio longer than CHUNK_LENGTH_S is split into overlapping chunks that are run through the
+    model in batches of at most MAX_BATCH_SIZE chunks. The CTC outputs of the overlapping strides
+    are dropped when the chunks are stitched back together, so peak memory is bounded by the chunk
+    length and batch size rather than by the length of the audio.
+
+    Returns:
+        Callable[..., Any]: The automatic speech recognition pipeline.
+    """
+    global _asr_model
+    if _asr_model is None:
+        with _lock:
+            if _asr_model is None:
+                _asr_model = load_backend(
+                    settings.MODEL_BACKEND,
+                    settings.MODEL_NAME,
+                    model_dir=settings.MODEL_DIR,
+                    onnx_model_dir=settings.ONNX_MODEL_DIR,
+                    chunk_length_s=settings.CHUNK_LENGTH_S,
+                    stride_length_s=settings.CHUNK_STRIDE_S,
+                    batch_size=settings.MAX_BATCH_SIZE
+                )
+    return _asr_model
+
+class LockedModel:
+    """Wrapper around the ASR model that runs one forward pass at a time.
+
+    Concurrent forward passes on the same model compete for the same intra-op threads, which is
+    slower than running them one after another. All callers in a process (the batch scheduler, the
+    batch and job endpoints and streams) share one wrapper, so that only one of them runs the model
+    at a time.
+
+    Attributes:
+        asr_model: The ASR model for speech recognition.
+    """
+    def __init__(self, asr_model: Callable[..., Any]):
+        """Initialize the LockedModel instance.
+
+        Args:
+            asr_model (Callable[..., Any]): The ASR model for speech recognition.
+        """
+        self.asr_model = asr_model
+        self._lock = threading.Lock()
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Run the ASR model once no other forward pass is running.
+
+        Args:
+            *args: The positional arguments to pass to the ASR model.
+            **kwargs: The keyword arguments to pass to the ASR model.
+
+        Returns:
+            Any: The output of the ASR model.
+        """
+        with self._lock:
+            return self.asr_model(*args, **kwargs)
+
+def is_model_loaded() -> bool:
+    """Check whether the ASR model has been loaded.
+
+    Returns:
+        bool: True if the model has been loaded, False otherwise.
+    """
+    return _asr_model is not None
+
+def warm_up(asr_model: Callable[..., Any], sampling_rate: int = 16000, audio_s: float = 1.0) -> None:
+    """Run warmup inferences so that the first requests do not pay for one-off initialization.
+
+    The first forward passes allocate the intermediate buffers and select the compute kernels, and
+    are several times slower than the following ones. A single input and a padded batch of two
+    inputs are run, which are the two code paths used by the batch scheduler.
 
+    Args:
+        asr_model (Callable[..., Any]): The ASR model for speech recognition.
+        sampling_rate (int): The sampling rate of the warmup audio (default is 16000 Hz).
+        audio_s (float): The length of the warmup audio in seconds.
+    """
+    # Low-level noise rather than silence, so that the feature normalization sees a non-zero variance
+    waveform = (np.random.default_rng(0).standard_normal(int(audio_s * sampling_rate)) * 0.01).astype(np.float32)
+    inputs: Dict[str, Any] = {"raw": waveform, "sampling_rate": sampling_rate}
+    asr_model(dict(inputs))
+    asr_model([dict(inputs), dict(inputs)], batch_size=2)
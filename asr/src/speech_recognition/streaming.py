@@ -0,0 +1,223 @@
+import logging
+import subprocess
+import threading
+
+import numpy as np
+
+from typing import List, Dict, Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+def pcm16_to_float32(data: bytes) -> np.ndarray:
+    """Convert 16-bit signed little-endian PCM into a float32 waveform in the range [-1, 1].
+
+    Args:
+        data (bytes): The raw PCM bytes. A trailing odd byte is ignored.
+
+    Returns:
+        np.ndarray: The waveform as a 1-D float32 array.
+    """
+    samples = np.frombuffer(data[:len(data) - len(data) % 2], dtype="<i2")
+    return samples.astype(np.float32) / 32768.0
+
+class FfmpegStreamDecoder:
+    """Incremental decoder for encoded audio streams (e.g. webm/opus or mp3) using a long-lived ffmpeg process.
+
+    Encoded frames are written to the stdin of ffmpeg as they arrive, while a background thread
+    drains the decoded float32 samples from its stdout so that the pipes never fill up.
+
+    Attributes:
+        sampling_rate (int): The sampling rate of the decoded waveform.
+    """
+    def __init__(self, sampling_rate: int = 16000):
+        """Initialize the FfmpegStreamDecoder instance and start the ffmpeg process.
+
+        Args:
+            sampling_rate (int): The sampling rate to resample the audio to (default is 16000 Hz).
+        """
+        self.sampling_rate = sampling_rate
+        self._process = subprocess.Popen(
+            [
+                "ffmpeg", "-probesize", "32768", "-analyzeduration", "0",
+                "-i", "pipe:0",
+                "-ac", "1", "-ar", str(sampling_rate), "-f", "f32le",
+                "-hide_banner", "-loglevel", "quiet",
+                "pipe:1"
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE
+        )
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._reader = threading.Thread(target=self._drain, name="ffmpeg-stream-reader", daemon=True)
+        self._reader.start()
+
+    def write(self, data: bytes) -> np.ndarray:
+        """Write encoded audio to the decoder and return the samples decoded so far.
+
+        Args:
+            data (bytes): The encoded audio frames.
+
+        Returns:
+            np.ndarray: The samples decoded since the previous call.
+        """
+        self._process.stdin.write(data)
+        self._process.stdin.flush()
+        return self._take()
+
+    def close(self) -> np.ndarray:
+        """Signal the end of the stream and return the remaining decoded samples.
+
+        Returns:
+            np.ndarray: The samples decoded since the previous call.
+        """
+        try:
+            self._process.stdin.close()
+        except BrokenPipeError:
+            pass
+        self._reader.join()
+        self._process.wait()
+        return self._take()
+
+    def terminate(self) -> None:
+        """Kill the ffmpeg process if it is still running (e.g. when the client disconnects)."""
+        if self._process.poll() is None:
+            self._process.kill()
+            self._process.wait()
+
+    def _drain(self) -> None:
+        """Read decoded samples from the stdout of ffmpeg until it exits."""
+        for chunk in iter(lambda: self._process.stdout.read1(65536), b""):
+            with self._lock:
+                self._buffer.extend(chunk)
+
+    def _take(self) -> np.ndarray:
+        """Take the complete float32 samples from the buffer."""
+        with self._lock:
+            size = len(self._buffer) - len(self._buffer) % 4
+            data = bytes(self._buffer[:size])
+            del self._buffer[:size]
+        return np.frombuffer(data, dtype=np.float32)
+
+class StreamingTranscriber:
+    """Class to transcribe an audio stream incrementally with a CTC model.
+
+    Incoming samples are appended to a buffer. Every `window_s` seconds of new audio, the audio
+    after the last committed word is transcribed again with word timestamps. Words that end more
+    than `right_context_s` seconds before the end of the buffer are considered stable and are
+    committed, so that they are never revised and never decoded again. Each decode therefore only
+    covers a few seconds of audio, regardless of the length of the stream.
+
+    Attributes:
+        asr_model: The ASR model for speech recognition.
+        sampling_rate (int): The sampling rate of the incoming samples.
+        window_s (float): The amount of new audio in seconds that triggers a partial transcription.
+        right_context_s (float): The amount of audio in seconds at the end of the buffer whose words are not committed yet.
+        max_pending_s (float): The maximum amount of uncommitted audio in seconds before it is committed regardless.
+    """
+    def __init__(
+            self,
+            asr_model: Callable[..., Dict[str, Any]],
+            sampling_rate: int = 16000,
+            window_s: float = 1.0,
+            right_context_s: float = 2.0,
+            max_pending_s: float = 15.0
+        ):
+        """Initialize the StreamingTranscriber instance.
+
+        Args:
+            asr_model: The ASR model for speech recognition.
+            sampling_rate (int): The sampling rate of the incoming samples (default is 16000 Hz).
+            window_s (float): The amount of new audio in seconds that triggers a partial transcription.
+            right_context_s (float): The amount of audio in seconds at the end of the buffer whose words are not committed yet.
+            max_pending_s (float): The maximum amount of uncommitted audio in seconds before it is committed regardless.
+        """
+        self.asr_model = asr_model
+        self.sampling_rate = sampling_rate
+        self.window_s = window_s
+        self.right_context_s = right_context_s
+        self.max_pending_s = max(max_pending_s, right_context_s + window_s)
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._committed: List[str] = []
+        self._total_samples = 0
+        self._undecoded_samples = 0
+
+    @property
+    def duration(self) -> str:
+        """str: The duration of the audio received so far in seconds."""
+        return str(round(self._total_samples / self.sampling_rate, 1))
+
+    def feed(self, samples: np.ndarray) -> Optional[str]:
+        """Append samples to the stream and transcribe them once enough new audio has arrived.
+
+        Args:
+            samples (np.ndarray): The new float32 samples.
+
+        Returns:
+            Optional[str]: The partial transcription of the stream so far, or None if no decode was run.
+        """
+        if samples.size == 0:
+            return None
+        self._pending = np.concatenate([self._pending, samples.astype(np.float32, copy=False)])
+        self._total_samples += samples.size
+        self._undecoded_samples += samples.size
+
+        if self._undecoded_samples < self.window_s * self.sampling_rate:
+            return None
+        return self._decode(final=False)
+
+    def finish(self, samples: Optional[np.ndarray] = None) -> str:
+        """Transcribe the remaining audio and commit all words.
+
+        Args:
+            samples (Optional[np.ndarray]): The last float32 samples of the stream, if any.
+
+        Returns:
+            str: The final transcription of the whole stream.
+        """
+        if samples is not None and samples.size > 0:
+            self._pending = np.concatenate([self._pending, samples.astype(np.float32, copy=False)])
+            self._total_samples += samples.size
+        if self._pending.size > 0:
+            return self._decode(final=True)
+        return " ".join(self._committed)
+
+    def _decode(self, final: bool) -> str:
+        """Transcribe the uncommitted audio and commit the stable words.
+
+        Args:
+            final (bool): Whether this is the end of the stream, in which case all words are committed.
+
+        Returns:
+            str: The committed words followed by the current hypothesis for the uncommitted audio.
+        """
+        self._undecoded_samples = 0
+        output = self.asr_model(
+            {"raw": self._pending, "sampling_rate": self.sampling_rate},
+            return_timestamps="word"
+        )
+        words = output.get("chunks") or []
+        pending_s = self._pending.size / self.sampling_rate
+
+        if final:
+            self._committed.extend(word["text"] for word in words)
+            self._pending = np.zeros(0, dtype=np.float32)
+            return " ".join(self._committed)
+
+        # Commit the words that end well before the end of the buffer
+        stable_until = pending_s - self.right_context_s
+        stable = [word for word in words if word["timestamp"][1] <= stable_until]
+        if stable:
+            cut_s = stable[-1]["timestamp"][1]
+        elif pending_s > self.max_pending_s:
+            # No stable words (e.g. silence), so drop the audio that is no longer needed as context
+            cut_s = stable_until
+        else:
+            cut_s = 0.0
+
+        self._committed.extend(word["text"] for word in stable)
+        hypothesis = [word["text"] for word in words[len(stable):]]
+        if cut_s > 0:
+            self._pending = self._pending[int(cut_s * self.sampling_rate):]
+
+        return " ".join(self._committed + hypothesis)
@@ -0,0 +1,24 @@
+import importlib.util
+import os
+import sys
+import tempfile
+
+import pytest
+
+ASR_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Make the speech recognition modules importable when running pytest from the asr directory
+sys.path.insert(0, os.path.join(ASR_DIR, "src"))
+
+# Keep the API from writing its logs, job queue or cache to the working directory when it is imported
+os.environ.setdefault("LOG_FILE", os.path.join(tempfile.mkdtemp(), "app.log"))
+os.environ.setdefault("JOBS_ENABLED", "false")
+os.environ.setdefault("CACHE_ENABLED", "false")
+
+@pytest.fixture(scope="session")
+def cv_decode():
+    """The `cv-decode.py` script, imported as a module (its file name is not a valid module name)."""
+    spec = importlib.util.spec_from_file_location("cv_decode", os.path.join(ASR_DIR, "cv-decode.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
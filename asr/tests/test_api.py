@@ -0,0 +1,93 @@
+import io
+import shutil
+
+import numpy as np
+import pytest
+
+from fastapi.testclient import TestClient
+
+from speech_recognition import asr_logic
+
+class StubLoader:
+    """Stand-in for the model loader, ready unless told otherwise."""
+    def __init__(self, ready=True):
+        self.ready = ready
+
+class StubModel:
+    def __call__(self, inputs, batch_size=None):
+        return {"text": "HELLO"}
+
+@pytest.fixture
+def app():
+    from api import asr_api
+    from api.dependencies import get_speech_recognizer
+    from core.executor import InferenceExecutor
+    from core.factory import SpeechRecognizer
+
+    app = asr_api.app
+    app.state.model_loader = StubLoader()
+    app.state.inference_executor = InferenceExecutor(max_workers=1, max_queue_size=1)
+    app.dependency_overrides[get_speech_recognizer] = lambda: SpeechRecognizer(StubModel())
+    yield app
+    app.dependency_overrides.clear()
+    app.state.inference_executor.shutdown()
+
+def test_asr_transcribes_the_decoded_upload(app, monkeypatch):
+    monkeypatch.setattr(asr_logic, "load_audio", lambda source, sampling_rate: np.zeros(sampling_rate * 2, np.float32))
+
+    response = TestClient(app).post("/asr", files={"file": ("sample.mp3", io.BytesIO(b"audio"))})
+
+    assert response.status_code == 200
+    assert (response.json()["transcription"], response.json()["duration"]) == ("HELLO", "2.0")
+
+def test_undecodable_upload_is_rejected_as_invalid_input(app, monkeypatch):
+    def load_audio(source, sampling_rate):
+        raise asr_logic.AudioDecodeError("The audio is either malformed or in an unsupported format.")
+
+    monkeypatch.setattr(asr_logic, "load_audio", load_audio)
+
+    response = TestClient(app).post("/asr", files={"file": ("sample.mp3", io.BytesIO(b"not audio"))})
+
+    assert response.status_code == 422
+    assert response.json()["error"]["code"] == "INVALID_INPUT_ERROR"
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_upload_that_ffmpeg_cannot_decode_is_rejected_as_invalid_input(app):
+    response = TestClient(app).post("/asr", files={"file": ("sample.mp3", io.BytesIO(b"not audio" * 100))})
+
+    assert response.status_code == 422
+
+class RecordingRecognizer:
+    """Stand-in for the speech recognizer that records where each upload is held."""
+    def __init__(self):
+        self.on_disk = []
+
+    def transcribe_audio(self, file):
+        self.on_disk.append(file._rolled)
+        return "HELLO", "1.0"
+
+@pytest.mark.parametrize("size, on_disk", [(1024, False), (1025, True)])
+def test_uploads_are_spooled_to_disk_only_above_the_threshold(app, monkeypatch, size, on_disk):
+    from api.dependencies import get_speech_recognizer
+    from api.uploads import SpooledMultiPartParser
+
+    monkeypatch.setattr(SpooledMultiPartParser, "max_file_size", 1024)
+    recognizer = RecordingRecognizer()
+    app.dependency_overrides[get_speech_recognizer] = lambda: recognizer
+
+    response = TestClient(app).post("/asr", files={"file": ("sample.mp3", io.BytesIO(b"\0" * size))})
+
+    assert response.status_code == 200
+    assert recognizer.on_disk == [on_disk]
+
+@pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+def test_upload_spooled_to_disk_is_streamed_to_ffmpeg(app, monkeypatch):
+    from api.uploads import SpooledMultiPartParser
+    from test_asr_logic import make_wav
+
+    monkeypatch.setattr(SpooledMultiPartParser, "max_file_size", 1024)
+
+    response = TestClient(app).post("/asr", files={"file": ("sample.wav", io.BytesIO(make_wav(2.0)))})
+
+    assert response.status_code == 200
+    assert response.json()["duration"] == "2.0"
@@ -0,0 +1,71 @@
+import io
+import tarfile
+import zipfile
+
+import pytest
+
+from speech_recognition.archive import close_expanded, expand_archives
+
+def make_zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    buffer.seek(0)
+    return buffer
+
+def make_tar(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    buffer.seek(0)
+    return buffer
+
+@pytest.mark.parametrize("make_archive", [make_zip, make_tar])
+def test_members_are_expanded_into_spooled_files(make_archive):
+    upload = io.BytesIO(b"not an archive")
+    files = [("a.wav", upload), ("samples", make_archive({"b.wav": b"b" * 100, "c.wav": b"c" * 10}))]
+
+    expanded = expand_archives(files, spool_size=50)
+    try:
+        assert [name for name, _ in expanded] == ["a.wav", "samples/b.wav", "samples/c.wav"]
+        assert expanded[0][1] is upload
+        assert expanded[1][1].read() == b"b" * 100
+        assert expanded[2][1].read() == b"c" * 10
+        # Members above the spool size are rolled over to disk, smaller ones stay in memory
+        assert expanded[1][1]._rolled and not expanded[2][1]._rolled
+    finally:
+        close_expanded(expanded, files)
+
+    assert expanded[1][1].closed and not upload.closed
+
+@pytest.mark.parametrize("make_archive", [make_zip, make_tar])
+def test_member_larger_than_the_limit_is_rejected(make_archive):
+    files = [("samples", make_archive({"small.wav": b"s" * 10, "big.wav": b"\0" * 10000}))]
+    with pytest.raises(ValueError, match="big.wav"):
+        expand_archives(files, max_member_size=1000)
+
+@pytest.mark.parametrize("make_archive", [make_zip, make_tar])
+def test_total_size_across_archives_is_limited(make_archive):
+    files = [
+        ("first", make_archive({"a.wav": b"a" * 600})),
+        ("second", make_archive({"b.wav": b"b" * 600}))
+    ]
+    with pytest.raises(ValueError, match="total"):
+        expand_archives(files, max_member_size=1000, max_total_size=1000)
+
+def test_member_with_an_understated_size_is_rejected():
+    archive = make_zip({"bomb.wav": b"\0" * 10000})
+    # Understate the uncompressed size in the headers, so that only the bytes read reveal the real size
+    data = archive.getvalue().replace((10000).to_bytes(4, "little"), (10).to_bytes(4, "little"))
+
+    with pytest.raises(ValueError):
+        expand_archives([("bomb.zip", io.BytesIO(data))], max_member_size=1000)
+
+def test_too_many_files_are_rejected():
+    files = [("samples", make_zip({f"{index}.wav": b"x" for index in range(5)}))]
+    with pytest.raises(ValueError, match="at most 3 files"):
+        expand_archives(files, max_files=3)
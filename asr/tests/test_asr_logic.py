@@ -0,0 +1,67 @@
+import io
+import shutil
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+from speech_recognition import asr_logic
+
+def test_batch_is_decoded_one_group_of_batch_size_at_a_time(monkeypatch):
+    events = []
+    lock = threading.Lock()
+
+    def load_audio(source, sampling_rate):
+        if source == b"bad":
+            raise ValueError("malformed audio")
+        with lock:
+            events.append("decode")
+        return np.zeros(len(source) * sampling_rate, dtype=np.float32)
+
+    def model(inputs, batch_size=None):
+        events.append(len(inputs))
+        return [{"text": f"{len(item['raw'])}"} for item in inputs]
+
+    monkeypatch.setattr(asr_logic, "load_audio", load_audio)
+    sources = [b"aaa", b"a", b"bad", b"aa", b"aaaa"]
+    results = asr_logic.transcribe_audio_batch(sources, model, sampling_rate=10, batch_size=2)
+
+    # Each group is run through the model before the next one is decoded
+    assert events == ["decode", "decode", 2, "decode", 1, "decode", 1]
+    assert results[0] == ("30", "3.0") and results[1] == ("10", "1.0") and results[3] == ("20", "2.0")
+    assert isinstance(results[2], ValueError)
+    assert results[4] == ("40", "4.0")
+
+requires_ffmpeg = pytest.mark.skipif(shutil.which("ffmpeg") is None, reason="ffmpeg is not installed")
+
+def make_wav(seconds, sampling_rate=8000):
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(sampling_rate)
+        f.writeframes(b"\x00\x10" * 2 * int(seconds * sampling_rate))
+    return buffer.getvalue()
+
+@requires_ffmpeg
+@pytest.mark.parametrize("as_type", [bytes, io.BytesIO, "path"])
+def test_load_audio_decodes_to_mono_at_the_target_sampling_rate(tmp_path, as_type):
+    wav = make_wav(1.5)
+    if as_type == "path":
+        source = str(tmp_path / "sample.wav")
+        with open(source, "wb") as f:
+            f.write(wav)
+    else:
+        source = as_type(wav)
+
+    waveform = asr_logic.load_audio(source, sampling_rate=16000)
+
+    assert waveform.dtype == np.float32 and waveform.ndim == 1
+    assert abs(len(waveform) - 24000) <= 160
+    assert asr_logic.get_audio_duration(waveform, 16000) == 1.5
+
+@requires_ffmpeg
+def test_load_audio_rejects_malformed_audio():
+    with pytest.raises(asr_logic.AudioDecodeError):
+        asr_logic.load_audio(b"this is not audio" * 100)
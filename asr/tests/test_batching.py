@@ -0,0 +1,77 @@
+import threading
+
+from speech_recognition.batching import BatchScheduler
+
+class RecordingModel:
+    """Stand-in for the ASR pipeline that records the calls it receives."""
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def __call__(self, inputs, batch_size=None):
+        with self.lock:
+            self.calls.append((inputs, batch_size))
+        if isinstance(inputs, list):
+            if any(item["raw"] == self.fail_on for item in inputs):
+                raise ValueError("malformed input in batch")
+            return [{"text": item["raw"]} for item in inputs]
+        if inputs["raw"] == self.fail_on:
+            raise ValueError("malformed input")
+        return {"text": inputs["raw"]}
+
+def submit_all(scheduler, values):
+    futures = [scheduler.submit({"raw": value}) for value in values]
+    return [future.exception() or future.result() for future in futures]
+
+def test_concurrent_requests_are_grouped_into_one_batch():
+    model = RecordingModel()
+    scheduler = BatchScheduler(model, max_batch_size=4, max_wait_time=0.5)
+    try:
+        results = submit_all(scheduler, ["a", "b", "c"])
+    finally:
+        scheduler.shutdown()
+
+    assert results == [{"text": "a"}, {"text": "b"}, {"text": "c"}]
+    assert len(model.calls) == 1
+    inputs, batch_size = model.calls[0]
+    assert [item["raw"] for item in inputs] == ["a", "b", "c"]
+    # The chunks of long inputs are batched up to the maximum batch size, not the number of requests
+    assert batch_size == 4
+
+def test_batches_are_capped_at_the_maximum_batch_size():
+    model = RecordingModel()
+    scheduler = BatchScheduler(model, max_batch_size=2, max_wait_time=0.5)
+    try:
+        results = submit_all(scheduler, ["a", "b", "c"])
+    finally:
+        scheduler.shutdown()
+
+    assert [result["text"] for result in results] == ["a", "b", "c"]
+    assert [len(inputs) if isinstance(inputs, list) else 1 for inputs, _ in model.calls] == [2, 1]
+
+def test_failed_batch_is_retried_per_request():
+    model = RecordingModel(fail_on="bad")
+    scheduler = BatchScheduler(model, max_batch_size=4, max_wait_time=0.5)
+    try:
+        results = submit_all(scheduler, ["a", "bad", "c"])
+    finally:
+        scheduler.shutdown()
+
+    assert results[0] == {"text": "a"}
+    assert isinstance(results[1], ValueError)
+    assert results[2] == {"text": "c"}
+
+def test_batch_wait_is_reported_to_the_registered_observer(monkeypatch):
+    from speech_recognition import instrumentation
+
+    observed = []
+    monkeypatch.setattr(instrumentation, "_stage_observer", lambda stage, seconds: observed.append((stage, seconds)))
+    scheduler = BatchScheduler(RecordingModel(), max_batch_size=2, max_wait_time=0.5)
+    try:
+        submit_all(scheduler, ["a", "b"])
+    finally:
+        scheduler.shutdown()
+
+    assert [stage for stage, _ in observed] == ["batch_wait", "batch_wait"]
+    assert all(seconds >= 0 for _, seconds in observed)
@@ -0,0 +1,161 @@
+import json
+import time
+
+from types import SimpleNamespace
+
+import pytest
+
+serializer = pytest.importorskip("elasticsearch.serializer")
+
+class FakeBulkClient:
+    """Stand-in for the Elasticsearch client that serves the bulk API from memory.
+
+    Args:
+        statuses (dict): The statuses to return for a document ID on successive attempts (201 by default).
+        fail (bool): Whether every bulk request fails as if the cluster were unreachable.
+    """
+    def __init__(self, statuses=None, fail=False):
+        self.statuses = {key: list(value) for key, value in (statuses or {}).items()}
+        self.fail = fail
+        self.requests = []
+        self.transport = SimpleNamespace(serializer=serializer.JSONSerializer())
+
+    def bulk(self, body, **kwargs):
+        from elasticsearch.exceptions import ConnectionError
+
+        if self.fail:
+            raise ConnectionError("N/A", "connection refused", None)
+        lines = [json.loads(line) for line in body.strip().split("\n")]
+        documents = list(zip(lines[::2], lines[1::2]))
+        self.requests.append([action["index"]["_id"] for action, _ in documents])
+
+        items = []
+        for action, _ in documents:
+            document_id = action["index"]["_id"]
+            pending = self.statuses.get(document_id)
+            status = pending.pop(0) if pending else 201
+            result = {"_index": action["index"]["_index"], "_id": document_id, "status": status}
+            if status >= 300:
+                result["error"] = {"type": "mapper_parsing_exception", "reason": "bad document"}
+            items.append({"index": result})
+        return {"errors": any(item["index"]["status"] >= 300 for item in items), "items": items}
+
+@pytest.fixture
+def setup(cv_decode, tmp_path):
+    data_dir = tmp_path / "cv-valid-dev"
+    data_dir.mkdir()
+    csv_path = tmp_path / "cv-valid-dev.csv"
+    csv_path.write_text("filename,text,duration\n", encoding="utf-8")
+    journal_path = str(csv_path) + ".journal"
+
+    def make_files(count):
+        paths = []
+        for index in range(count):
+            path = data_dir / f"sample-{index}.mp3"
+            path.write_bytes(b"audio")
+            paths.append(str(path))
+        return paths
+
+    def put_all(indexer, paths):
+        for path in paths:
+            filename = cv_decode.relative_filename(path)
+            indexer.put(path, cv_decode.build_document(filename, None, f"TEXT {filename}", "1.5"))
+
+    return SimpleNamespace(
+        csv_path=str(csv_path), journal_path=journal_path, make_files=make_files, put_all=put_all
+    )
+
+def read_journal(path):
+    with open(path, encoding="utf-8") as journal:
+        return [json.loads(line)["filename"] for line in journal]
+
+def test_documents_are_flushed_in_buffers_and_checkpointed(cv_decode, setup):
+    client = FakeBulkClient()
+    store = cv_decode.ResultsStore(setup.csv_path, setup.journal_path, flush_every=100)
+    indexer = cv_decode.BulkIndexer(client, "cv-transcriptions", store, buffer_size=2, flush_interval=60)
+    indexer.start()
+
+    paths = setup.make_files(5)
+    setup.put_all(indexer, paths)
+    indexer.close()
+
+    assert [len(request) for request in client.requests] == [2, 2, 1]
+    assert indexer.indexed == 5 and indexer.failed == 0 and indexer.error is None
+    # Every indexed transcription is flushed to the journal and its audio file deleted
+    assert sorted(read_journal(setup.journal_path)) == sorted(cv_decode.relative_filename(path) for path in paths)
+    assert not any(cv_decode.os.path.exists(path) for path in paths)
+
+def test_partial_buffer_is_flushed_after_the_interval(cv_decode, setup):
+    client = FakeBulkClient()
+    store = cv_decode.ResultsStore(setup.csv_path, setup.journal_path)
+    indexer = cv_decode.BulkIndexer(client, "cv-transcriptions", store, buffer_size=100, flush_interval=0.1)
+    indexer.start()
+    try:
+        setup.put_all(indexer, setup.make_files(1))
+        deadline = time.monotonic() + 5
+        while indexer.indexed == 0 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert indexer.indexed == 1
+    finally:
+        indexer.close()
+
+def test_rejected_documents_are_retried_or_kept_for_the_next_run(cv_decode, setup):
+    paths = setup.make_files(3)
+    busy, rejected = (cv_decode.relative_filename(path) for path in paths[:2])
+    client = FakeBulkClient(statuses={busy: [429, 201], rejected: [400]})
+    store = cv_decode.ResultsStore(setup.csv_path, setup.journal_path)
+    indexer = cv_decode.BulkIndexer(client, "cv-transcriptions", store, buffer_size=3, retries=2, backoff=0)
+    indexer.start()
+
+    setup.put_all(indexer, paths)
+    indexer.close()
+
+    assert indexer.indexed == 2 and indexer.failed == 1
+    assert rejected not in read_journal(setup.journal_path)
+    # The audio file of the rejected document is kept, so that it can be transcribed again
+    assert cv_decode.os.path.exists(paths[1])
+    assert not cv_decode.os.path.exists(paths[0]) and not cv_decode.os.path.exists(paths[2])
+
+def test_unreachable_cluster_stops_indexing_and_resumes_from_the_journal(cv_decode, setup):
+    paths = setup.make_files(4)
+    store = cv_decode.ResultsStore(setup.csv_path, setup.journal_path)
+    indexer = cv_decode.BulkIndexer(FakeBulkClient(), "cv-transcriptions", store, buffer_size=2, flush_interval=60)
+    indexer.start()
+    setup.put_all(indexer, paths[:2])
+    indexer.close()
+    store.flush()
+    store.journal.close()
+
+    # The second run cannot reach the cluster: nothing more is checkpointed and no audio is deleted
+    resumed = cv_decode.ResultsStore(setup.csv_path, setup.journal_path, resume=True)
+    assert resumed.completed == {cv_decode.relative_filename(path) for path in paths[:2]}
+    indexer = cv_decode.BulkIndexer(FakeBulkClient(fail=True), "cv-transcriptions", resumed, buffer_size=2, flush_interval=60)
+    indexer.start()
+    setup.put_all(indexer, paths[2:])
+    indexer.close()
+
+    assert indexer.error is not None and indexer.indexed == 0
+    with pytest.raises(RuntimeError, match="Indexing stopped"):
+        setup.put_all(indexer, paths[2:])
+    assert all(cv_decode.os.path.exists(path) for path in paths[2:])
+    assert len(read_journal(setup.journal_path)) == 2
+
+def test_file_buffered_twice_is_indexed_once_and_all_its_copies_are_deleted(cv_decode, setup, tmp_path):
+    paths = setup.make_files(2)
+    # A copy of the first file under another root, with the same filename in the CSV file
+    copy_dir = tmp_path / "copy" / "cv-valid-dev"
+    copy_dir.mkdir(parents=True)
+    copy = copy_dir / "sample-0.mp3"
+    copy.write_bytes(b"audio")
+
+    client = FakeBulkClient()
+    store = cv_decode.ResultsStore(setup.csv_path, setup.journal_path)
+    indexer = cv_decode.BulkIndexer(client, "cv-transcriptions", store, buffer_size=3, flush_interval=60)
+    indexer.start()
+    setup.put_all(indexer, paths + [str(copy)])
+    indexer.close()
+
+    assert client.requests == [["cv-valid-dev/sample-0.mp3", "cv-valid-dev/sample-1.mp3"]]
+    assert indexer.indexed == 2 and indexer.failed == 0
+    assert sorted(read_journal(setup.journal_path)) == ["cv-valid-dev/sample-0.mp3", "cv-valid-dev/sample-1.mp3"]
+    assert not any(cv_decode.os.path.exists(path) for path in paths + [str(copy)])
@@ -0,0 +1,63 @@
+import io
+import os
+import stat
+
+import pytest
+
+from speech_recognition.cache import TranscriptionCache, hash_audio
+
+def test_hash_audio_is_the_same_for_bytes_and_file_objects():
+    audio = b"\x00\x01" * 1000
+    assert hash_audio(audio, "model") == hash_audio(io.BytesIO(audio), "model")
+    assert hash_audio(audio, "model") != hash_audio(audio, "other-model")
+
+def test_memory_tier_evicts_least_recently_used_entries():
+    cache = TranscriptionCache(max_entries=2)
+    cache.put("a", ("A", "1.0"))
+    cache.put("b", ("B", "1.0"))
+    assert cache.get("a") == ("A", "1.0")
+    cache.put("c", ("C", "1.0"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == ("A", "1.0")
+    assert cache.get("c") == ("C", "1.0")
+    assert cache.stats() == {
+        "entries": 2, "max_entries": 2, "hits": 3, "disk_hits": 0, "misses": 1, "evictions": 1
+    }
+
+def test_disk_tier_survives_a_new_cache_instance(tmp_path):
+    db_path = str(tmp_path / "cache" / "cache.db")
+    TranscriptionCache(max_entries=1, db_path=db_path).put("a", ("A", "2.0"))
+
+    cache = TranscriptionCache(max_entries=1, db_path=db_path)
+    assert cache.get("a") == ("A", "2.0")
+    assert cache.get("a") == ("A", "2.0")
+    assert cache.stats()["disk_hits"] == 1
+
+@pytest.mark.skipif(hasattr(os, "geteuid") and os.geteuid() == 0, reason="root can write to read-only directories")
+def test_unwritable_directory_falls_back_to_memory(tmp_path):
+    tmp_path.chmod(stat.S_IRUSR | stat.S_IXUSR)
+    try:
+        cache = TranscriptionCache(max_entries=4, db_path=str(tmp_path / "cache" / "cache.db"))
+        cache.put("a", ("A", "1.0"))
+        assert cache.get("a") == ("A", "1.0")
+        assert cache.get("b") is None
+    finally:
+        tmp_path.chmod(stat.S_IRWXU)
+
+def test_missing_directory_that_cannot_be_created_falls_back_to_memory(tmp_path):
+    # A regular file where the directory should be makes os.makedirs fail, even as root
+    (tmp_path / "file").write_text("")
+    cache = TranscriptionCache(max_entries=4, db_path=str(tmp_path / "file" / "cache.db"))
+    cache.put("a", ("A", "1.0"))
+    assert cache.get("a") == ("A", "1.0")
+    assert cache.get("b") is None
+
+@pytest.mark.parametrize("setting, value", [("CHUNK_LENGTH_S", 30.0), ("CHUNK_STRIDE_S", 2.0), ("SAMPLING_RATE", 8000), ("MODEL_BACKEND", "onnx")])
+def test_cache_namespace_changes_with_the_transcription_settings(monkeypatch, setting, value):
+    from core.config import settings
+    from core.factory import cache_namespace
+
+    namespace = cache_namespace()
+    monkeypatch.setattr(settings, setting, value)
+    assert cache_namespace() != namespace
@@ -0,0 +1,64 @@
+import csv
+import json
+
+import pytest
+
+def write_csv(path, filenames):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["filename", "text", "duration"])
+        writer.writeheader()
+        writer.writerows({"filename": filename, "text": f"text of {filename}", "duration": ""} for filename in filenames)
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return {row["filename"]: row for row in csv.DictReader(f)}
+
+@pytest.fixture
+def paths(tmp_path):
+    csv_path = tmp_path / "cv-valid-dev.csv"
+    write_csv(csv_path, ["cv-valid-dev/a.mp3", "cv-valid-dev/b.mp3", "cv-valid-dev/c.mp3"])
+    return str(csv_path), str(tmp_path / "cv-valid-dev.csv.journal")
+
+def test_journal_is_replayed_on_resume(cv_decode, paths):
+    csv_path, journal_path = paths
+    store = cv_decode.ResultsStore(csv_path, journal_path, flush_every=2)
+    assert not store.add("cv-valid-dev/a.mp3", "A", "1.0")
+    assert store.add("cv-valid-dev/b.mp3", "B", "2.0")
+    store.add("cv-valid-dev/new.mp3", "NEW", "3.0")
+    # Simulate a crash: the buffered transcription is lost and the last line is half-written
+    store.journal.write('{"filename": "cv-valid-dev/c.mp3", "gener')
+    store.journal.close()
+
+    resumed = cv_decode.ResultsStore(csv_path, journal_path, resume=True)
+    assert resumed.completed == {"cv-valid-dev/a.mp3", "cv-valid-dev/b.mp3"}
+    resumed.add("cv-valid-dev/c.mp3", "C", "4.0")
+    resumed.merge()
+
+    rows = read_csv(csv_path)
+    assert [(rows[name]["generated_text"], rows[name]["duration"]) for name in sorted(rows)] == [
+        ("A", "1.0"), ("B", "2.0"), ("C", "4.0")
+    ]
+    assert rows["cv-valid-dev/a.mp3"]["text"] == "text of cv-valid-dev/a.mp3"
+
+def test_existing_journal_is_not_truncated_without_resume(cv_decode, paths):
+    csv_path, journal_path = paths
+    with open(journal_path, "w", encoding="utf-8") as journal:
+        journal.write(json.dumps({"filename": "cv-valid-dev/a.mp3", "generated_text": "A", "duration": "1.0"}) + "\n")
+
+    with pytest.raises(FileExistsError, match="--resume"):
+        cv_decode.ResultsStore(csv_path, journal_path)
+    with open(journal_path, encoding="utf-8") as journal:
+        assert len(journal.readlines()) == 1
+
+    store = cv_decode.ResultsStore(csv_path, journal_path, discard=True)
+    assert store.completed == set()
+    store.close()
+
+def test_empty_journal_is_reused_without_resume(cv_decode, paths):
+    csv_path, journal_path = paths
+    open(journal_path, "w").close()
+
+    store = cv_decode.ResultsStore(csv_path, journal_path)
+    store.add("cv-valid-dev/a.mp3", "A", "1.0")
+    store.merge()
+    assert read_csv(csv_path)["cv-valid-dev/a.mp3"]["generated_text"] == "A"
@@ -0,0 +1,59 @@
+import random
+
+import numpy as np
+import pytest
+
+from speech_recognition.evaluation import edit_distances, error_rate, normalize_text
+
+def levenshtein(reference, hypothesis):
+    """Plain dynamic programming reference implementation of the edit distance."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_token in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_token in enumerate(hypothesis, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_token != hyp_token)
+            ))
+        previous = current
+    return previous[-1]
+
+def random_text(rng, words, max_length):
+    return " ".join(rng.choice(words) for _ in range(rng.randint(0, max_length)))
+
+@pytest.mark.parametrize("unit", ["word", "char"])
+@pytest.mark.parametrize("batch_size", [1, 7, 1024])
+def test_edit_distances_match_the_reference_implementation(unit, batch_size):
+    rng = random.Random(0)
+    words = ["a", "ab", "ba", "cat", "dog", "it's"]
+    references = [random_text(rng, words, 12) for _ in range(200)]
+    hypotheses = [random_text(rng, words, 12) for _ in range(200)]
+
+    distances = edit_distances(references, hypotheses, unit=unit, batch_size=batch_size)
+
+    tokenize = str.split if unit == "word" else list
+    expected = [levenshtein(tokenize(ref), tokenize(hyp)) for ref, hyp in zip(references, hypotheses)]
+    assert distances.tolist() == expected
+
+@pytest.mark.parametrize("reference, hypothesis, expected", [
+    ("", "", 0),
+    ("", "a b", 2),
+    ("a b c", "", 3),
+    ("a b c", "a b c", 0),
+    ("a b c", "a x c", 1),
+    ("a b c", "b c d", 2),
+])
+def test_edit_distances_edge_cases(reference, hypothesis, expected):
+    assert edit_distances([reference], [hypothesis]).tolist() == [expected]
+
+def test_edit_distances_validate_the_inputs():
+    with pytest.raises(ValueError):
+        edit_distances(["a"], ["a"], unit="phoneme")
+    with pytest.raises(ValueError):
+        edit_distances(["a"], [])
+
+def test_normalize_text_and_error_rate():
+    assert normalize_text("HELLO,  World! It's") == "hello world it's"
+    assert error_rate(np.array([1, 2]), np.array([4, 6])) == 0.3
+    assert error_rate(np.array([0]), np.array([0])) == 0.0
@@ -0,0 +1,51 @@
+import asyncio
+import threading
+
+import pytest
+
+from api.exceptions import ServiceOverloadedError
+from core.executor import InferenceExecutor
+
+async def saturate(executor, submit):
+    """Fill the executor with blocked tasks and return the event that releases them."""
+    release = threading.Event()
+    tasks = [
+        asyncio.ensure_future(submit(release.wait))
+        for _ in range(executor.max_workers + executor.max_queue_size)
+    ]
+    await asyncio.sleep(0.05)
+    return release, tasks
+
+@pytest.mark.parametrize("executor_type", ["thread", "process"])
+def test_local_tasks_share_the_admission_limit(executor_type):
+    executor = InferenceExecutor(executor_type=executor_type, max_workers=1, max_queue_size=1)
+
+    async def scenario():
+        release, tasks = await saturate(executor, executor.submit_local)
+        assert executor.full
+        with pytest.raises(ServiceOverloadedError):
+            await executor.submit_local(len, "abc")
+        release.set()
+        await asyncio.gather(*tasks)
+        assert not executor.full
+        return await executor.submit_local(len, "abc")
+
+    try:
+        assert asyncio.run(scenario()) == 3
+    finally:
+        executor.shutdown()
+
+def test_submit_is_rejected_while_streams_fill_the_executor():
+    executor = InferenceExecutor(executor_type="thread", max_workers=1, max_queue_size=0)
+
+    async def scenario():
+        release, tasks = await saturate(executor, executor.submit_local)
+        with pytest.raises(ServiceOverloadedError):
+            await executor.submit(len, "abc")
+        release.set()
+        await asyncio.gather(*tasks)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        executor.shutdown()
@@ -0,0 +1,143 @@
+import io
+import sqlite3
+import time
+
+import pytest
+
+from api.exceptions import SpeechRecognitionError
+from core.jobs import JobQueue
+
+class TrackingFile(io.BytesIO):
+    """Binary file object that records how many files were read before it."""
+    reads = []
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+
+    def read(self, *args):
+        TrackingFile.reads.append(self.name)
+        return super().read(*args)
+
+@pytest.fixture
+def job_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), num_workers=0, batch_size=2)
+    yield queue
+    queue.shutdown()
+
+def test_uploaded_files_are_stored_and_transcribed_in_batches(job_queue):
+    TrackingFile.reads = []
+    job_id = job_queue.create_job([
+        ("a.wav", None, TrackingFile("a.wav", b"audio-a")),
+        ("b.wav", None, b"audio-b"),
+        ("c.wav", "/data/c.wav", None)
+    ])
+    assert TrackingFile.reads == ["a.wav"]
+    assert job_queue.get_job(job_id)["status"] == "queued"
+
+    rows = job_queue._claim()
+    assert [(path, audio) for _, path, audio in rows] == [(None, b"audio-a"), (None, b"audio-b")]
+    job_queue._complete([row[0] for row in rows], [("A", "1.0"), SpeechRecognitionError(detail="bad audio")])
+
+    job = job_queue.get_job(job_id)
+    assert (job["status"], job["total"], job["completed"], job["failed"]) == ("running", 3, 1, 1)
+    assert job["results"] == [
+        {"filename": "a.wav", "transcription": "A", "duration": "1.0", "error": None},
+        {"filename": "b.wav", "transcription": None, "duration": None, "error": "bad audio"}
+    ]
+    # The stored contents of transcribed files are dropped
+    assert job_queue._connection.execute("SELECT COUNT(*) FROM job_items WHERE audio IS NOT NULL").fetchone() == (0,)
+
+def test_job_is_not_created_if_a_file_cannot_be_read(job_queue):
+    class BrokenFile(io.BytesIO):
+        def read(self, *args):
+            raise OSError("disk error")
+
+    with pytest.raises(OSError):
+        job_queue.create_job([("a.wav", None, b"audio-a"), ("b.wav", None, BrokenFile())])
+
+    assert job_queue._connection.execute("SELECT COUNT(*) FROM jobs").fetchone() == (0,)
+    assert job_queue._connection.execute("SELECT COUNT(*) FROM job_items").fetchone() == (0,)
+    assert not job_queue._connection.in_transaction
+
+def test_completing_a_batch_is_atomic(job_queue):
+    job_id = job_queue.create_job([("a.wav", None, b"audio-a"), ("b.wav", None, b"audio-b")])
+    rows = job_queue._claim()
+
+    # An output that cannot be stored for the second file must not leave the first one completed
+    with pytest.raises(sqlite3.Error):
+        job_queue._complete([row[0] for row in rows], [("A", "1.0"), ("B", object())])
+
+    assert job_queue.get_job(job_id)["completed"] == 0
+    assert not job_queue._connection.in_transaction
+
+def test_job_api_is_disabled_if_the_database_cannot_be_opened(tmp_path, caplog):
+    from core.jobs import open_job_queue
+
+    # A regular file where the directory of the database should be, as on a read-only filesystem
+    (tmp_path / "jobs").write_text("")
+    with caplog.at_level("WARNING", logger="core.jobs"):
+        assert open_job_queue(str(tmp_path / "jobs" / "jobs.db"), num_workers=0) is None
+    assert "disabling the job API" in caplog.text
+
+def test_files_are_read_outside_of_the_lock_and_published_at_once(job_queue):
+    observed = []
+
+    class ObservedFile(io.BytesIO):
+        def read(self, *args):
+            # The queue stays available while the upload is read, and the job is not visible yet
+            observed.append((job_queue._lock.locked(), job_queue._claim()))
+            return super().read(*args)
+
+    job_id = job_queue.create_job(
+        [("a.wav", None, b"audio-a"), ("b.wav", None, ObservedFile(b"audio-b")), ("c.wav", None, b"audio-c")],
+        stage_size=1
+    )
+
+    assert observed == [(False, [])]
+    assert job_queue.get_job(job_id)["total"] == 3
+    assert len(job_queue._claim()) == 2
+
+def test_staged_files_of_an_interrupted_upload_are_dropped(tmp_path):
+    queue = JobQueue(str(tmp_path / "jobs.db"), num_workers=0)
+    queue._stage([("lost", "a.wav", None, b"audio-a")])
+    queue.shutdown()
+
+    queue = JobQueue(str(tmp_path / "jobs.db"), num_workers=0)
+    assert queue._connection.execute("SELECT COUNT(*) FROM job_items").fetchone() == (0,)
+    queue.shutdown()
+
+def test_workers_wait_for_interactive_requests_before_each_file(tmp_path, monkeypatch):
+    import threading
+
+    from core import jobs
+
+    busy = threading.Event()
+    calls = []
+
+    class Recognizer:
+        def transcribe_batch(self, sources):
+            calls.append(sources)
+            # Interactive traffic arrives while the first file is transcribed
+            busy.set()
+            return [("TEXT", "1.0")]
+
+    monkeypatch.setattr(jobs.SpeechRecognizerFactory, "create_speech_recognizer", staticmethod(Recognizer))
+    queue = JobQueue(str(tmp_path / "jobs.db"), num_workers=1, batch_size=2, poll_interval=0.01, is_busy=busy.is_set)
+    job_id = queue.create_job([("a.wav", None, b"audio-a"), ("b.wav", None, b"audio-b")])
+    queue.start()
+    try:
+        deadline = time.monotonic() + 5
+        while queue.get_job(job_id)["completed"] < 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        # The second file of the claimed batch waits for the interactive requests to finish
+        assert calls == [[b"audio-a"]]
+
+        busy.clear()
+        while queue.get_job(job_id)["completed"] < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert calls[1] == [b"audio-b"]
+    finally:
+        busy.clear()
+        queue.shutdown()
@@ -0,0 +1,42 @@
+import logging
+import os
+
+import pytest
+
+from api import logging_config
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    path = tmp_path / "app.log"
+    monkeypatch.setitem(logging_config.LOGGING_CONFIG["handlers"]["file"], "filename", str(path))
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield path
+    logging_config.stop_logging()
+    root.handlers, root.level = handlers, level
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+def test_forked_child_writes_its_records_with_a_new_listener(log_file):
+    parent_listener = logging_config.configure_logging()
+    assert logging.getLogger().level == logging.DEBUG
+
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            assert logging_config._listener is not parent_listener
+            logging.getLogger("child").debug("written by the child")
+        except BaseException:
+            exit_code = 1
+        finally:
+            logging_config.stop_logging()
+            os._exit(exit_code)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    logging.getLogger("parent").info("written by the parent")
+    logging_config.stop_logging()
+
+    content = log_file.read_text()
+    assert "child - DEBUG - written by the child" in content
+    assert "parent - INFO - written by the parent" in content
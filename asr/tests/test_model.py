@@ -0,0 +1,32 @@
+import threading
+import time
+
+from speech_recognition.model import LockedModel
+
+class OverlapModel:
+    """Stand-in for the ASR model that records how many calls run at the same time."""
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, inputs, batch_size=None):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.01)
+        with self.lock:
+            self.running -= 1
+        return {"text": inputs["raw"], "batch_size": batch_size}
+
+def test_locked_model_runs_one_forward_pass_at_a_time():
+    model = OverlapModel()
+    locked = LockedModel(model)
+    threads = [threading.Thread(target=locked, args=({"raw": "a"},)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert model.max_running == 1
+    assert locked({"raw": "b"}, batch_size=4) == {"text": "b", "batch_size": 4}
@@ -0,0 +1,74 @@
+import sys
+import threading
+import types
+
+import pytest
+
+from api.exceptions import ProfilerBusyError
+from core.profiling import profile_call
+
+class FakeProfile:
+    """Stand-in for torch.profiler.profile that records how it is used."""
+    events = []
+    fail_on_start = False
+
+    def __init__(self, **kwargs):
+        pass
+
+    def start(self):
+        if FakeProfile.fail_on_start:
+            raise RuntimeError("profiler already enabled")
+        FakeProfile.events.append("start")
+
+    def stop(self):
+        FakeProfile.events.append("stop")
+
+    def export_chrome_trace(self, path):
+        FakeProfile.events.append("export")
+
+@pytest.fixture
+def fake_torch_profiler(monkeypatch):
+    torch = types.ModuleType("torch")
+    profiler = types.ModuleType("torch.profiler")
+    profiler.profile = FakeProfile
+    profiler.ProfilerActivity = types.SimpleNamespace(CPU="cpu")
+    torch.profiler = profiler
+    monkeypatch.setitem(sys.modules, "torch", torch)
+    monkeypatch.setitem(sys.modules, "torch.profiler", profiler)
+    FakeProfile.events = []
+    FakeProfile.fail_on_start = False
+
+def test_overlapping_torch_profiles_are_rejected(fake_torch_profiler, tmp_path):
+    started, release = threading.Event(), threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "first"
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(profile_call("torch", str(tmp_path / "a.json"), slow)))
+    thread.start()
+    started.wait(5)
+    try:
+        with pytest.raises(ProfilerBusyError) as error:
+            profile_call("torch", str(tmp_path / "b.json"), lambda: "second")
+        assert error.value.status_code == 409
+    finally:
+        release.set()
+        thread.join()
+
+    assert results == ["first"]
+    assert FakeProfile.events == ["start", "stop", "export"]
+    # The profiler is available again once the first request is done
+    assert profile_call("torch", str(tmp_path / "c.json"), lambda: "third") == "third"
+
+def test_trace_is_not_exported_if_the_profiler_fails_to_start(fake_torch_profiler, tmp_path):
+    FakeProfile.fail_on_start = True
+
+    with pytest.raises(RuntimeError, match="profiler already enabled"):
+        profile_call("torch", str(tmp_path / "a.json"), lambda: "result")
+
+    assert FakeProfile.events == []
+    FakeProfile.fail_on_start = False
+    assert profile_call("torch", str(tmp_path / "b.json"), lambda: "result") == "result"
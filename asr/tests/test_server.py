@@ -0,0 +1,35 @@
+import io
+
+import pytest
+
+from core import server
+
+def fake_files(monkeypatch, files):
+    def fake_open(path, *args, **kwargs):
+        if path not in files:
+            raise FileNotFoundError(path)
+        return io.StringIO(files[path])
+    monkeypatch.setattr(server, "open", fake_open, raising=False)
+
+@pytest.mark.parametrize("files, expected", [
+    ({"/sys/fs/cgroup/cpu.max": "150000 100000\n"}, 1.5),
+    ({"/sys/fs/cgroup/cpu.max": "max 100000\n"}, None),
+    ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "200000\n", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000\n"}, 2.0),
+    ({"/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_quota_us": "50000\n", "/sys/fs/cgroup/cpu,cpuacct/cpu.cfs_period_us": "100000\n"}, 0.5),
+    ({"/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "-1\n", "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000\n"}, None),
+    ({}, None)
+])
+def test_cgroup_cpu_quota(monkeypatch, files, expected):
+    fake_files(monkeypatch, files)
+    assert server.cgroup_cpu_quota() == expected
+
+def test_available_cpus_is_limited_by_the_cgroup_v1_quota(monkeypatch):
+    fake_files(monkeypatch, {
+        "/sys/fs/cgroup/cpu/cpu.cfs_quota_us": "150000\n",
+        "/sys/fs/cgroup/cpu/cpu.cfs_period_us": "100000\n"
+    })
+    monkeypatch.setattr(server.os, "sched_getaffinity", lambda pid: set(range(8)))
+
+    assert server.available_cpus() == 2
+    assert server.torch_threads_per_worker(2) == 1
+    assert server.torch_threads_per_worker(2, torch_threads=3) == 3
@@ -0,0 +1,112 @@
+import asyncio
+import sys
+import types
+
+from types import SimpleNamespace
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from core import startup
+from core.startup import ModelLoader
+
+class StubModel:
+    """Stand-in for the ASR pipeline that records the warmup inputs."""
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, inputs, batch_size=None):
+        self.calls.append(len(inputs) if isinstance(inputs, list) else 1)
+        return [{"text": ""}] * len(inputs) if isinstance(inputs, list) else {"text": ""}
+
+@pytest.fixture(autouse=True)
+def inference_libraries(monkeypatch):
+    # The loader imports torch and transformers, which the tests do not need
+    for name in ("torch", "transformers"):
+        monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+
+def test_model_is_loaded_and_warmed_up(monkeypatch):
+    model = StubModel()
+    monkeypatch.setattr(startup, "get_asr_model", lambda: model)
+    loader = ModelLoader()
+    assert not loader.ready
+
+    loader.load()
+
+    assert loader.ready and loader.error is None
+    # A single input and a padded batch of two inputs are run before reporting ready
+    assert model.calls == [1, 2]
+    readiness = loader.readiness()
+    assert readiness["ready"] and readiness["model_loaded"] and readiness["warmed_up"]
+    assert set(readiness["startup_seconds"]) == {"import", "load", "warmup", "total"}
+
+def test_load_failure_is_recorded_instead_of_raised(monkeypatch):
+    def get_asr_model():
+        raise OSError("model not found")
+
+    monkeypatch.setattr(startup, "get_asr_model", get_asr_model)
+    loader = ModelLoader()
+
+    loader.load()
+
+    assert not loader.ready and not loader.model_loaded
+    assert loader.readiness()["error"] == "model not found"
+    assert set(loader.readiness()["startup_seconds"]) == {"import"}
+
+@pytest.mark.parametrize("loaded", [True, False])
+def test_job_workers_only_start_once_the_model_is_ready(monkeypatch, loaded):
+    from api.asr_api import load_model
+
+    def get_asr_model():
+        if not loaded:
+            raise OSError("model not found")
+        return StubModel()
+
+    monkeypatch.setattr(startup, "get_asr_model", get_asr_model)
+    started = []
+    app = SimpleNamespace(state=SimpleNamespace(
+        model_loader=ModelLoader(), job_queue=SimpleNamespace(start=lambda: started.append(True))
+    ))
+
+    asyncio.run(load_model(app))
+
+    assert app.state.model_loader.ready is loaded
+    assert started == ([True] if loaded else [])
+
+def test_ready_reports_503_until_the_model_is_ready(monkeypatch):
+    from api.asr_api import app
+
+    model = StubModel()
+    monkeypatch.setattr(startup, "get_asr_model", lambda: model)
+    app.state.model_loader = ModelLoader()
+    client = TestClient(app)
+
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+    # The speech recognition endpoints reject requests meanwhile
+    response = client.post("/asr", files={"file": ("sample.mp3", b"audio")})
+    assert response.status_code == 503
+    assert response.json()["error"]["code"] == "MODEL_NOT_READY_ERROR"
+    assert "Retry-After" in response.headers
+
+    app.state.model_loader.load()
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["ready"] is True
+
+def test_ready_reports_the_load_failure(monkeypatch):
+    from api.asr_api import app
+
+    def get_asr_model():
+        raise OSError("model not found")
+
+    monkeypatch.setattr(startup, "get_asr_model", get_asr_model)
+    app.state.model_loader = ModelLoader()
+    app.state.model_loader.load()
+
+    response = TestClient(app).get("/ready")
+
+    assert response.status_code == 503
+    assert response.json()["error"] == "model not found"
@@ -0,0 +1,71 @@
+import numpy as np
+
+from speech_recognition.streaming import StreamingTranscriber, pcm16_to_float32
+
+SAMPLING_RATE = 100
+
+class WordPerSecondModel:
+    """Stand-in for the ASR pipeline that recognizes one word per second of audio.
+
+    The words are numbered by the absolute position of the audio in the stream, which is encoded
+    in the samples themselves, so that re-decoded audio yields the same words.
+    """
+    def __init__(self):
+        self.decoded_sizes = []
+
+    def __call__(self, inputs, return_timestamps=None):
+        raw = inputs["raw"]
+        self.decoded_sizes.append(raw.size)
+        chunks = []
+        for start in range(0, raw.size - SAMPLING_RATE + 1, SAMPLING_RATE):
+            second = int(raw[start])
+            offset = start / SAMPLING_RATE
+            chunks.append({"text": f"w{second}", "timestamp": (offset, offset + 1.0)})
+        return {"text": " ".join(chunk["text"] for chunk in chunks), "chunks": chunks}
+
+def seconds(first, count):
+    """Create `count` seconds of audio whose samples hold the index of their second in the stream."""
+    return np.repeat(np.arange(first, first + count, dtype=np.float32), SAMPLING_RATE)
+
+def make_transcriber(model):
+    return StreamingTranscriber(
+        model, sampling_rate=SAMPLING_RATE, window_s=1.0, right_context_s=2.0, max_pending_s=15.0
+    )
+
+def test_pcm16_to_float32_scales_and_ignores_trailing_byte():
+    data = np.array([0, 16384, -32768], dtype="<i2").tobytes() + b"\x01"
+    samples = pcm16_to_float32(data)
+    assert samples.dtype == np.float32
+    assert samples.tolist() == [0.0, 0.5, -1.0]
+
+def test_feed_waits_for_a_full_window_of_new_audio():
+    model = WordPerSecondModel()
+    transcriber = make_transcriber(model)
+
+    assert transcriber.feed(seconds(0, 1)[:50]) is None
+    assert transcriber.feed(np.zeros(0, dtype=np.float32)) is None
+    assert model.decoded_sizes == []
+    assert transcriber.feed(seconds(0, 1)[50:]) == "w0"
+    assert model.decoded_sizes == [SAMPLING_RATE]
+
+def test_stable_words_are_committed_and_not_decoded_again():
+    model = WordPerSecondModel()
+    transcriber = make_transcriber(model)
+
+    partials = [transcriber.feed(seconds(second, 1)) for second in range(6)]
+    final = transcriber.finish()
+
+    assert partials[-1] == "w0 w1 w2 w3 w4 w5"
+    assert final == "w0 w1 w2 w3 w4 w5"
+    assert transcriber.duration == "6.0"
+    # Only the right context and the new window are decoded, not the whole stream
+    assert max(model.decoded_sizes) <= 3 * SAMPLING_RATE
+
+def test_finish_decodes_the_remaining_samples():
+    model = WordPerSecondModel()
+    transcriber = make_transcriber(model)
+
+    transcriber.feed(seconds(0, 3))
+    assert transcriber.finish(seconds(3, 2)) == "w0 w1 w2 w3 w4"
+    assert transcriber.duration == "5.0"
+    assert transcriber.finish() == "w0 w1 w2 w3 w4"
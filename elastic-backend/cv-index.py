@@ -1,19 +1,72 @@
 import os
+import re
 import sys
+import json
+import time
+import hashlib
+import itertools
+import sqlite3
+import argparse
+import threading
 
-import csv
+import pandas as pd
+from collections import Counter
 from elasticsearch import Elasticsearch, helpers
 
-from typing import Dict, Any, Iterator
+from typing import Dict, Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
 from logging_config import logger
 
 # Elasticsearch configuration from environment variables
 ES_HOST = os.getenv("ES_HOST")
+# ES_HOST may list several nodes of the cluster, separated by commas, to spread the requests across them
+ES_HOSTS = [host.strip() for host in (ES_HOST or "").split(",") if host.strip()]
 INDEX_NAME = os.getenv("INDEX_NAME")
 CSV_FILE_PATH = os.getenv("CSV_FILE_PATH")
 
-def create_index(es: Elasticsearch) -> None:
+# Fields of the indexed documents
+SOURCE_FIELDS = ("filename", "text", "up_votes", "down_votes", "age", "gender", "accent", "duration", "generated_text")
+
+# Numeric fields of the indexed documents, and whether they are integers
+NUMERIC_FIELDS = {"up_votes": True, "down_votes": True, "duration": False}
+
+# Mappings of the index
+INDEX_MAPPINGS = {
+    "properties": {
+        "filename"       : {"type": "keyword"},    # Set as keyword for exact match
+        "text"           : {"type": "text"},       # Set as text for full-text search
+        "up_votes"       : {"type": "integer"},
+        "down_votes"     : {"type": "integer"},
+        "age"            : {"type": "keyword"},    # Set as keyword for aggregations and filtering
+        "gender"         : {"type": "keyword"},    # Set as keyword for aggregations and filtering
+        "accent"         : {"type": "keyword"},    # Set as keyword for aggregations and filtering
+        "duration"       : {"type": "float"},
+        "generated_text" : {"type": "text"}        # Set as text for full-text search
+    }
+}
+
+# Format of the timestamp suffix of the versions of the index built by a blue/green reindex
+VERSION_FORMAT = "%Y%m%d%H%M%S"
+
+def connect(hosts: List[str], sniff: bool = False) -> Elasticsearch:
+    """Create an Elasticsearch client that spreads its requests across the nodes of the cluster.
+
+    The client sends its requests to the given hosts in round-robin. With sniffing, it also
+    discovers the other nodes of the cluster from the first host it reaches, which requires
+    the published addresses of the nodes to be reachable from this machine.
+
+    Args:
+        hosts (List[str]): The URLs of the Elasticsearch nodes.
+        sniff (bool): Whether to discover the other nodes of the cluster.
+
+    Returns:
+        Elasticsearch: An instance of the Elasticsearch client.
+    """
+    if sniff:
+        return Elasticsearch(hosts, sniff_on_start=True, sniff_on_connection_fail=True, sniffer_timeout=60)
+    return Elasticsearch(hosts)
+
+def create_index(es: Elasticsearch) -> bool:
     """Create an Elasticsearch index with predefined mappings if it does not exist.
 
     This function checks whether the specified index exists in Elasticsearch.
@@ -23,94 +76,667 @@ def create_index(es: Elasticsearch) -> None:
     Args:
         es (Elasticsearch): An instance of the Elasticsearch client.
 
+    Returns:
+        bool: True if the index was created, False if it already existed.
+
     Raises:
         SystemExit: Exits the program if index creation fails.
     """
     if not es.indices.exists(index=INDEX_NAME):
-        # Define index mappings
-        mappings = {
-            "mappings": {
-                "properties": {
-                    "filename"       : {"type": "keyword"},    # Set as keyword for exact match
-                    "text"           : {"type": "text"},       # Set as text for full-text search
-                    "up_votes"       : {"type": "integer"},
-                    "down_votes"     : {"type": "integer"},
-                    "age"            : {"type": "keyword"},    # Set as keyword for aggregations and filtering
-                    "gender"         : {"type": "keyword"},    # Set as keyword for aggregations and filtering
-                    "accent"         : {"type": "keyword"},    # Set as keyword for aggregations and filtering
-                    "duration"       : {"type": "float"},
-                    "generated_text" : {"type": "text"}        # Set as text for full-text search
-                }
-            }
-        }
         try:
-            es.indices.create(index=INDEX_NAME, body=mappings)
+            es.indices.create(index=INDEX_NAME, body={"mappings": INDEX_MAPPINGS})
             logger.info(f"Index '{INDEX_NAME}' created with mappings.")
+            return True
         except Exception as e:
             logger.error(f"Failed to create index '{INDEX_NAME}': {e}")
             sys.exit(1)
     else:
         logger.info(f"Index '{INDEX_NAME}' already exists.")
+        return False
+
+def resolve_index(es: Elasticsearch, name: str) -> List[str]:
+    """Get the concrete indices behind an index name or alias.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+        name (str): The name of an index or alias.
+
+    Returns:
+        List[str]: The names of the indices, the name itself if it is an index, or an empty list
+            if neither an index nor an alias exists with this name.
+    """
+    if not es.indices.exists(index=name):
+        return []
+    return sorted(es.indices.get_alias(index=name))
+
+def create_versioned_index(es: Elasticsearch) -> str:
+    """Create a new version of the index, named after INDEX_NAME and the current time, for a bulk load.
+
+    The index is created with refreshes and replicas disabled, as `optimize_for_ingest` does
+    for an existing index.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+
+    Returns:
+        str: The name of the new index, e.g. 'cv-transcriptions-20240101120000'.
+
+    Raises:
+        SystemExit: Exits the program if index creation fails.
+    """
+    index = f"{INDEX_NAME}-{time.strftime(VERSION_FORMAT, time.gmtime())}"
+    try:
+        es.indices.create(index=index, body={
+            "settings": {"index.refresh_interval": "-1", "index.number_of_replicas": 0},
+            "mappings": INDEX_MAPPINGS
+        })
+        logger.info(f"Index '{index}' created with mappings, with refreshes and replicas disabled for the bulk load.")
+    except Exception as e:
+        logger.error(f"Failed to create index '{index}': {e}")
+        sys.exit(1)
+    return index
+
+def list_versions(es: Elasticsearch) -> List[str]:
+    """List the versions of the index built by blue/green reindexes.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+
+    Returns:
+        List[str]: The names of the versions, from the oldest to the newest.
+    """
+    # Skip the other indices that share the prefix, e.g. 'cv-transcriptions-test'
+    pattern = re.compile(rf"{re.escape(INDEX_NAME)}-\d{{14}}")
+    indices = es.indices.get(index=f"{INDEX_NAME}-*", allow_no_indices=True, expand_wildcards="open,closed")
+    return sorted(index for index in indices if pattern.fullmatch(index))
+
+def swap_alias(es: Elasticsearch, index: str) -> List[str]:
+    """Point the INDEX_NAME alias to a new version of the index, in a single atomic request.
+
+    Searches through the alias go to either the previous or the new index, never to both or to
+    neither. If INDEX_NAME is still a concrete index, from before the versioned indices, it is
+    deleted in the same request so that the alias can take its name.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+        index (str): The name of the new index.
+
+    Returns:
+        List[str]: The names of the indices the alias pointed to before.
+    """
+    previous = resolve_index(es, INDEX_NAME)
+    actions: List[Dict[str, Any]] = [{"add": {"index": index, "alias": INDEX_NAME}}]
+    for old_index in previous:
+        if old_index == INDEX_NAME:
+            logger.warning(f"Index '{INDEX_NAME}' is a concrete index, it is deleted and replaced by an alias.")
+            actions.append({"remove_index": {"index": old_index}})
+        else:
+            actions.append({"remove": {"index": old_index, "alias": INDEX_NAME}})
+    es.indices.update_aliases(body={"actions": actions})
+    logger.info(f"Alias '{INDEX_NAME}' now points to index '{index}' (was {previous or 'unset'}).")
+    return previous
 
-def generate_actions(csv_file: str) -> Iterator[Dict[str, Any]]:
+def delete_old_versions(es: Elasticsearch, keep: int) -> List[str]:
+    """Delete the oldest versions of the index that the INDEX_NAME alias does not point to.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+        keep (int): The number of the most recent previous versions to keep, e.g. to roll back to.
+
+    Returns:
+        List[str]: The names of the deleted indices.
+    """
+    live = set(resolve_index(es, INDEX_NAME))
+    old_versions = [index for index in list_versions(es) if index not in live]
+    deleted = old_versions[:max(len(old_versions) - keep, 0)]
+    for index in deleted:
+        es.indices.delete(index=index)
+        logger.info(f"Deleted old version '{index}'.")
+    return deleted
+
+def coerce_numeric(values: pd.Series, integer: bool) -> Tuple[pd.Series, int]:
+    """Convert a column of a CSV chunk to numbers, replacing invalid values with 0.
+
+    Args:
+        values (pd.Series): The column, either parsed as numbers or as strings if it has invalid values.
+        integer (bool): Whether the values must be integers.
+
+    Returns:
+        Tuple[pd.Series, int]: The converted column and the number of invalid values.
+    """
+    # Columns without invalid values are already parsed as numbers by the CSV parser
+    numbers = values if pd.api.types.is_numeric_dtype(values) else pd.to_numeric(values, errors="coerce")
+    invalid = numbers.isna()
+    if integer:
+        invalid |= numbers % 1 != 0
+    numbers = numbers.mask(invalid, 0)
+    return numbers.astype("int64" if integer else "float64"), int(invalid.sum())
+
+def generate_actions(csv_file: str, chunk_size: int = 10000, index: Optional[str] = None) -> Iterator[Dict[str, Any]]:
     """Generator that yields actions for Elasticsearch bulk API.
 
-    Reads a CSV file and converts each row into a format suitable for bulk indexing in Elasticsearch.
-    Handles data type conversions and logs warnings for invalid values.
+    Reads a CSV file in chunks of `chunk_size` rows, so that memory use does not depend on the
+    size of the file, and converts each chunk into a format suitable for bulk indexing in
+    Elasticsearch. The numeric columns are converted a whole chunk at a time, and invalid values
+    are set to 0 and logged as a single count per column and chunk.
 
     Args:
         csv_file (str): The path to the CSV file containing transcription data.
+        chunk_size (int): The number of rows read and converted at a time.
+        index (Optional[str]): The name of the index to write to (default is INDEX_NAME).
 
     Yields:
         Dict[str, Any]: A dictionary representing an action for Elasticsearch bulk indexing.
     """
-    with open(csv_file, mode='r', encoding='utf-8') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-
-            # Handle 'up_votes' conversion with error handling
-            up_votes_value = row.get("up_votes", 0)
-            try:
-                up_votes = int(up_votes_value)
-            except ValueError:
-                logger.warning(f"Invalid up_votes value '{up_votes_value}' for filename '{row.get('filename')}'. Setting up_votes to 0.")
-                up_votes = 0
-
-            # Handle 'down_votes' conversion with error handling
-            down_votes_value = row.get("down_votes", 0)
-            try:
-                down_votes = int(down_votes_value)
-            except ValueError:
-                logger.warning(f"Invalid down_votes value '{down_votes_value}' for filename '{row.get('filename')}'. Setting down_votes to 0.")
-                down_votes = 0
-
-            # Handle 'duration' conversion with error handling
-            duration_value = row.get("duration", 0)
-            try:
-                duration = float(duration_value)
-            except ValueError:
-                logger.warning(f"Invalid duration value '{duration_value}' for filename '{row.get('filename')}'. Setting duration to 0.0.")
-                duration = 0.0
+    # Read the text columns as strings, keeping empty values as empty strings rather than NaN, and
+    # let the parser convert the numeric columns, with empty values as NaN
+    chunks = pd.read_csv(
+        csv_file,
+        dtype={field: str for field in SOURCE_FIELDS if field not in NUMERIC_FIELDS},
+        keep_default_na=False,
+        na_values={field: [""] for field in NUMERIC_FIELDS},
+        chunksize=chunk_size
+    )
+    for chunk_index, chunk in enumerate(chunks):
+        first_row = chunk_index * chunk_size
+        documents = pd.DataFrame(index=chunk.index)
+        for column in ("filename", "text", "age", "gender", "accent", "generated_text"):
+            documents[column] = chunk[column] if column in chunk else None
+
+        # Convert 'up_votes', 'down_votes' and 'duration', setting invalid values to 0
+        for column, integer in NUMERIC_FIELDS.items():
+            if column not in chunk:
+                documents[column] = 0 if integer else 0.0
+                continue
+            documents[column], invalid = coerce_numeric(chunk[column], integer)
+            if invalid:
+                logger.warning(
+                    f"Rows {first_row}-{first_row + len(chunk) - 1}: {invalid} invalid {column} values set to 0."
+                )
+
+        # Store empty metadata as null, so that it is missing from aggregations and filters
+        for column in ("age", "gender", "accent"):
+            documents[column] = documents[column].replace("", None)
 
+        # Build the documents from the columns as lists of Python values, in the order of the mappings
+        columns = [documents[field].tolist() for field in SOURCE_FIELDS]
+        for values in zip(*columns):
+            source = dict(zip(SOURCE_FIELDS, values))
             yield {
-                "_index" : INDEX_NAME,
-                "_id"    : row.get("filename"),  # Using filename as unique ID
-                "_source": {
-                    "filename"        : row.get("filename"),
-                    "text"            : row.get("text"),
-                    "up_votes"        : up_votes,
-                    "down_votes"      : down_votes,
-                    "age"             : row.get("age") or None,
-                    "gender"          : row.get("gender") or None,
-                    "accent"          : row.get("accent") or None,
-                    "duration"        : duration,
-                    "generated_text"  : row.get("generated_text")
-                }
+                "_index" : index or INDEX_NAME,
+                "_id"    : source["filename"],  # Using filename as unique ID
+                "_source": source
             }
 
+def fingerprint(source: Dict[str, Any]) -> str:
+    """Compute the fingerprint of the source of a document.
+
+    Args:
+        source (Dict[str, Any]): The source of the document.
+
+    Returns:
+        str: The hexadecimal digest of the source, independent of the order of its fields.
+    """
+    return hashlib.blake2b(json.dumps(source, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
+
+class FingerprintStore:
+    """Local store of the fingerprints of the documents indexed in Elasticsearch.
+
+    The fingerprint of a document is only stored once Elasticsearch has indexed it, so that the
+    documents that failed are sent again on the next run. Each run marks the documents it has
+    seen with its run number, so that the documents whose rows have disappeared from the CSV
+    file are those with an older run number.
+
+    Attributes:
+        db_path (str): The path to the SQLite database.
+        index (str): The name of the index the fingerprints belong to.
+        run (int): The number of the current run.
+    """
+    def __init__(self, db_path: str, index: str):
+        """Initialize the FingerprintStore instance and start a new run.
+
+        Args:
+            db_path (str): The path to the SQLite database.
+            index (str): The name of the index the fingerprints belong to.
+        """
+        self.db_path = db_path
+        self.index = index
+        # The actions are generated in a thread of the bulk helper, while the results are processed in the main thread
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS fingerprints ("
+            "index_name TEXT NOT NULL, doc_id TEXT NOT NULL, fingerprint TEXT NOT NULL, last_seen INTEGER NOT NULL, "
+            "PRIMARY KEY (index_name, doc_id))"
+        )
+        self.run = self._connection.execute(
+            "SELECT COALESCE(MAX(last_seen), 0) + 1 FROM fingerprints WHERE index_name = ?", (index,)
+        ).fetchone()[0]
+
+    def __len__(self) -> int:
+        return self._connection.execute(
+            "SELECT COUNT(*) FROM fingerprints WHERE index_name = ?", (self.index,)
+        ).fetchone()[0]
+
+    def reset(self) -> None:
+        """Forget the fingerprints of the index, e.g. because the index was recreated."""
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM fingerprints WHERE index_name = ?", (self.index,))
+
+    def lookup(self, doc_ids: List[str]) -> Dict[str, str]:
+        """Get the stored fingerprints of documents, and mark them as seen by the current run.
+
+        Args:
+            doc_ids (List[str]): The IDs of the documents (at most 900, the parameter limit of SQLite).
+
+        Returns:
+            Dict[str, str]: The fingerprint of each document that has one.
+        """
+        placeholders = ",".join("?" * len(doc_ids))
+        with self._lock, self._connection:
+            rows = self._connection.execute(
+                f"SELECT doc_id, fingerprint FROM fingerprints WHERE index_name = ? AND doc_id IN ({placeholders})",
+                (self.index, *doc_ids)
+            ).fetchall()
+            self._connection.execute(
+                f"UPDATE fingerprints SET last_seen = ? WHERE index_name = ? AND doc_id IN ({placeholders})",
+                (self.run, self.index, *doc_ids)
+            )
+        return dict(rows)
+
+    def record(self, action: Dict[str, Any]) -> None:
+        """Record an action that Elasticsearch has processed.
+
+        The fingerprint of an indexed document is stored, and the fingerprint of a deleted document
+        is removed.
+
+        Args:
+            action (Dict[str, Any]): An action generated by `delta_actions` or `deletion_actions`.
+        """
+        with self._lock:
+            if action.get("_op_type") == "delete":
+                self._connection.execute(
+                    "DELETE FROM fingerprints WHERE index_name = ? AND doc_id = ?", (self.index, action["_id"])
+                )
+            else:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO fingerprints (index_name, doc_id, fingerprint, last_seen) VALUES (?, ?, ?, ?)",
+                    (self.index, action["_id"], action["_fingerprint"], self.run)
+                )
+
+    def unseen(self) -> Iterator[str]:
+        """Iterate over the documents that were not seen by the current run.
+
+        Yields:
+            str: The ID of each document whose row has disappeared from the CSV file.
+        """
+        # Read all IDs first, since the fingerprints are removed while the deletions are processed
+        with self._lock:
+            doc_ids = [doc_id for doc_id, in self._connection.execute(
+                "SELECT doc_id FROM fingerprints WHERE index_name = ? AND last_seen < ?", (self.index, self.run)
+            )]
+        yield from doc_ids
+
+    def commit(self) -> None:
+        """Write the stored fingerprints to disk."""
+        with self._lock:
+            self._connection.commit()
+
+    def close(self) -> None:
+        """Commit and close the database."""
+        self.commit()
+        self._connection.close()
+
+def delta_actions(
+        actions: Iterable[Dict[str, Any]],
+        store: FingerprintStore,
+        counts: Counter,
+        batch_size: int = 900
+    ) -> Iterator[Dict[str, Any]]:
+    """Filter the actions down to the documents that are new or changed since they were last indexed.
+
+    Args:
+        actions (Iterable[Dict[str, Any]]): The actions for Elasticsearch bulk indexing.
+        store (FingerprintStore): The fingerprints of the indexed documents.
+        counts (Counter): Counter of the new, changed and unchanged documents, updated in place.
+        batch_size (int): The number of documents looked up in the store at a time.
+
+    Yields:
+        Dict[str, Any]: The actions of the new and changed documents, with their fingerprint
+            under the `_fingerprint` key (ignored by the bulk helpers, since the document is under `_source`).
+    """
+    batch: List[Dict[str, Any]] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        stored = store.lookup([action["_id"] for action in batch])
+        for action in batch:
+            action["_fingerprint"] = fingerprint(action["_source"])
+            previous = stored.get(action["_id"])
+            if previous == action["_fingerprint"]:
+                counts["unchanged"] += 1
+                continue
+            counts["new" if previous is None else "changed"] += 1
+            yield action
+
+    for action in actions:
+        batch.append(action)
+        if len(batch) >= batch_size:
+            yield from flush()
+            batch = []
+    if batch:
+        yield from flush()
+
+def deletion_actions(store: FingerprintStore, counts: Counter) -> Iterator[Dict[str, Any]]:
+    """Generate the actions that delete the documents whose rows have disappeared from the CSV file.
+
+    Must only be consumed once the actions of all rows have gone through `delta_actions`, since
+    the documents that were not seen by the current run are deleted.
+
+    Args:
+        store (FingerprintStore): The fingerprints of the indexed documents.
+        counts (Counter): Counter of the deleted documents, updated in place.
+
+    Yields:
+        Dict[str, Any]: The action that deletes each document.
+    """
+    for doc_id in store.unseen():
+        counts["deleted"] += 1
+        yield {"_op_type": "delete", "_index": INDEX_NAME, "_id": doc_id}
+
+def optimize_for_ingest(es: Elasticsearch, index: str) -> Dict[str, Optional[str]]:
+    """Disable refreshes and replicas of an index for the duration of a bulk load.
+
+    Without refreshes, Elasticsearch does not create a new searchable segment every second, and
+    without replicas, every document is indexed once instead of once per copy. The replicas are
+    recreated from the primary shards in bulk once the settings are restored.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+        index (str): The name of the index.
+
+    Returns:
+        Dict[str, Optional[str]]: The original settings, to be passed to `restore_index_settings`
+            (None for settings that were not set explicitly).
+    """
+    # The index may be an alias, whose settings are returned under the name of the index it points to
+    current, = (response["settings"] for response in es.indices.get_settings(index=index, flat_settings=True).values())
+    original = {
+        "index.refresh_interval": current.get("index.refresh_interval"),
+        "index.number_of_replicas": current.get("index.number_of_replicas")
+    }
+    es.indices.put_settings(index=index, body={"index.refresh_interval": "-1", "index.number_of_replicas": 0})
+    logger.info(f"Disabled refreshes and replicas of index '{index}' for the bulk load (were {original}).")
+    return original
+
+def restore_index_settings(es: Elasticsearch, index: str, original: Dict[str, Optional[str]]) -> None:
+    """Restore the settings of an index after a bulk load, then refresh and force-merge it.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+        index (str): The name of the index.
+        original (Dict[str, Optional[str]]): The settings returned by `optimize_for_ingest`.
+    """
+    # Settings set to None are reset to their defaults
+    es.indices.put_settings(index=index, body=original)
+    es.indices.refresh(index=index)
+    logger.info(f"Restored the settings of index '{index}' ({original}).")
+
+    # Merge the segments written by the bulk load, which speeds up searches
+    start = time.perf_counter()
+    es.indices.forcemerge(index=index, max_num_segments=1, request_timeout=600)
+    logger.info(f"Force-merged index '{index}' in {time.perf_counter() - start:.1f}s.")
+
+def parallel_bulk_index(
+        es: Elasticsearch,
+        actions: Iterable[Dict[str, Any]],
+        thread_count: int = 4,
+        chunk_size: int = 1000,
+        max_chunk_bytes: int = 10 * 1024 * 1024,
+        max_retries: int = 3,
+        initial_backoff: float = 2.0,
+        on_success: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+    """Index documents with parallel bulk requests and collect the failed items.
+
+    Each bulk request holds up to `chunk_size` documents and `max_chunk_bytes` bytes, whichever
+    is reached first, and `thread_count` requests are in flight at once. Documents rejected with
+    HTTP 429 (the bulk queue of a node was full) are retried with exponential backoff. Deleting
+    a document that does not exist (HTTP 404) counts as a success.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+        actions (Iterable[Dict[str, Any]]): The actions for Elasticsearch bulk indexing.
+        thread_count (int): The number of concurrent bulk requests.
+        chunk_size (int): The maximum number of documents per bulk request.
+        max_chunk_bytes (int): The maximum size of a bulk request in bytes.
+        max_retries (int): The maximum number of retries of rejected documents.
+        initial_backoff (float): The delay in seconds before the first retry, doubled on every retry.
+        on_success (Optional[Callable[[Dict[str, Any]], None]]): Function called with each action
+            that succeeded.
+
+    Returns:
+        Dict[str, Any]: The number of indexed, failed, retried and rejected (still rejected after
+            the last retry) documents, and the number of failures by error type.
+    """
+    indexed = failed = rejected = retried = 0
+    errors: Counter = Counter()
+
+    for attempt in range(max_retries + 1):
+        # Keep the actions that are in flight, to retry the rejected ones
+        in_flight: Dict[str, Dict[str, Any]] = {}
+        to_retry: List[Dict[str, Any]] = []
+
+        def track(actions: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            for action in actions:
+                in_flight[action["_id"]] = action
+                yield action
+
+        for ok, item in helpers.parallel_bulk(
+                es,
+                track(actions),
+                thread_count=thread_count,
+                chunk_size=chunk_size,
+                max_chunk_bytes=max_chunk_bytes,
+                raise_on_error=False,
+                raise_on_exception=False
+            ):
+            # Each item is a single-key dictionary of the operation type to its result
+            (op_type, result), = item.items()
+            action = in_flight.pop(result.get("_id"), None)
+            if ok or (op_type == "delete" and result.get("status") == 404):
+                indexed += 1
+                if on_success is not None and action is not None:
+                    on_success(action)
+                continue
+            if result.get("status") == 429 and action is not None and attempt < max_retries:
+                to_retry.append(action)
+                continue
+
+            error = result.get("error")
+            error_type = error.get("type", "unknown") if isinstance(error, dict) else str(error)
+            errors[error_type] += 1
+            failed += 1
+            if result.get("status") == 429:
+                rejected += 1
+            if failed <= 10:
+                logger.warning(f"Failed to index document '{result.get('_id')}': {error}")
+
+        if not to_retry:
+            break
+        delay = initial_backoff * 2 ** attempt
+        logger.warning(f"Retrying {len(to_retry)} rejected documents in {delay:.0f}s.")
+        retried += len(to_retry)
+        time.sleep(delay)
+        actions = to_retry
+
+    return {"indexed": indexed, "failed": failed, "retried": retried, "rejected": rejected, "errors": dict(errors)}
+
+def reindex(es: Elasticsearch, args: argparse.Namespace) -> None:
+    """Rebuild the index from the CSV file without downtime (blue/green reindex).
+
+    The documents are bulk loaded into a new version of the index while searches keep going
+    to the live version. Once the new version is refreshed, force-merged, its replicas are
+    allocated and its document count is validated, the INDEX_NAME alias is swapped to it
+    atomically, and the oldest previous versions are deleted.
+
+    Args:
+        es (Elasticsearch): An instance of the Elasticsearch client.
+        args (argparse.Namespace): The command-line arguments.
+
+    Raises:
+        SystemExit: Exits the program if the load or the validation fails, after deleting the new index.
+    """
+    # Give the new version the replicas of the live one, which searches rely on
+    live = resolve_index(es, INDEX_NAME)
+    live_count = es.count(index=INDEX_NAME)["count"] if live else 0
+    replicas = None
+    if live:
+        settings = es.indices.get_settings(index=live[0], flat_settings=True)[live[0]]["settings"]
+        replicas = settings.get("index.number_of_replicas")
+
+    start = time.perf_counter()
+    index = create_versioned_index(es)
+    try:
+        actions = generate_actions(CSV_FILE_PATH, args.csv_chunk_size, index)
+        result = parallel_bulk_index(es, actions, args.threads, args.chunk_size, args.max_chunk_bytes, args.max_retries)
+        restore_index_settings(es, index, {"index.refresh_interval": None, "index.number_of_replicas": replicas})
+        # Wait for the replicas to be copied, so that the new version serves searches at full capacity
+        es.cluster.health(index=index, wait_for_no_initializing_shards=True, timeout="10m", request_timeout=660)
+        count = es.count(index=index)["count"]
+    except Exception as e:
+        logger.error(f"Error during bulk indexing into '{index}': {e}")
+        es.indices.delete(index=index, ignore_unavailable=True)
+        sys.exit(1)
+    elapsed = time.perf_counter() - start
+
+    logger.info(
+        f"Indexed {result['indexed']} documents into '{index}' in {elapsed:.1f}s ({result['indexed'] / elapsed:.0f} docs/s), "
+        f"{result['retried']} retried, {result['failed']} failed ({result['rejected']} rejected)."
+    )
+
+    # Keep the live version if the new one is missing documents
+    problems = []
+    if result["failed"]:
+        problems.append(f"{result['failed']} documents failed ({result['errors']})")
+    if count == 0:
+        problems.append("the index is empty")
+    elif count < args.min_doc_ratio * live_count:
+        problems.append(f"it has {count} documents, fewer than {args.min_doc_ratio:.0%} of the {live_count} documents of the live index")
+    if problems:
+        logger.error(f"Validation of index '{index}' failed: {'; '.join(problems)}. Deleting it, the alias is unchanged.")
+        es.indices.delete(index=index)
+        sys.exit(1)
+    logger.info(f"Validated index '{index}': {count} documents (live index: {live_count}).")
+
+    swap_alias(es, index)
+    delete_old_versions(es, args.keep_versions)
+    logger.info("Reindexing completed successfully.")
+
 def main():
+    parser = argparse.ArgumentParser(description="Index the transcriptions of a CSV file in Elasticsearch.")
+
+    # Optional argument: Use the fast ingest mode
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help='Index with parallel bulk requests, with refreshes and replicas disabled for the duration of the load.'
+    )
+
+    # Optional argument: Number of concurrent bulk requests
+    parser.add_argument(
+        '--threads',
+        type=int,
+        default=4,
+        help='Number of concurrent bulk requests in the fast ingest mode.'
+    )
+
+    # Optional argument: Number of documents per bulk request
+    parser.add_argument(
+        '--chunk-size',
+        type=int,
+        default=1000,
+        help='Maximum number of documents per bulk request in the fast ingest mode.'
+    )
+
+    # Optional argument: Size of each bulk request
+    parser.add_argument(
+        '--max-chunk-bytes',
+        type=int,
+        default=10 * 1024 * 1024,
+        help='Maximum size in bytes of each bulk request in the fast ingest mode.'
+    )
+
+    # Optional argument: Number of retries of rejected documents
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=3,
+        help='Maximum number of retries of documents rejected by a full bulk queue in the fast ingest mode.'
+    )
+
+    # Optional argument: Number of CSV rows per chunk
+    parser.add_argument(
+        '--csv-chunk-size',
+        type=int,
+        default=10000,
+        help='Number of rows of the CSV file read and converted at a time.'
+    )
+
+    # Optional argument: Only index the new and changed rows
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only index the rows that are new or changed since the last incremental run, using the fingerprints stored in --fingerprint-db.'
+    )
+
+    # Optional argument: Delete the documents of removed rows
+    parser.add_argument(
+        '--delete-missing',
+        action='store_true',
+        help='In the incremental mode, delete the documents whose rows have disappeared from the CSV file.'
+    )
+
+    # Optional argument: Path to the fingerprint database
+    parser.add_argument(
+        '--fingerprint-db',
+        type=str,
+        default="cv-index-fingerprints.db",
+        help='Path to the SQLite database of the fingerprints of the indexed documents, for the incremental mode.'
+    )
+
+    # Optional argument: Reindex into a new version of the index
+    parser.add_argument(
+        '--reindex',
+        action='store_true',
+        help='Index into a new timestamped index, then point the INDEX_NAME alias to it once its document count is validated.'
+    )
+
+    # Optional argument: Minimum document count of the new version
+    parser.add_argument(
+        '--min-doc-ratio',
+        type=float,
+        default=0.95,
+        help='Minimum document count of the new index built by --reindex, as a ratio of the document count of the live index.'
+    )
+
+    # Optional argument: Number of previous versions to keep
+    parser.add_argument(
+        '--keep-versions',
+        type=int,
+        default=1,
+        help='Number of previous versions of the index to keep after --reindex, e.g. to roll back to. Older versions are deleted.'
+    )
+
+    # Optional argument: Discover the nodes of the cluster
+    parser.add_argument(
+        '--sniff',
+        action='store_true',
+        help='Discover the nodes of the cluster from ES_HOST and spread the requests across all of them.'
+    )
+    args = parser.parse_args()
+
     # Initialize Elasticsearch client
-    es = Elasticsearch([ES_HOST])
+    es = connect(ES_HOSTS, args.sniff)
 
     # Verify connection
     if not es.ping():
@@ -118,16 +744,75 @@ def main():
         sys.exit(1)
     logger.info(f"Connected to Elasticsearch at {ES_HOST}.")
 
-    # Create index if it doesn't exist
-    create_index(es)
+    if args.delete_missing and not args.incremental:
+        logger.error("--delete-missing requires --incremental.")
+        sys.exit(1)
+    if args.reindex and args.incremental:
+        logger.error("--reindex and --incremental cannot be combined, since --reindex builds a new index.")
+        sys.exit(1)
 
     # Check if CSV file exists
     if not os.path.isfile(CSV_FILE_PATH):
         logger.error(f"CSV file {CSV_FILE_PATH} does not exist.")
         sys.exit(1)
 
+    if args.reindex:
+        reindex(es, args)
+        return
+
+    # Create index if it doesn't exist
+    created = create_index(es)
+
     # Generate actions from CSV
-    actions = generate_actions(CSV_FILE_PATH)
+    actions = generate_actions(CSV_FILE_PATH, args.csv_chunk_size)
+
+    # Only send the rows that changed since the last run, and the deletions of the removed rows
+    store = None
+    counts: Counter = Counter()
+    if args.incremental:
+        # Key the fingerprints on the index behind the alias, so that a reindex starts from scratch
+        indices = resolve_index(es, INDEX_NAME)
+        store = FingerprintStore(args.fingerprint_db, indices[0] if len(indices) == 1 else INDEX_NAME)
+        if created and len(store):
+            logger.info(f"Index '{INDEX_NAME}' was created, discarding {len(store)} stored fingerprints.")
+            store.reset()
+        actions = delta_actions(actions, store, counts)
+        if args.delete_missing:
+            actions = itertools.chain(actions, deletion_actions(store, counts))
+
+    if args.fast or args.incremental:
+        # Bulk index data in parallel, and restore the index settings even if the load fails
+        start = time.perf_counter()
+        original = optimize_for_ingest(es, INDEX_NAME) if args.fast else None
+        try:
+            result = parallel_bulk_index(
+                es, actions, args.threads, args.chunk_size, args.max_chunk_bytes, args.max_retries,
+                on_success=store.record if store is not None else None
+            )
+        except Exception as e:
+            logger.error(f"Error during bulk indexing: {e}")
+            sys.exit(1)
+        finally:
+            if original is not None:
+                restore_index_settings(es, INDEX_NAME, original)
+            if store is not None:
+                store.close()
+        elapsed = time.perf_counter() - start
+
+        logger.info(
+            f"Indexed {result['indexed']} documents in {elapsed:.1f}s ({result['indexed'] / elapsed:.0f} docs/s), "
+            f"{result['retried']} retried, {result['failed']} failed ({result['rejected']} rejected)."
+        )
+        if store is not None:
+            logger.info(
+                f"Rows: {counts['new']} new, {counts['changed']} changed, {counts['unchanged']} unchanged. "
+                f"Documents deleted: {counts['deleted']}."
+            )
+        if result["failed"]:
+            logger.error(f"Failed bulk items by error type: {result['errors']}")
+            sys.exit(1)
+        logger.info("Indexing completed successfully.")
+        return
 
     # Bulk index data
     try:
@@ -0,0 +1,25 @@
+import importlib.util
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Make `logging_config` importable when running pytest from the elastic-backend directory
+sys.path.insert(0, BACKEND_DIR)
+
+@pytest.fixture(scope="session")
+def cv_index(tmp_path_factory):
+    """The `cv-index.py` script, imported as a module (its file name is not a valid module name)."""
+    # The logging configuration writes cv-index.log to the working directory when it is imported
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("logs"))
+    try:
+        spec = importlib.util.spec_from_file_location("cv_index", os.path.join(BACKEND_DIR, "cv-index.py"))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        os.chdir(cwd)
+    module.INDEX_NAME = "cv-transcriptions"
+    return module
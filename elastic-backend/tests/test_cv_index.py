@@ -0,0 +1,395 @@
+import fnmatch
+import json
+import threading
+
+from types import SimpleNamespace
+
+import pytest
+
+JSONSerializer = pytest.importorskip("elasticsearch.serializer").JSONSerializer
+
+class FakeIndices:
+    """The indices API of `FakeElasticsearch`."""
+    def __init__(self, es):
+        self.es = es
+
+    def exists(self, index):
+        return index in self.es.state or index in self.es.aliases
+
+    def create(self, index, body):
+        self.es.add_index(index, settings={key: str(value) for key, value in body["settings"].items()})
+
+    def get(self, index, **kwargs):
+        return {name: {} for name in self.es.state if fnmatch.fnmatch(name, index)}
+
+    def get_alias(self, index):
+        return {name: {"aliases": {}} for name in self.es.resolve(index)}
+
+    def update_aliases(self, body):
+        self.es.alias_requests.append(body["actions"])
+        for action in body["actions"]:
+            (op, params), = action.items()
+            if op == "add":
+                self.es.aliases.setdefault(params["alias"], set()).add(params["index"])
+            elif op == "remove":
+                self.es.aliases[params["alias"]].discard(params["index"])
+            else:
+                del self.es.state[params["index"]]
+
+    def delete(self, index, ignore_unavailable=False):
+        if index in self.es.state or not ignore_unavailable:
+            del self.es.state[index]
+        for indices in self.es.aliases.values():
+            indices.discard(index)
+
+    def get_settings(self, index, flat_settings=True):
+        return {name: {"settings": dict(self.es.state[name]["settings"])} for name in self.es.resolve(index)}
+
+    def put_settings(self, index, body):
+        self.es.settings_requests.append(dict(body))
+        for name in self.es.resolve(index):
+            settings = self.es.state[name]["settings"]
+            for key, value in body.items():
+                if value is None:
+                    settings.pop(key, None)
+                else:
+                    settings[key] = str(value)
+
+    def refresh(self, index):
+        pass
+
+    def forcemerge(self, index, **kwargs):
+        pass
+
+class FakeElasticsearch:
+    """Stand-in for the Elasticsearch client that keeps the indices, aliases and documents in memory.
+
+    Args:
+        statuses (dict): The statuses of the bulk items of a document ID on successive attempts,
+            after which the document is indexed or deleted.
+        fail_bulk (Exception): An exception raised by every bulk request.
+    """
+    def __init__(self, statuses=None, fail_bulk=None):
+        self.state = {}
+        self.aliases = {}
+        self.alias_requests = []
+        self.settings_requests = []
+        self.statuses = {doc_id: list(value) for doc_id, value in (statuses or {}).items()}
+        self.fail_bulk = fail_bulk
+        self.indices = FakeIndices(self)
+        self.cluster = SimpleNamespace(health=lambda **kwargs: {"status": "green"})
+        self.transport = SimpleNamespace(serializer=JSONSerializer())
+        self._lock = threading.Lock()
+
+    def add_index(self, name, docs=(), settings=None, alias=None):
+        self.state[name] = {"settings": dict(settings or {}), "docs": {doc_id: {} for doc_id in docs}}
+        if alias is not None:
+            self.aliases.setdefault(alias, set()).add(name)
+
+    def resolve(self, name):
+        if name in self.aliases:
+            return sorted(self.aliases[name])
+        return [name] if name in self.state else []
+
+    def docs(self, name):
+        return {doc_id: doc for index in self.resolve(name) for doc_id, doc in self.state[index]["docs"].items()}
+
+    def ping(self):
+        return True
+
+    def count(self, index):
+        return {"count": len(self.docs(index))}
+
+    def bulk(self, body, **kwargs):
+        if self.fail_bulk is not None:
+            raise self.fail_bulk
+        lines = [json.loads(line) for line in body.splitlines()]
+        items = []
+        while lines:
+            (op, meta), = lines.pop(0).items()
+            source = lines.pop(0) if op != "delete" else None
+            with self._lock:
+                pending = self.statuses.get(meta["_id"])
+                status = pending.pop(0) if pending else None
+                docs = self.state[self.resolve(meta["_index"])[0]]["docs"]
+                if status is None and op == "delete":
+                    status = 200 if docs.pop(meta["_id"], None) is not None else 404
+                elif status is None:
+                    status = 201
+                    docs[meta["_id"]] = source
+            result = {"_index": meta["_index"], "_id": meta["_id"], "status": status}
+            if status == 429:
+                result["error"] = {"type": "es_rejected_execution_exception"}
+            elif status >= 400 and status != 404:
+                result["error"] = {"type": "mapper_parsing_exception"}
+            items.append({op: result})
+        return {"errors": any("error" in result for item in items for result in item.values()), "items": items}
+
+CSV_HEADER = "filename,text,up_votes,down_votes,age,gender,accent,duration,generated_text\n"
+
+def write_csv(path, rows):
+    path.write_text(CSV_HEADER + "".join(row + "\n" for row in rows), encoding="utf-8")
+    return str(path)
+
+def test_generate_actions_converts_each_chunk(cv_index, tmp_path):
+    csv_file = write_csv(tmp_path / "cv-valid-dev.csv", [
+        "a.mp3,hello,2,0,twenties,male,us,1.5,HELLO",
+        "b.mp3,world,2.0,1,,,,3,WORLD",
+        "c.mp3,again,1,0,thirties,female,england,2.25,AGAIN",
+    ])
+
+    actions = list(cv_index.generate_actions(csv_file, chunk_size=2))
+
+    assert [action["_id"] for action in actions] == ["a.mp3", "b.mp3", "c.mp3"]
+    assert all(action["_index"] == "cv-transcriptions" for action in actions)
+    assert actions[0]["_source"] == {
+        "filename": "a.mp3", "text": "hello", "up_votes": 2, "down_votes": 0, "age": "twenties",
+        "gender": "male", "accent": "us", "duration": 1.5, "generated_text": "HELLO"
+    }
+    # Integral floats are accepted as vote counts, and empty metadata is indexed as null
+    source = actions[1]["_source"]
+    assert source["up_votes"] == 2 and type(source["up_votes"]) is int
+    assert source["duration"] == 3.0 and type(source["duration"]) is float
+    assert source["age"] is None and source["gender"] is None and source["accent"] is None
+
+def test_generate_actions_sets_invalid_numbers_to_zero(cv_index, tmp_path, caplog):
+    csv_file = write_csv(tmp_path / "cv-valid-dev.csv", [
+        "a.mp3,hello,many,1.5,,,,n/a,HELLO",
+        "b.mp3,world,3,,,,,2.5,WORLD",
+    ])
+
+    with caplog.at_level("WARNING", logger=cv_index.logger.name):
+        sources = [action["_source"] for action in cv_index.generate_actions(csv_file, index="cv-green")]
+
+    assert [(s["up_votes"], s["down_votes"], s["duration"]) for s in sources] == [(0, 0, 0.0), (3, 0, 2.5)]
+    # One warning per column and chunk rather than one per row
+    warnings = [record.getMessage() for record in caplog.records]
+    assert warnings == [
+        "Rows 0-1: 1 invalid up_votes values set to 0.",
+        "Rows 0-1: 2 invalid down_votes values set to 0.",
+        "Rows 0-1: 1 invalid duration values set to 0.",
+    ]
+
+@pytest.mark.parametrize("integer, expected", [(True, [1, 0, 0, 4]), (False, [1.0, 2.5, 0.0, 4.0])])
+def test_coerce_numeric(cv_index, integer, expected):
+    import pandas as pd
+
+    numbers, invalid = cv_index.coerce_numeric(pd.Series(["1", "2.5", "x", "4.0"]), integer)
+
+    assert numbers.tolist() == expected
+    assert invalid == (2 if integer else 1)
+
+def make_action(filename, text):
+    return {"_index": "cv-transcriptions", "_id": filename, "_source": {"filename": filename, "text": text}}
+
+def run_delta(cv_index, store, actions, batch_size=2):
+    from collections import Counter
+
+    counts = Counter()
+    sent = list(cv_index.delta_actions(actions, store, counts, batch_size=batch_size))
+    return sent, counts
+
+def test_fingerprint_ignores_field_order(cv_index):
+    assert cv_index.fingerprint({"a": 1, "b": "x"}) == cv_index.fingerprint({"b": "x", "a": 1})
+    assert cv_index.fingerprint({"a": 1, "b": "x"}) != cv_index.fingerprint({"a": 1, "b": "y"})
+
+def test_delta_actions_only_send_new_and_changed_documents(cv_index, tmp_path):
+    db_path = str(tmp_path / "fingerprints.db")
+    store = cv_index.FingerprintStore(db_path, "cv-transcriptions")
+    sent, counts = run_delta(cv_index, store, [make_action(f"{name}.mp3", name) for name in "abc"])
+    assert [action["_id"] for action in sent] == ["a.mp3", "b.mp3", "c.mp3"] and counts["new"] == 3
+    # Only the documents reported as indexed are recorded, so the others are sent again
+    for action in sent[:2]:
+        store.record(action)
+    store.close()
+
+    store = cv_index.FingerprintStore(db_path, "cv-transcriptions")
+    assert store.run == 2 and len(store) == 2
+    sent, counts = run_delta(cv_index, store, [make_action("a.mp3", "a"), make_action("b.mp3", "B"), make_action("c.mp3", "c")])
+    assert [action["_id"] for action in sent] == ["b.mp3", "c.mp3"]
+    assert counts == {"unchanged": 1, "changed": 1, "new": 1}
+    store.close()
+
+def test_deletion_actions_remove_documents_missing_from_the_csv(cv_index, tmp_path):
+    from collections import Counter
+
+    db_path = str(tmp_path / "fingerprints.db")
+    store = cv_index.FingerprintStore(db_path, "cv-transcriptions")
+    sent, _ = run_delta(cv_index, store, [make_action(f"{name}.mp3", name) for name in "abc"])
+    for action in sent:
+        store.record(action)
+    store.close()
+
+    store = cv_index.FingerprintStore(db_path, "cv-transcriptions")
+    run_delta(cv_index, store, [make_action("a.mp3", "a")])
+    counts = Counter()
+    deletions = list(cv_index.deletion_actions(store, counts))
+    assert sorted(action["_id"] for action in deletions) == ["b.mp3", "c.mp3"]
+    assert all(action["_op_type"] == "delete" for action in deletions) and counts["deleted"] == 2
+    for action in deletions:
+        store.record(action)
+    assert len(store) == 1 and list(store.unseen()) == []
+    store.commit()
+
+    # The fingerprints of other indexes are kept when one index is reset
+    other = cv_index.FingerprintStore(db_path, "cv-green")
+    other.record({"_id": "z.mp3", "_fingerprint": "0"})
+    other.commit()
+    store.reset()
+    assert len(store) == 0 and len(other) == 1
+    store.close()
+    other.close()
+
+def reindex_args(**overrides):
+    from argparse import Namespace
+
+    args = dict(
+        csv_chunk_size=10000, threads=2, chunk_size=2, max_chunk_bytes=10 * 1024 * 1024, max_retries=3,
+        min_doc_ratio=0.95, keep_versions=1
+    )
+    args.update(overrides)
+    return Namespace(**args)
+
+def test_list_versions_skips_other_indices_with_the_prefix(cv_index):
+    es = FakeElasticsearch()
+    for name in ["cv-transcriptions-20240102000000", "cv-transcriptions-test", "cv-transcriptions-20240101000000", "other"]:
+        es.add_index(name)
+
+    assert cv_index.list_versions(es) == ["cv-transcriptions-20240101000000", "cv-transcriptions-20240102000000"]
+
+def test_swap_alias_moves_the_alias_in_a_single_request(cv_index):
+    es = FakeElasticsearch()
+    es.add_index("cv-transcriptions-20240101000000", alias="cv-transcriptions")
+    es.add_index("cv-transcriptions-20240102000000")
+
+    previous = cv_index.swap_alias(es, "cv-transcriptions-20240102000000")
+
+    assert previous == ["cv-transcriptions-20240101000000"]
+    assert es.alias_requests == [[
+        {"add": {"index": "cv-transcriptions-20240102000000", "alias": "cv-transcriptions"}},
+        {"remove": {"index": "cv-transcriptions-20240101000000", "alias": "cv-transcriptions"}},
+    ]]
+    assert es.resolve("cv-transcriptions") == ["cv-transcriptions-20240102000000"]
+
+def test_swap_alias_replaces_a_concrete_index(cv_index):
+    es = FakeElasticsearch()
+    es.add_index("cv-transcriptions")
+    es.add_index("cv-transcriptions-20240101000000")
+
+    cv_index.swap_alias(es, "cv-transcriptions-20240101000000")
+
+    assert es.alias_requests[0][1] == {"remove_index": {"index": "cv-transcriptions"}}
+    assert "cv-transcriptions" not in es.state
+    assert es.resolve("cv-transcriptions") == ["cv-transcriptions-20240101000000"]
+
+def test_delete_old_versions_keeps_the_live_and_most_recent_versions(cv_index):
+    es = FakeElasticsearch()
+    for day in range(1, 5):
+        es.add_index(f"cv-transcriptions-2024010{day}000000")
+    es.aliases["cv-transcriptions"] = {"cv-transcriptions-20240104000000"}
+    es.add_index("cv-transcriptions-test")
+
+    deleted = cv_index.delete_old_versions(es, keep=1)
+
+    assert deleted == ["cv-transcriptions-20240101000000", "cv-transcriptions-20240102000000"]
+    assert sorted(es.state) == ["cv-transcriptions-20240103000000", "cv-transcriptions-20240104000000", "cv-transcriptions-test"]
+
+def test_reindex_swaps_the_alias_to_a_validated_version(cv_index, tmp_path, monkeypatch):
+    es = FakeElasticsearch()
+    es.add_index("cv-transcriptions-20240101000000", docs=["old.mp3"])
+    es.add_index("cv-transcriptions-20240102000000", docs=["old.mp3"], settings={"index.number_of_replicas": "2"}, alias="cv-transcriptions")
+    monkeypatch.setattr(cv_index, "CSV_FILE_PATH", write_csv(tmp_path / "cv-valid-dev.csv", [
+        "a.mp3,hello,1,0,,,,1.5,HELLO",
+        "b.mp3,world,2,0,,,,2.5,WORLD",
+    ]))
+
+    cv_index.reindex(es, reindex_args())
+
+    live, = es.resolve("cv-transcriptions")
+    assert live not in ("cv-transcriptions-20240101000000", "cv-transcriptions-20240102000000")
+    assert sorted(es.docs("cv-transcriptions")) == ["a.mp3", "b.mp3"]
+    # The new version gets the replicas of the previous live version, and refreshes are re-enabled
+    assert es.state[live]["settings"] == {"index.number_of_replicas": "2"}
+    # The previous live version is kept to roll back to, and the older one is deleted
+    assert sorted(es.state) == ["cv-transcriptions-20240102000000", live]
+
+def test_reindex_keeps_the_alias_if_the_new_version_is_missing_documents(cv_index, tmp_path, monkeypatch):
+    es = FakeElasticsearch()
+    es.add_index("cv-transcriptions-20240101000000", docs=["a.mp3", "b.mp3", "c.mp3"], alias="cv-transcriptions")
+    monkeypatch.setattr(cv_index, "CSV_FILE_PATH", write_csv(tmp_path / "cv-valid-dev.csv", [
+        "a.mp3,hello,1,0,,,,1.5,HELLO",
+        "b.mp3,world,2,0,,,,2.5,WORLD",
+    ]))
+
+    with pytest.raises(SystemExit):
+        cv_index.reindex(es, reindex_args(min_doc_ratio=0.9))
+
+    assert es.alias_requests == []
+    assert es.resolve("cv-transcriptions") == ["cv-transcriptions-20240101000000"]
+    assert sorted(es.state) == ["cv-transcriptions-20240101000000"]
+
+def test_parallel_bulk_index_retries_rejected_documents_with_backoff(cv_index, monkeypatch):
+    es = FakeElasticsearch(statuses={"a.mp3": [429, 429]})
+    es.add_index("cv-transcriptions")
+    delays = []
+    monkeypatch.setattr(cv_index.time, "sleep", delays.append)
+
+    result = cv_index.parallel_bulk_index(es, [make_action("a.mp3", "a"), make_action("b.mp3", "b")], thread_count=2, chunk_size=1, initial_backoff=0.5)
+
+    assert result == {"indexed": 2, "failed": 0, "retried": 2, "rejected": 0, "errors": {}}
+    assert delays == [0.5, 1.0]
+    assert sorted(es.docs("cv-transcriptions")) == ["a.mp3", "b.mp3"]
+
+def test_parallel_bulk_index_fails_documents_still_rejected_after_the_last_retry(cv_index, monkeypatch):
+    es = FakeElasticsearch(statuses={"a.mp3": [429] * 3, "b.mp3": [400]})
+    es.add_index("cv-transcriptions")
+    delays = []
+    monkeypatch.setattr(cv_index.time, "sleep", delays.append)
+
+    result = cv_index.parallel_bulk_index(es, [make_action("a.mp3", "a"), make_action("b.mp3", "b")], max_retries=2, initial_backoff=1.0)
+
+    assert result == {
+        "indexed": 0, "failed": 2, "retried": 2, "rejected": 1,
+        "errors": {"es_rejected_execution_exception": 1, "mapper_parsing_exception": 1}
+    }
+    assert delays == [1.0, 2.0]
+
+def test_parallel_bulk_index_counts_deleting_a_missing_document_as_a_success(cv_index):
+    es = FakeElasticsearch()
+    es.add_index("cv-transcriptions", docs=["a.mp3"])
+    actions = [{"_op_type": "delete", "_index": "cv-transcriptions", "_id": doc_id} for doc_id in ("a.mp3", "b.mp3")]
+    succeeded = []
+
+    result = cv_index.parallel_bulk_index(es, actions, on_success=succeeded.append)
+
+    assert result["indexed"] == 2 and result["failed"] == 0
+    assert sorted(action["_id"] for action in succeeded) == ["a.mp3", "b.mp3"]
+    assert es.docs("cv-transcriptions") == {}
+
+def run_fast_ingest(cv_index, es, tmp_path, monkeypatch):
+    settings = {"index.refresh_interval": "30s", "index.number_of_replicas": "1"}
+    es.add_index("cv-transcriptions-20240101000000", settings=settings, alias="cv-transcriptions")
+    monkeypatch.setattr(cv_index, "connect", lambda hosts, sniff=False: es)
+    monkeypatch.setattr(cv_index, "CSV_FILE_PATH", write_csv(tmp_path / "cv-valid-dev.csv", ["a.mp3,hello,1,0,,,,1.5,HELLO"]))
+    monkeypatch.setattr(cv_index.sys, "argv", ["cv-index.py", "--fast"])
+    cv_index.main()
+
+def test_fast_ingest_disables_refreshes_and_replicas_during_the_load(cv_index, tmp_path, monkeypatch):
+    es = FakeElasticsearch()
+
+    run_fast_ingest(cv_index, es, tmp_path, monkeypatch)
+
+    assert list(es.docs("cv-transcriptions")) == ["a.mp3"]
+    assert es.settings_requests == [
+        {"index.refresh_interval": "-1", "index.number_of_replicas": 0},
+        {"index.refresh_interval": "30s", "index.number_of_replicas": "1"},
+    ]
+
+def test_fast_ingest_restores_the_settings_if_the_load_fails(cv_index, tmp_path, monkeypatch):
+    es = FakeElasticsearch(fail_bulk=RuntimeError("connection reset"))
+
+    with pytest.raises(SystemExit):
+        run_fast_ingest(cv_index, es, tmp_path, monkeypatch)
+
+    assert es.settings_requests[-1] == {"index.refresh_interval": "30s", "index.number_of_replicas": "1"}
+    assert es.state["cv-transcriptions-20240101000000"]["settings"] == {"index.refresh_interval": "30s", "index.number_of_replicas": "1"}